@@ -1,13 +1,31 @@
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaRender as omr
 import maya.api.OpenMayaUI as omui
+import maya.api.OpenMayaAnim as oma
 import maya.cmds as cmds
+import numpy as np
+import ctypes
 import runpy
 import sys
 
 # connect to the OpenMaya API 2.0
 maya_useNewAPI = True
 
+# locator draw colors, built once instead of every frame
+AXIS_COLORS = (om.MColor((1.0, 0.0, 0.0, 1.0)), om.MColor((0.0, 1.0, 0.0, 1.0)), om.MColor((0.0, 0.0, 1.0, 1.0)))
+HIGHLIGHT_COLOR = om.MColor((0.85, 0.9, 0.55, 1.0))
+AXIS_LENGTH = 1.5
+PREVIEW_COLOR = om.MColor((0.55, 0.75, 0.95, 1.0))
+
+# hash codes of cLocator shapes whose batched draw data is stale, consumed by creativeLocBatchOverride
+BATCH_DIRTY_NODES = set()
+# hash codes of the cLocatorBatch nodes in the scene, the per locator draw override stands down while any exists
+BATCH_NODES = set()
+# scene wide batched draw state, the versions are bumped by module level callbacks & compared by each batch override
+BATCH_STATE = {'locatorsVersion':0, 'colorsVersion':0, 'sceneCallbacks':[], 'locatorCallbacks':[]}
+# node added/removed & scene callbacks registered while the plugin is loaded
+PLUGIN_CALLBACKS = []
+
 class creativeLocNode(omui.MPxLocatorNode):
     ''' Custom Locator containing viewport rendering privileges. '''
     TYPE_ID = om.MTypeId(0x0007f7f8)
@@ -15,9 +33,19 @@ class creativeLocNode(omui.MPxLocatorNode):
     DRAW_CLASSIFICATION = "drawdb/geometry/locator"
     DRAW_REGISTRANT_ID = "creativeLocNode"
 
+    # inherited locator attribute handles, cached in initialize so plugs are never looked up by name
+    localPositionAttrs = ()
+    localScaleAttrs = ()
+    trackedAttrs = ()
+    # planned joint preview, flat world matrices & joint radius written by the builder UI, never saved with the scene
+    previewMatricesAttr = om.MObject()
+    previewRadiusAttr = om.MObject()
+
     def __init__(self):
         ''' Gathers an instance of the inherited class and initialize it's methods & properties. '''
         super(creativeLocNode, self).__init__()
+        self.boundingBoxCache = None # rebuilt only after the local position or scale gets dirty
+        self.previewCache = None # planned joint matrices, rebuilt only after the preview attributes get dirty
 
     @classmethod
     def creator(cls):
@@ -27,7 +55,59 @@ class creativeLocNode(omui.MPxLocatorNode):
     @classmethod
     def initialize(cls):
         ''' Required method that tells maya to initialize the internal contents of the node type. '''
-        pass
+        cls.localPositionAttrs = (omui.MPxLocatorNode.localPositionX,
+                                  omui.MPxLocatorNode.localPositionY,
+                                  omui.MPxLocatorNode.localPositionZ)
+        cls.localScaleAttrs = (omui.MPxLocatorNode.localScaleX,
+                               omui.MPxLocatorNode.localScaleY,
+                               omui.MPxLocatorNode.localScaleZ)
+
+        typedFn = om.MFnTypedAttribute()
+        cls.previewMatricesAttr = typedFn.create('previewMatrices', 'pvm', om.MFnData.kDoubleArray, om.MFnDoubleArrayData().create())
+        typedFn.storable = False
+        typedFn.hidden = True
+        numericFn = om.MFnNumericAttribute()
+        cls.previewRadiusAttr = numericFn.create('previewRadius', 'pvr', om.MFnNumericData.kFloat, 1.0)
+        numericFn.storable = False
+        numericFn.hidden = True
+        cls.addAttribute(cls.previewMatricesAttr)
+        cls.addAttribute(cls.previewRadiusAttr)
+
+        cls.trackedAttrs = (omui.MPxLocatorNode.localPosition, omui.MPxLocatorNode.localScale,
+                            *cls.localPositionAttrs, *cls.localScaleAttrs,
+                            cls.previewMatricesAttr, cls.previewRadiusAttr)
+
+    @classmethod
+    def readLocalValues(cls, node):
+        ''' Returns the (x, y, z) local position & local scale values read through the cached attribute handles. '''
+        localPosition = tuple(om.MPlug(node, attr).asFloat() for attr in cls.localPositionAttrs)
+        localScale = tuple(om.MPlug(node, attr).asFloat() for attr in cls.localScaleAttrs)
+        return localPosition, localScale
+
+    @classmethod
+    def readPreview(cls, node):
+        ''' Returns the planned joint (N,4,4) world matrices & joint radius written to the preview attributes. '''
+        previewData = om.MPlug(node, cls.previewMatricesAttr).asMObject()
+        values = om.MFnDoubleArrayData(previewData).array() if not previewData.isNull() else []
+        matrices = np.array(values, dtype=np.float64)
+        matrices = matrices[:len(matrices) - len(matrices) % 16].reshape(-1, 4, 4)
+        return matrices, om.MPlug(node, cls.previewRadiusAttr).asFloat()
+
+    def getPreview(self):
+        ''' Returns the cached planned joint preview of this locator. '''
+        if self.previewCache is None:
+            self.previewCache = self.readPreview(self.thisMObject())
+        return self.previewCache
+
+    def setDependentsDirty(self, plug, affectedPlugs):
+        ''' Flags the cached bounding box & the viewport draw data when the local position or scale changes. '''
+        attr = plug.attribute()
+        if any(attr == trackedAttr for trackedAttr in self.trackedAttrs):
+            self.boundingBoxCache = None
+            self.previewCache = None
+            omr.MRenderer.setGeometryDrawDirty(self.thisMObject())
+            if BATCH_NODES:
+                BATCH_DIRTY_NODES.add(om.MObjectHandle(self.thisMObject()).hashCode())
 
     def getShapeSelectionMask(self):
         ''' Overriden method to support interactive object selection in Viewport 2.0 '''
@@ -41,38 +121,33 @@ class creativeLocNode(omui.MPxLocatorNode):
         return selectionMaskObj
 
     def isBounded(self):
-        return True
+        ''' Unbounded while previewing joints so the preview is never culled with the locator. '''
+        return not len(self.getPreview()[0])
     
     def boundingBox(self):
         ''' Dynamically calculates the bounding box based on the local position and scale.'''
-        locObject=self.thisMObject()
-        dependFn=om.MFnDependencyNode(locObject)
-
-        # read local position (x, y, z)
-        # findPlug() returns MPlug which contains the asFloat() method
-        xLocalPos=dependFn.findPlug('localPositionX', False).asFloat()
-        yLocalPos=dependFn.findPlug('localPositionY', False).asFloat()
-        zLocalPos=dependFn.findPlug('localPositionZ', False).asFloat()       
-
-        # read local scale (x, y, z)
-        # findPlug() returns MPlug which contains the asFloat() method
-        xLocalScale=dependFn.findPlug('localScaleX', False).asFloat()
-        yLocalScale=dependFn.findPlug('localScaleY', False).asFloat()
-        zLocalScale=dependFn.findPlug('localScaleZ', False).asFloat()       
+        if self.boundingBoxCache is not None:
+            return self.boundingBoxCache
 
+        localPosition, localScale = self.readLocalValues(self.thisMObject())
         # calculate corners positions and return built bounding box 
         base=2 # base size
-        minPos=om.MPoint(xLocalPos-(base*xLocalScale), yLocalPos-(base*yLocalScale), zLocalPos-(base*zLocalScale))
-        maxPos=om.MPoint(xLocalPos+(base*xLocalScale), yLocalPos+(base*yLocalScale), zLocalPos+(base*zLocalScale))
-        boundingBoxObj=om.MBoundingBox(minPos, maxPos)
-        return boundingBoxObj
+        minPos=om.MPoint([position-(base*scale) for position, scale in zip(localPosition, localScale)])
+        maxPos=om.MPoint([position+(base*scale) for position, scale in zip(localPosition, localScale)])
+        self.boundingBoxCache=om.MBoundingBox(minPos, maxPos)
+        return self.boundingBoxCache
 
 class creativeLocData(om.MUserData):
     ''' Custom data container to pass plug/attributes for when the node gets drawn. '''
     def __init__(self):
-        super(creativeLocData, self).__init__()
+        super(creativeLocData, self).__init__(False) # keep the data between draws so it can be reused
+        self.values = None # (localPosition, localScale) tuples the draw data was built from
         self.localPosition = om.MPoint(0, 0, 0)
         self.localScale = om.MVector(1, 1, 1)
+        self.axisEnds = (om.MPoint(), om.MPoint(), om.MPoint())
+        self.previewPoints = [] # planned joint positions in the locator space
+        self.previewAxisEnds = [] # planned joint (x, y, z) axis end points in the locator space
+        self.previewRadius = 1.0
 
 class creativeLocDrawOverride(omr.MPxDrawOverride):
     ''' Manages how the node will behave and be updated once it's drawn into Viewport 2.0 '''
@@ -90,19 +165,36 @@ class creativeLocDrawOverride(omr.MPxDrawOverride):
         # gather or create the node's draw data
         data = oldData if isinstance(oldData, creativeLocData) else creativeLocData()
 
-        # access node attributes
-        node=objPath.node()
-        dependFn=om.MFnDependencyNode(node)
-
-        # query and store the localPosition and localScale plug values 
-        data.localPosition = om.MPoint(dependFn.findPlug('localPositionX', False).asFloat(),
-                                       dependFn.findPlug('localPositionY', False).asFloat(),
-                                       dependFn.findPlug('localPositionZ', False).asFloat()) 
-        
-        data.localScale = om.MVector(dependFn.findPlug('localScaleX', False).asFloat(),
-                                     dependFn.findPlug('localScaleY', False).asFloat(),
-                                     dependFn.findPlug('localScaleZ', False).asFloat()) 
-
+        # read the localPosition and localScale values through the cached attribute handles
+        node = objPath.node()
+        localPosition, localScale = creativeLocNode.readLocalValues(node)
+        previewMatrices, previewRadius = creativeLocNode.readPreview(node)
+        # the preview is stored in world space and drawn in the locator space, moving the locator changes it too
+        worldMatrix = tuple(objPath.inclusiveMatrix()) if len(previewMatrices) else None
+        values = (localPosition, localScale, previewMatrices.tobytes(), previewRadius, worldMatrix)
+        if values == data.values:
+            return data # nothing changed since the last draw, skip the refresh
+
+        data.values = values
+        data.localPosition = om.MPoint(localPosition)
+        data.localScale = om.MVector(localScale)
+        # build axis locator end points once per change instead of every frame
+        data.axisEnds = (data.localPosition + om.MVector(AXIS_LENGTH * localScale[0], 0, 0),
+                         data.localPosition + om.MVector(0, AXIS_LENGTH * localScale[1], 0),
+                         data.localPosition + om.MVector(0, 0, AXIS_LENGTH * localScale[2]))
+
+        # bring the planned joint world matrices into the locator space, the draw manager draws in object space
+        data.previewRadius = previewRadius
+        data.previewPoints, data.previewAxisEnds = [], []
+        if len(previewMatrices):
+            inverseMatrix = np.array(list(objPath.inclusiveMatrixInverse())).reshape(4, 4)
+            localMatrices = previewMatrices @ inverseMatrix
+            for matrix in localMatrices:
+                origin = matrix[3, :3]
+                # normalize the axes so the axis length follows the joint radius only
+                axes = matrix[:3, :3] / np.linalg.norm(matrix[:3, :3], axis=1, keepdims=True)
+                data.previewPoints.append(om.MPoint(*origin.tolist()))
+                data.previewAxisEnds.append([om.MPoint(*(origin + axis * previewRadius * 2).tolist()) for axis in axes])
         return data
 
     def supportedDrawAPIs(self):
@@ -118,6 +210,10 @@ class creativeLocDrawOverride(omr.MPxDrawOverride):
         '''
         if not data:
             return
+        if data.previewPoints:
+            self.drawJointPreview(drawManager, data)
+        if BATCH_NODES:
+            return # the batched draw path renders every locator while a cLocatorBatch node exists
         
         drawManager.beginDrawable()
         drawManager.beginDrawInXray() # Xray module used to always render the locator in front
@@ -131,34 +227,62 @@ class creativeLocDrawOverride(omr.MPxDrawOverride):
         if locState == omr.MGeometryUtilities.kActive or locState == omr.MGeometryUtilities.kLead:
             is_selected = True
 
-        # define color array before drawing
-        highlightColor = om.MColor((0.85, 0.9, 0.55, 1.0))
-        xColor=om.MColor((1.0, 0.0, 0.0, 1.0)) if not is_selected else highlightColor
-        yColor=om.MColor((0.0, 1.0, 0.0, 1.0)) if not is_selected else highlightColor
-        zColor=om.MColor((0.0, 0.0, 1.0, 1.0)) if not is_selected else highlightColor
-
-        # build axis locator points
+        # draw red, green & blue axis lines, every axis uses the highlight color when selected
         origin = data.localPosition
-        length = 1.5
-        xEndPos=origin + om.MVector((length * data.localScale.x), 0, 0)
-        yEndPos=origin + om.MVector(0, (length * data.localScale.y), 0)
-        zEndPos=origin + om.MVector(0, 0, (length * data.localScale.z))
-
-        # draw red x-axis line
-        drawManager.setColor(xColor) 
-        drawManager.line(origin, xEndPos)
+        for axisColor, axisEnd in zip(AXIS_COLORS, data.axisEnds):
+            drawManager.setColor(HIGHLIGHT_COLOR if is_selected else axisColor)
+            drawManager.line(origin, axisEnd)
 
-        # draw green y-axis line
-        drawManager.setColor(yColor)
-        drawManager.line(origin, yEndPos)
-
-        # draw blue z-axis line
-        drawManager.setColor(zColor)
-        drawManager.line(origin, zEndPos)
+        drawManager.endDrawInXray()
+        drawManager.endDrawable()
 
+    def drawJointPreview(self, drawManager, data):
+        ''' Draws the planned joint chain as dashed bones, joint spheres & orientation axes. '''
+        drawManager.beginDrawable()
+        drawManager.beginDrawInXray()
+        drawManager.setColor(PREVIEW_COLOR)
+        drawManager.setLineStyle(omr.MUIDrawManager.kDashed)
+        for parentPoint, childPoint in zip(data.previewPoints[:-1], data.previewPoints[1:]):
+            drawManager.line(parentPoint, childPoint)
+        drawManager.setLineStyle(omr.MUIDrawManager.kSolid)
+        for point in data.previewPoints:
+            drawManager.sphere(point, data.previewRadius, False)
+        for point, axisEnds in zip(data.previewPoints, data.previewAxisEnds):
+            for axisColor, axisEnd in zip(AXIS_COLORS, axisEnds):
+                drawManager.setColor(axisColor)
+                drawManager.line(point, axisEnd)
         drawManager.endDrawInXray()
         drawManager.endDrawable()
 
+    def wantUserSelection(self):
+        ''' Selection falls back to userSelect while the UI drawables are skipped by the batched draw path. '''
+        return bool(BATCH_NODES)
+
+    def userSelect(self, selectInfo, drawContext, objPath, data, selectionList, worldSpaceHitPts):
+        ''' Selects the locator when any of its axis lines, projected to the viewport, falls inside the selection rectangle. '''
+        if not isinstance(data, creativeLocData):
+            return False
+        rectX, rectY, rectWidth, rectHeight = selectInfo.selectRect()
+        _, _, viewWidth, viewHeight = drawContext.getViewportDimensions()
+        worldMatrix = objPath.inclusiveMatrix()
+        viewProjMatrix = drawContext.getMatrix(omr.MFrameContext.kViewProjMtx)
+
+        # sample every axis line at its start, middle & end
+        for axisEnd in data.axisEnds:
+            for weight in (0.0, 0.5, 1.0):
+                localPoint = data.localPosition + (axisEnd - data.localPosition) * weight
+                worldPoint = localPoint * worldMatrix
+                clipPoint = worldPoint * viewProjMatrix
+                if clipPoint.w <= 0:
+                    continue
+                screenX = (clipPoint.x / clipPoint.w * 0.5 + 0.5) * viewWidth
+                screenY = (clipPoint.y / clipPoint.w * 0.5 + 0.5) * viewHeight
+                if rectX <= screenX <= rectX + rectWidth and rectY <= screenY <= rectY + rectHeight:
+                    selectionList.add(objPath)
+                    worldSpaceHitPts.append(worldPoint)
+                    return True
+        return False
+
     @classmethod
     def creator(cls, obj):
         return creativeLocDrawOverride(obj)
@@ -168,6 +292,287 @@ class creativeLocDrawOverride(omr.MPxDrawOverride):
         ''' Calls to draw the node object. '''
         return
 
+class creativeLocBatchNode(omui.MPxLocatorNode):
+    ''' Scene wide draw node, while one exists every cLocator gets drawn from a single batched line list. '''
+    TYPE_ID = om.MTypeId(0x0007f7f9)
+    TYPE_NAME = "cLocatorBatch"
+    DRAW_CLASSIFICATION = "drawdb/subscene/creativeLocBatch"
+    DRAW_REGISTRANT_ID = "creativeLocBatchNode"
+
+    def __init__(self):
+        super(creativeLocBatchNode, self).__init__()
+
+    @classmethod
+    def creator(cls):
+        return creativeLocBatchNode()
+
+    @classmethod
+    def initialize(cls):
+        pass
+
+    def isBounded(self):
+        ''' Unbounded so the batch node itself is never culled, each locator gets culled by the override. '''
+        return False
+
+class creativeLocBatchOverride(omr.MPxSubSceneOverride):
+    '''
+    Draws every cLocator in the scene as one line list render item.
+    Vertex data is only rebuilt for locators flagged dirty (moved, rescaled or re-selected),
+    the index buffer is rebuilt with the locators inside the view frustum whenever the camera changes.
+    The batch callbacks live at module level with the cLocatorBatch nodes, the override only compares their versions.
+    '''
+    NAME = "creativeLocBatchOverride"
+    RENDER_ITEM_NAME = "cLocatorBatchLines"
+    VERTS_PER_LOCATOR = 6
+
+    def __init__(self, obj):
+        super(creativeLocBatchOverride, self).__init__(obj)
+        self.locators = [] # [{'handle', 'path'}] in vertex slot order
+        self.slots = {} # cLocator hash code: slot index
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.colors = np.zeros((0, 4), dtype=np.float32)
+        self.centers = np.zeros((0, 3))
+        self.radii = np.zeros(0)
+        self.viewProjMatrix = None
+        self.locatorsVersion = -1 # BATCH_STATE versions the slots & colors were last built from
+        self.colorsVersion = -1
+
+        self.positionBuffer = omr.MVertexBuffer(omr.MVertexBufferDescriptor("", omr.MGeometry.kPosition, omr.MGeometry.kFloat, 3))
+        self.colorBuffer = omr.MVertexBuffer(omr.MVertexBufferDescriptor("", omr.MGeometry.kColor, omr.MGeometry.kFloat, 4))
+        self.indexBuffer = omr.MIndexBuffer(omr.MGeometry.kUnsignedInt32)
+
+    @classmethod
+    def creator(cls, obj):
+        return creativeLocBatchOverride(obj)
+
+    def supportedDrawAPIs(self):
+        return omr.MRenderer.kAllDevices
+
+    def requiresUpdate(self, container, frameContext):
+        ''' Only updates when locators changed or the camera moved, otherwise the render item is reused as is. '''
+        viewProjMatrix = frameContext.getMatrix(omr.MFrameContext.kViewProjMtx)
+        return (self._locatorsDirty() or self._colorsDirty() or bool(BATCH_DIRTY_NODES)
+                or self.viewProjMatrix is None or viewProjMatrix != self.viewProjMatrix)
+
+    def update(self, container, frameContext):
+        ''' Refreshes the dirty locator slots, culls them against the view frustum & uploads the line list. '''
+        renderItem = container.find(self.RENDER_ITEM_NAME)
+        if not renderItem:
+            renderItem = omr.MRenderItem.create(self.RENDER_ITEM_NAME, omr.MRenderItem.DecorationItem, omr.MGeometry.kLines)
+            renderItem.setDrawMode(omr.MGeometry.kAll)
+            # highest depth priority keeps the lines over the mesh, as the per locator x-ray draw does
+            renderItem.setDepthPriority(omr.MRenderItem.sActiveWireDepthPriority)
+            shaderManager = omr.MRenderer.getShaderManager()
+            shader = shaderManager.getStockShader(omr.MShaderManager.k3dCPVSolidShader)
+            renderItem.setShader(shader)
+            shaderManager.releaseShader(shader)
+            container.add(renderItem)
+
+        uploadVertices = self._locatorsDirty() or bool(BATCH_DIRTY_NODES) or self._colorsDirty()
+        if self._locatorsDirty():
+            self._collectLocators()
+        elif BATCH_DIRTY_NODES:
+            dirtySlots = [self.slots[code] for code in BATCH_DIRTY_NODES if code in self.slots]
+            BATCH_DIRTY_NODES.clear()
+            for slot in dirtySlots:
+                self._updateSlot(slot)
+        if self._colorsDirty():
+            self._updateColors()
+
+        if uploadVertices and len(self.locators):
+            self._fillBuffer(self.positionBuffer, self.positions)
+            self._fillBuffer(self.colorBuffer, self.colors)
+
+        self.viewProjMatrix = frameContext.getMatrix(omr.MFrameContext.kViewProjMtx)
+        visible = self._visibleSlots(self.viewProjMatrix)
+        if not len(visible):
+            renderItem.enable(False)
+            return
+
+        indices = (visible[:, None] * self.VERTS_PER_LOCATOR + np.arange(self.VERTS_PER_LOCATOR)).astype(np.uint32).ravel()
+        self._fillBuffer(self.indexBuffer, indices)
+
+        vertexBuffers = omr.MVertexBufferArray()
+        vertexBuffers.append(self.positionBuffer, "positions")
+        vertexBuffers.append(self.colorBuffer, "colors")
+        bounds = om.MBoundingBox(om.MPoint(*self.positions.min(axis=0).tolist()), om.MPoint(*self.positions.max(axis=0).tolist()))
+        self.setGeometryForRenderItem(renderItem, vertexBuffers, self.indexBuffer, bounds)
+        renderItem.enable(True)
+
+    def _collectLocators(self):
+        ''' Private method, rebuilds every slot from the cLocator nodes currently in the scene. '''
+        self.locatorsVersion = BATCH_STATE['locatorsVersion']
+        om.MMessage.removeCallbacks(BATCH_STATE['locatorCallbacks'])
+        BATCH_STATE['locatorCallbacks'] = []
+        self.locators.clear()
+        self.slots.clear()
+        nodeIter = om.MItDependencyNodes(om.MFn.kPluginLocatorNode)
+        while not nodeIter.isDone():
+            node = nodeIter.thisNode()
+            nodeIter.next()
+            if om.MFnDependencyNode(node).typeName != creativeLocNode.TYPE_NAME:
+                continue
+            handle = om.MObjectHandle(node)
+            path = om.MDagPath.getAPathTo(node)
+            if BATCH_NODES:
+                BATCH_STATE['locatorCallbacks'].append(
+                    om.MDagMessage.addWorldMatrixModifiedCallback(path, _batchLocatorMoved, handle.hashCode()))
+            self.slots[handle.hashCode()] = len(self.locators)
+            self.locators.append({'handle':handle, 'path':path})
+
+        count = len(self.locators)
+        self.positions = np.zeros((count * self.VERTS_PER_LOCATOR, 3), dtype=np.float32)
+        self.colors = np.zeros((count * self.VERTS_PER_LOCATOR, 4), dtype=np.float32)
+        self.centers = np.zeros((count, 3))
+        self.radii = np.zeros(count)
+        for slot in range(count):
+            self._updateSlot(slot)
+        BATCH_DIRTY_NODES.clear()
+        self.colorsVersion = -1
+
+    def _updateSlot(self, slot:int):
+        ''' Private method, writes the world space axis lines & culling sphere of a single locator slot. '''
+        locator = self.locators[slot]
+        if not locator['handle'].isValid():
+            BATCH_STATE['locatorsVersion'] += 1 # deleted without a removal callback, rebuild on the next update
+            return
+        localPosition, localScale = creativeLocNode.readLocalValues(locator['handle'].object())
+        origin = np.array(localPosition)
+        ends = origin + np.diag(localScale) * AXIS_LENGTH
+        points = np.empty((self.VERTS_PER_LOCATOR, 4))
+        points[0::2, :3] = origin
+        points[1::2, :3] = ends
+        points[:, 3] = 1.0
+        # row vector convention, world points = local points * world matrix
+        worldMatrix = np.array(list(locator['path'].inclusiveMatrix())).reshape(4, 4)
+        worldPoints = (points @ worldMatrix)[:, :3]
+
+        start = slot * self.VERTS_PER_LOCATOR
+        self.positions[start:start + self.VERTS_PER_LOCATOR] = worldPoints
+        self.centers[slot] = worldPoints.mean(axis=0)
+        self.radii[slot] = np.linalg.norm(worldPoints - self.centers[slot], axis=1).max()
+
+    def _updateColors(self):
+        ''' Private method, colors every locator by axis or with the highlight color when selected. '''
+        axisColors = np.repeat(np.array([list(color) for color in AXIS_COLORS], dtype=np.float32), 2, axis=0)
+        highlightColor = np.array(list(HIGHLIGHT_COLOR), dtype=np.float32)
+        selectedStates = (omr.MGeometryUtilities.kActive, omr.MGeometryUtilities.kLead)
+        for slot, locator in enumerate(self.locators):
+            start = slot * self.VERTS_PER_LOCATOR
+            isSelected = locator['handle'].isValid() and omr.MGeometryUtilities.displayStatus(locator['path']) in selectedStates
+            self.colors[start:start + self.VERTS_PER_LOCATOR] = highlightColor if isSelected else axisColors
+        self.colorsVersion = BATCH_STATE['colorsVersion']
+
+    def _visibleSlots(self, viewProjMatrix) -> np.ndarray:
+        ''' Private method, returns the visible locator slots whose bounding sphere touches the view frustum. '''
+        if not len(self.locators):
+            return np.zeros(0, dtype=np.int64)
+        # frustum planes from the row vector view projection matrix columns (left, right, bottom, top, near, far)
+        matrix = np.array(list(viewProjMatrix)).reshape(4, 4)
+        planes = np.array([matrix[:, 3] + matrix[:, 0], matrix[:, 3] - matrix[:, 0],
+                           matrix[:, 3] + matrix[:, 1], matrix[:, 3] - matrix[:, 1],
+                           matrix[:, 3] + matrix[:, 2], matrix[:, 3] - matrix[:, 2]])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        distances = self.centers @ planes[:, :3].T + planes[:, 3]
+        inFrustum = np.all(distances >= -self.radii[:, None], axis=1)
+        shown = np.array([locator['handle'].isValid() and locator['path'].isVisible() for locator in self.locators])
+        return np.flatnonzero(inFrustum & shown)
+
+    def _fillBuffer(self, buffer, array:np.ndarray):
+        ''' Private method, copies a contiguous numpy array into a viewport 2.0 vertex or index buffer. '''
+        array = np.ascontiguousarray(array)
+        address = buffer.acquire(len(array), True)
+        ctypes.memmove(address, array.ctypes.data, array.nbytes)
+        buffer.commit(address)
+
+    def _locatorsDirty(self) -> bool:
+        return self.locatorsVersion != BATCH_STATE['locatorsVersion']
+
+    def _colorsDirty(self) -> bool:
+        return self.colorsVersion != BATCH_STATE['colorsVersion']
+
+class creativeModifierCommand(om.MPxCommand):
+    '''
+    Undoable command recording the API modifiers already executed by the creativeLibrary as one undo step.
+    Modifiers are handed over through creativeLibrary.undoModifiers.recordModifiers, the command takes no arguments.
+    '''
+    COMMAND_NAME = "creativeModifier"
+
+    def __init__(self):
+        super(creativeModifierCommand, self).__init__()
+        self.modifiers = []
+
+    @classmethod
+    def creator(cls):
+        return creativeModifierCommand()
+
+    def doIt(self, args):
+        ''' Takes the pending modifiers, they were executed by the caller so nothing is applied here. '''
+        from creativeSkeletons.creativeLibrary import undoModifiers
+        self.modifiers = undoModifiers.takeModifiers()
+
+    def redoIt(self):
+        for modifier in self.modifiers:
+            if isinstance(modifier, oma.MAnimCurveChange):
+                modifier.redoIt()
+            else:
+                modifier.doIt()
+
+    def undoIt(self):
+        for modifier in reversed(self.modifiers):
+            modifier.undoIt()
+
+    def isUndoable(self):
+        return bool(self.modifiers)
+
+# batched draw callbacks, module level functions so no callback keeps an override alive
+def _batchLocatorsChanged(node, clientData):
+    BATCH_STATE['locatorsVersion'] += 1
+
+def _batchSelectionChanged(clientData):
+    BATCH_STATE['colorsVersion'] += 1
+
+def _batchLocatorMoved(transformNode, modifiedFlags, hashCode):
+    BATCH_DIRTY_NODES.add(hashCode)
+
+def _batchNodeAdded(node, clientData):
+    ''' cLocatorBatch node added callback (creation, redo or undone deletion), the first node starts the batched draw. '''
+    BATCH_NODES.add(om.MObjectHandle(node).hashCode())
+    if BATCH_STATE['sceneCallbacks']:
+        return
+    BATCH_STATE['sceneCallbacks'] = [
+        om.MDGMessage.addNodeAddedCallback(_batchLocatorsChanged, creativeLocNode.TYPE_NAME),
+        om.MDGMessage.addNodeRemovedCallback(_batchLocatorsChanged, creativeLocNode.TYPE_NAME),
+        om.MModelMessage.addCallback(om.MModelMessage.kActiveListModified, _batchSelectionChanged)]
+    BATCH_STATE['locatorsVersion'] += 1
+    _dirtyLocatorDraws()
+
+def _batchNodeRemoved(node, clientData):
+    ''' cLocatorBatch node removed callback (deletion, undo or a new scene), the last node stops the batched draw. '''
+    BATCH_NODES.discard(om.MObjectHandle(node).hashCode())
+    if not BATCH_NODES:
+        _stopBatchDraw()
+
+def _batchSceneReset(clientData):
+    BATCH_NODES.clear()
+    _stopBatchDraw()
+
+def _stopBatchDraw():
+    ''' Removes every batched draw callback & hands drawing back to the per locator draw override. '''
+    om.MMessage.removeCallbacks(BATCH_STATE['sceneCallbacks'] + BATCH_STATE['locatorCallbacks'])
+    BATCH_STATE['sceneCallbacks'], BATCH_STATE['locatorCallbacks'] = [], []
+    BATCH_DIRTY_NODES.clear()
+    _dirtyLocatorDraws()
+
+def _dirtyLocatorDraws():
+    ''' Flags every cLocator draw as dirty so they pick up a switch between the batched & per locator draw paths. '''
+    nodeIter = om.MItDependencyNodes(om.MFn.kPluginLocatorNode)
+    while not nodeIter.isDone():
+        node = nodeIter.thisNode()
+        if om.MFnDependencyNode(node).typeName == creativeLocNode.TYPE_NAME:
+            omr.MRenderer.setGeometryDrawDirty(node)
+        nodeIter.next()
+
 def initializePlugin(plugin):
     vendor="David Martinez"
     ver="0.1.0"
@@ -190,6 +595,36 @@ def initializePlugin(plugin):
     except:
         om.MGlobal.displayError(f'Failed to register draw override: {creativeLocDrawOverride.NAME}')
 
+    try:
+        pluginFn.registerNode(creativeLocBatchNode.TYPE_NAME,
+                               creativeLocBatchNode.TYPE_ID,
+                               creativeLocBatchNode.creator,
+                               creativeLocBatchNode.initialize,
+                               om.MPxNode.kLocatorNode,
+                               creativeLocBatchNode.DRAW_CLASSIFICATION)
+    except:
+        om.MGlobal.displayError(f'Failed to register node: {creativeLocBatchNode.TYPE_NAME}')
+
+    try:
+        omr.MDrawRegistry.registerSubSceneOverrideCreator(creativeLocBatchNode.DRAW_CLASSIFICATION,
+                                                          creativeLocBatchNode.DRAW_REGISTRANT_ID,
+                                                          creativeLocBatchOverride.creator)
+    except:
+        om.MGlobal.displayError(f'Failed to register subscene override: {creativeLocBatchOverride.NAME}')
+
+    try:
+        PLUGIN_CALLBACKS.extend([om.MDGMessage.addNodeAddedCallback(_batchNodeAdded, creativeLocBatchNode.TYPE_NAME),
+                                 om.MDGMessage.addNodeRemovedCallback(_batchNodeRemoved, creativeLocBatchNode.TYPE_NAME),
+                                 om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, _batchSceneReset),
+                                 om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, _batchSceneReset)])
+    except:
+        om.MGlobal.displayError(f'Failed to register callbacks: {creativeLocBatchNode.TYPE_NAME}')
+
+    try:
+        pluginFn.registerCommand(creativeModifierCommand.COMMAND_NAME, creativeModifierCommand.creator)
+    except:
+        om.MGlobal.displayError(f'Failed to register command: {creativeModifierCommand.COMMAND_NAME}')
+
     pluginPath=pluginFn.loadPath() # change to pluginFn.loadPath() for public release
     if pluginPath not in sys.path:
         sys.path.append(pluginPath)
@@ -199,6 +634,27 @@ def initializePlugin(plugin):
     
 def uninitializePlugin(plugin):
     pluginFn=om.MFnPlugin(plugin)
+    om.MMessage.removeCallbacks(PLUGIN_CALLBACKS)
+    PLUGIN_CALLBACKS.clear()
+    BATCH_NODES.clear()
+    _stopBatchDraw()
+
+    try:
+        pluginFn.deregisterCommand(creativeModifierCommand.COMMAND_NAME)
+    except:
+        om.MGlobal.displayError(f'Failed to deregister command: {creativeModifierCommand.COMMAND_NAME}')
+
+    try:
+        omr.MDrawRegistry.deregisterSubSceneOverrideCreator(creativeLocBatchNode.DRAW_CLASSIFICATION,
+                                                            creativeLocBatchNode.DRAW_REGISTRANT_ID)
+    except:
+        om.MGlobal.displayError(f'Failed to deregister subscene override: {creativeLocBatchOverride.NAME}')
+
+    try:
+        pluginFn.deregisterNode(creativeLocBatchNode.TYPE_ID)
+    except:
+        om.MGlobal.displayError(f'Failed to deregister node: {creativeLocBatchNode.TYPE_NAME}')
+
     try:
         omr.MDrawRegistry.deregisterDrawOverrideCreator(creativeLocNode.DRAW_CLASSIFICATION, 
                                                         creativeLocNode.DRAW_REGISTRANT_ID)
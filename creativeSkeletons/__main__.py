@@ -1,4 +1,5 @@
 from creativeSkeletons import skeletonBuilderUI, shapeLibraryUI, matchUtil
+from creativeSkeletons.creativeLibrary import medialAxis, rigValidator
 import maya.cmds as mc
 import importlib
 
@@ -14,8 +15,19 @@ def run_matchUtil(*args):
     importlib.reload(matchUtil)
     matchUtil.creativeMatch()
 
+def run_skeletonFromMesh(*args):
+    importlib.reload(medialAxis)
+    medialAxis.buildSkeletonFromMesh()
+
+def run_rigValidator(*args):
+    importlib.reload(rigValidator)
+    rootJnts=mc.ls(selection=True, type='joint') or None
+    rigValidator.printReport(rigValidator.validateRig(rootJnts))
+
 creativeSkeletonsMenu = mc.menu('creativeSkeletonsMenu', label = 'Creative Skeletons', parent = 'MayaWindow', tearOff = True)
 
 mc.menuItem(label='Skeleton Builder', command = run_skeletonBuilder, parent = creativeSkeletonsMenu)
 mc.menuItem(label='Shape Library', command = run_shapeLibrary, parent = creativeSkeletonsMenu)
-mc.menuItem(label='IK/FK Match Utility', command = run_matchUtil, parent = creativeSkeletonsMenu)
\ No newline at end of file
+mc.menuItem(label='IK/FK Match Utility', command = run_matchUtil, parent = creativeSkeletonsMenu)
+mc.menuItem(label='Skeleton From Mesh', command = run_skeletonFromMesh, parent = creativeSkeletonsMenu)
+mc.menuItem(label='Validate Skeleton', command = run_rigValidator, parent = creativeSkeletonsMenu)
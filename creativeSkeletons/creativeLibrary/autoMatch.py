@@ -0,0 +1,183 @@
+from ..creativeLibrary import limbRegistry
+from ..creativeLibrary import limbMatch
+from ..creativeLibrary import undoModifiers
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import time
+
+class switchChange():
+    ''' Already applied switch value change recorded through undoModifiers, so undoing a match restores the switch too. '''
+    def __init__(self, plug:om.MPlug, oldValue:float, newValue:float):
+        self.plug, self.oldValue, self.newValue = plug, oldValue, newValue
+
+    def doIt(self):
+        self.plug.setDouble(self.newValue)
+
+    def undoIt(self):
+        self.plug.setDouble(self.oldValue)
+
+class autoMatcher():
+    '''
+    Opt-in automatic IK/FK match on switch changes.
+    An MNodeMessage attribute changed callback is registered on the registry switch nodes only (no global scriptJob):
+    setting a switch to IK matches the IK controls to the FK pose, back to FK matches the FK controls to the IK pose.
+    Limitations of switches set directly (channel box, setAttr): the DG can't be edited inside the callback, so the
+    match runs deferred on idle and the viewport may show the limb on the unmatched chain until then. The match chunk
+    restores the switch on undo, but the user's setAttr stays its own undo entry, so a second undo changes nothing.
+    switchLimbs has neither limitation: it reads the pose, matches & switches in one undo step, the matcher ignores it.
+    Evaluation during playback never sets attributes, so the callbacks stay idle; undo, redo & playback are ignored.
+    Registration & callback timings are kept in the stats.
+    '''
+    def __init__(self, registry:limbRegistry.limbRegistry|None=None):
+        self.registry=registry if registry is not None else limbRegistry.getLimbRegistry()
+        self.switchLimbs={} # switch node hash: {switch attribute name: resolved limbs}
+        self.switchValues={} # (switch node hash, switch attribute name): last known switch value
+        self.pending={} # (switch node hash, switch attribute name): (switch plug, previous value), matched on idle
+        self.callbackIDs=[]
+        self.suspended=False # set while switchLimbs changes the switches itself
+        self.stats={'switches':0, 'registerSeconds':0.0, 'callbacks':0, 'callbackSeconds':0.0, 'matches':0, 'matchSeconds':0.0}
+
+    def enable(self, namespaces:list|None=None) -> dict:
+        ''' Registers the switch callbacks of every limb in the namespaces (every character when none), returns the stats. '''
+        self.disable()
+        startTime=time.perf_counter()
+        namespaces=self.registry.namespaces() if namespaces is None else namespaces
+        switchObjs={}
+        for namespace in namespaces:
+            for resolvedLimb in self.registry.resolve(namespace):
+                switchHandle, switchAttr = resolvedLimb['switch']
+                switchID=switchHandle.hashCode()
+                switchObjs[switchID]=switchHandle.object()
+                self.switchLimbs.setdefault(switchID, {}).setdefault(switchAttr, []).append(resolvedLimb)
+                switchPlug=om.MFnDependencyNode(switchHandle.object()).findPlug(switchAttr, False)
+                self.switchValues[(switchID, switchAttr)]=switchPlug.asDouble()
+
+        for switchObj in switchObjs.values():
+            self.callbackIDs.append(om.MNodeMessage.addAttributeChangedCallback(switchObj, self._switchChanged))
+        self.callbackIDs.extend([om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, self._sceneChanged),
+                                 om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeNew, self._sceneChanged)])
+        self.stats.update({'switches':len(switchObjs), 'registerSeconds':time.perf_counter()-startTime})
+        return self.stats
+
+    def disable(self):
+        ''' Removes every callback, switches stop matching. '''
+        if self.callbackIDs:
+            om.MMessage.removeCallbacks(self.callbackIDs)
+        self.callbackIDs=[]
+        self.switchLimbs.clear()
+        self.switchValues.clear()
+        self.pending.clear()
+
+    def isEnabled(self) -> bool:
+        return bool(self.callbackIDs)
+
+    def resetStats(self):
+        self.stats.update({'callbacks':0, 'callbackSeconds':0.0, 'matches':0, 'matchSeconds':0.0})
+
+    def _switchChanged(self, msg, plug, otherPlug, clientData):
+        ''' Private method, queues the changed switch for the deferred match, nothing in the scene is edited here. '''
+        startTime=time.perf_counter()
+        self.stats['callbacks']+=1
+        try:
+            if not msg & om.MNodeMessage.kAttributeSet:
+                return
+            switchKey=(om.MObjectHandle(plug.node()).hashCode(), om.MFnAttribute(plug.attribute()).name)
+            if switchKey not in self.switchValues:
+                return
+            previousValue=self.switchValues[switchKey]
+            self.switchValues[switchKey]=plug.asDouble()
+            if self.suspended or om.MGlobal.isUndoing() or om.MGlobal.isRedoing() \
+               or om.MConditionMessage.getConditionState('playingBack'):
+                return
+            if not self.pending:
+                cmds.evalDeferred(self._matchPending)
+            # a switch changed several times before idle keeps its value from before the first change
+            self.pending.setdefault(switchKey, (om.MPlug(plug), previousValue))
+        finally:
+            self.stats['callbackSeconds']+=time.perf_counter()-startTime
+
+    def _matchPending(self):
+        ''' Private method, matches the queued limbs, each switch & its match are a single undo step. '''
+        pending, self.pending = self.pending, {}
+        for (switchID, switchAttr), (switchPlug, previousValue) in pending.items():
+            resolvedLimbs=[resolvedLimb for resolvedLimb in self.switchLimbs.get(switchID, {}).get(switchAttr, [])
+                           if self.registry.isValid(resolvedLimb)]
+            switchValue=switchPlug.asDouble()
+            if not resolvedLimbs or (switchValue >= 0.5)==(previousValue >= 0.5):
+                continue
+
+            matchStart=time.perf_counter()
+            cmds.undoInfo(openChunk=True, chunkName='autoMatch: matchLimbs')
+            try:
+                undoModifiers.recordModifiers([switchChange(switchPlug, previousValue, switchValue)])
+                # the switch already holds its new value: IK on matches the IK controls to the FK pose
+                direction='fkToIk' if switchValue >= 0.5 else 'ikToFk'
+                limbMatch.matchLimbs([self.registry.toMatchLimb(resolvedLimb) for resolvedLimb in resolvedLimbs], direction)
+            finally:
+                cmds.undoInfo(closeChunk=True)
+            self.stats['matches']+=1
+            self.stats['matchSeconds']+=time.perf_counter()-matchStart
+
+    def _sceneChanged(self, clientData):
+        self.disable()
+
+# remove the callbacks of a previous module load before replacing the shared matcher
+if globals().get('_AUTO_MATCHER') is not None:
+    _AUTO_MATCHER.disable()
+_AUTO_MATCHER=None
+
+def getAutoMatcher() -> autoMatcher:
+    ''' Returns the shared auto matcher, created (disabled) on first use. '''
+    global _AUTO_MATCHER
+    if _AUTO_MATCHER is None:
+        _AUTO_MATCHER=autoMatcher()
+    return _AUTO_MATCHER
+
+def setAutoMatch(enabled:bool=True, namespaces:list|None=None) -> dict:
+    ''' Enables or disables the automatic match on switch changes, returns the matcher stats. '''
+    matcher=getAutoMatcher()
+    if enabled:
+        return matcher.enable(namespaces)
+    matcher.disable()
+    return matcher.stats
+
+def switchLimbs(ik:bool=True, namespaces:list|None=None, limbNames:list|None=None, sides:list|None=None) -> dict:
+    '''
+    Switches the registered limbs (every character when no namespaces are provided) to IK or FK and matches them
+    in a single undo step: the source pose is read & matched before the switch changes, so the limb never shows
+    the unmatched chain. Limbs already on the requested side are left untouched. Returns the matchLimbs result.
+    '''
+    matcher=getAutoMatcher()
+    switchPlugs, matchedLimbs = {}, []
+    for resolvedLimb in matcher.registry.resolveLimbs(namespaces, limbNames, sides):
+        switchHandle, switchAttr = resolvedLimb['switch']
+        switchPlug=om.MFnDependencyNode(switchHandle.object()).findPlug(switchAttr, False)
+        if (switchPlug.asDouble() >= 0.5)==ik:
+            continue
+        switchPlugs[(switchHandle.hashCode(), switchAttr)]=switchPlug
+        matchedLimbs.append(matcher.registry.toMatchLimb(resolvedLimb))
+    if not matchedLimbs:
+        cmds.warning(f"No registered limbs to switch to {'IK' if ik else 'FK'} were found in the scene.")
+        return {'frames':0, 'controls':[]}
+
+    cmds.undoInfo(openChunk=True, chunkName='autoMatch: switchLimbs')
+    matcher.suspended=True
+    changes=[]
+    try:
+        result=limbMatch.matchLimbs(matchedLimbs, 'fkToIk' if ik else 'ikToFk')
+        for switchPlug in switchPlugs.values():
+            changes.append(switchChange(switchPlug, switchPlug.asDouble(), 1.0 if ik else 0.0))
+            changes[-1].doIt()
+    finally:
+        undoModifiers.recordModifiers(changes)
+        matcher.suspended=False
+        cmds.undoInfo(closeChunk=True)
+    return result
+
+def printStats():
+    ''' Prints the auto match registration & callback costs. '''
+    stats=getAutoMatcher().stats
+    callbackAverage=stats['callbackSeconds'] / stats['callbacks'] * 1e6 if stats['callbacks'] else 0.0
+    print(f"Auto match: {stats['switches']} switches registered in {stats['registerSeconds']*1e3:.2f} ms, "
+          f"{stats['callbacks']} callbacks averaging {callbackAverage:.1f} us, "
+          f"{stats['matches']} matches in {stats['matchSeconds']*1e3:.2f} ms")
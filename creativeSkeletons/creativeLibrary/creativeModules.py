@@ -1,10 +1,20 @@
 from ..creativeLibrary import shapes as shp
+from ..creativeLibrary import meshUtils as mu
+from ..creativeLibrary import meshBVH as bvh
+from ..creativeLibrary import rigMath
+from ..creativeLibrary import skeletonIndex
+from ..creativeLibrary import skinWeights
+from ..creativeLibrary import undoModifiers
 import maya.api.OpenMaya as om
 import maya.cmds as cmds
 from pathlib import Path
+import numpy as np
 import json
 import os
 
+LOCATOR_TYPES=('cLocator', 'locator')
+BLEND_MODES=('constraint', 'matrix') # IK/FK chain blending networks
+
 # maya modules dependent functions
 def createLocator(name:str, 
                   prefix:str|None=None, suffix:str|None=None,
@@ -48,6 +58,128 @@ def clusterLocParent(selectionLs:list, clusterName:str, locObj:str):
     cmds.pointConstraint(clusterObj, locObj)
     cmds.delete(clusterObj)
 
+def createLocators(locNames:list, locScales:list, positions:list|None=None,
+                   drivers:list|None=None) -> list:
+    '''
+    Creates every locator in a single DAG modifier pass without touching the user's selection.
+    Positions set the locator world translation; drivers world matrices are connected into
+    the locator offset parent matrix when provided. Both modifiers are recorded as one undo step.
+    Returns the created locator transform names.
+    '''
+    locType=LOCATOR_TYPES[0] if cmds.pluginInfo('creativeSkeletons.py', query=True, loaded=True) else LOCATOR_TYPES[1]
+    dagMod=om.MDagModifier()
+    locObjs=[]
+    for locName in locNames:
+        locTrn=dagMod.createNode('transform')
+        dagMod.renameNode(locTrn, locName)
+        locShp=dagMod.createNode(locType, locTrn)
+        dagMod.renameNode(locShp, f'{locName}_loc_shp')
+        locObjs.append((locTrn, locShp))
+    dagMod.doIt()
+
+    plugMod=om.MDGModifier()
+    for i, (locTrn, locShp) in enumerate(locObjs):
+        trnFn=om.MFnDependencyNode(locTrn)
+        shapeFn=om.MFnDependencyNode(locShp)
+        for axis in 'XYZ':
+            plugMod.newPlugValueDouble(shapeFn.findPlug(f'localScale{axis}', False), locScales[i])
+        if positions is not None:
+            for axis, value in zip('XYZ', positions[i]):
+                plugMod.newPlugValueDouble(trnFn.findPlug(f'translate{axis}', False), float(value))
+        if drivers and drivers[i]:
+            driverPlug=om.MFnDependencyNode(getMObject(drivers[i])).findPlug('worldMatrix', False).elementByLogicalIndex(0)
+            plugMod.connect(driverPlug, trnFn.findPlug('offsetParentMatrix', False))
+    plugMod.doIt()
+    undoModifiers.recordModifiers([dagMod, plugMod])
+
+    return [om.MFnDagNode(locTrn).partialPathName() for locTrn, locShp in locObjs]
+
+def placeLocator(selectionLs:list, locObj:str, mode:str='centroid'):
+    '''
+    Places a locator at the centroid or bounding box center of the selection's vertices.
+    Volume mode snaps the locator inside the mesh using the selected edge loop or face ring.
+    Vertex positions are read in a single call per mesh, no temporary nodes are created.
+    Returns the placed position or None if the selection contains no vertices.
+    '''
+    if mode=='volume':
+        meshIndices=mu.getComponentIndices(selectionLs)
+        if not meshIndices:
+            return None
+        # volume snapping only uses the first mesh found in the selection
+        meshName, vertIndices = next(iter(meshIndices.items()))
+        position=bvh.volumeCenter(meshName, vertIndices)
+        cmds.xform(locObj, worldSpace=True, translation=position.tolist())
+        return position
+
+    points=mu.getComponentPoints(selectionLs)
+    if not len(points):
+        return None
+    position=mu.componentCenter(points, mode=mode)
+    cmds.xform(locObj, worldSpace=True, translation=position.tolist())
+    return position
+
+def placeLocators(locNames:list, selectionSets:list,
+                  mode:str='centroid', locScale:float=5) -> list:
+    '''
+    Batch version of placeLocator: creates a locator for every selection set in one pass.
+    Each mesh is read only once no matter how many selection sets use it.
+    Returns the created locator transform names, empty selection sets are skipped.
+    '''
+    pointCache={}
+    validNames, positions = [], []
+    for locName, selectionLs in zip(locNames, selectionSets):
+        points=mu.getComponentPoints(selectionLs, pointCache=pointCache)
+        if not len(points):
+            continue
+        validNames.append(locName)
+        positions.append(mu.componentCenter(points, mode=mode))
+    if not validNames:
+        return []
+    return createLocators(validNames, [locScale]*len(validNames), positions=positions)
+
+def setLocatorBatchDraw(enabled:bool=True) -> str|None:
+    '''
+    Switches between the per locator draw and the batched draw of every cLocator.
+    The batched draw lives in a single hidden cLocatorBatch node, deleting it restores the per locator draw.
+    Returns the batch shape name when enabled.
+    '''
+    if not cmds.pluginInfo('creativeSkeletons.py', query=True, loaded=True):
+        cmds.warning('creativeSkeletons plugin is not loaded, batched locator drawing is unavailable.')
+        return None
+    batchShps=cmds.ls(type='cLocatorBatch') or []
+    if not enabled:
+        if batchShps:
+            cmds.delete(cmds.listRelatives(batchShps, parent=True))
+        return None
+    if batchShps:
+        return batchShps[0]
+    batchShp=cmds.createNode('cLocatorBatch', name='cLocatorBatch_shp', skipSelect=True)
+    batchTrn=cmds.rename(cmds.listRelatives(batchShp, parent=True)[0], 'cLocatorBatch')
+    cmds.setAttr(f'{batchTrn}.hiddenInOutliner', True)
+    return batchShp
+
+def setJointPreview(locName:str, matrices, jntsRad:float=3) -> bool:
+    '''
+    Streams planned joint world matrices into the cLocator preview attributes so the plugin draws a ghost chain.
+    Plugs are written through the API: no node gets created and nothing enters maya's undo queue.
+    Returns False when the locator is not a cLocator (plugin unavailable).
+    '''
+    if not cmds.objExists(locName):
+        return False
+    locShp=next((shape for shape in cmds.listRelatives(locName, shapes=True, fullPath=True) or []
+                 if cmds.nodeType(shape)==LOCATOR_TYPES[0]), None)
+    if not locShp:
+        return False
+    shapeFn=om.MFnDependencyNode(getMObject(locShp))
+    matrixValues=rigMath.toMatrixArray(matrices).ravel().tolist() if len(matrices) else []
+    shapeFn.findPlug('previewMatrices', False).setMObject(om.MFnDoubleArrayData().create(om.MDoubleArray(matrixValues)))
+    shapeFn.findPlug('previewRadius', False).setFloat(jntsRad)
+    return True
+
+def clearJointPreview(locName:str) -> None:
+    ''' Removes the planned joint preview drawn by the provided locator. '''
+    setJointPreview(locName, [])
+
 def buildJointChain(startVector:om.MPoint, endVector:om.MPoint, 
                     jntNames:list=['start', 'end'],
                     jntNums:int=2, parentJnt=None, 
@@ -108,6 +240,67 @@ def buildJointChain(startVector:om.MPoint, endVector:om.MPoint,
         cmds.setAttr(f'{startJnt}.overrideColor', overrideColor)
     return createdJnts
 
+def getMObject(nodeName:str) -> om.MObject:
+    ''' Returns the MObject of the provided node name. '''
+    selectionLs=om.MSelectionList()
+    selectionLs.add(nodeName)
+    return selectionLs.getDependNode(0)
+
+def getDagPath(nodeName:str) -> om.MDagPath:
+    ''' Returns the MDagPath of the provided DAG node name. '''
+    selectionLs=om.MSelectionList()
+    selectionLs.add(nodeName)
+    return selectionLs.getDagPath(0)
+
+def createJoints(jntNames:list, parents:list, translates:list,
+                 jointOrients:list|None=None, rotationOrders:list|None=None,
+                 jntsRad:float|list=3, rotates:list|None=None, preferredAngles:list|None=None) -> list:
+    '''
+    Creates every joint in a single DAG modifier pass without touching the user's selection.
+    Parents can be an existing node name, the index of a previous joint in the list or None for world.
+    Translates are local (parent space) values; joint orients, rotates & preferred angles are given in degrees.
+    Joint radius can be a single value or a value per joint. Both modifiers are recorded as one undo step.
+    Returns the created joint names in the same order.
+    '''
+    dagMod=om.MDagModifier()
+    jntObjs=[]
+    for i, jntName in enumerate(jntNames):
+        parent=parents[i]
+        if isinstance(parent, int):
+            parentObj=jntObjs[parent]
+        elif parent:
+            parentObj=getMObject(parent)
+        else:
+            parentObj=om.MObject.kNullObj
+        jntObj=dagMod.createNode('joint', parentObj)
+        dagMod.renameNode(jntObj, jntName)
+        jntObjs.append(jntObj)
+    dagMod.doIt()
+
+    # queue every attribute value into one modifier once the nodes exist
+    plugMod=om.MDGModifier()
+    for i, jntObj in enumerate(jntObjs):
+        dependFn=om.MFnDependencyNode(jntObj)
+        for axis, value in zip('XYZ', translates[i]):
+            plugMod.newPlugValueDouble(dependFn.findPlug(f'translate{axis}', False), value)
+        if jointOrients:
+            for axis, value in zip('XYZ', jointOrients[i]):
+                plugMod.newPlugValueMAngle(dependFn.findPlug(f'jointOrient{axis}', False),
+                                           om.MAngle(value, om.MAngle.kDegrees))
+        for attr, angles in (('rotate', rotates), ('preferredAngle', preferredAngles)):
+            if angles:
+                for axis, value in zip('XYZ', angles[i]):
+                    plugMod.newPlugValueMAngle(dependFn.findPlug(f'{attr}{axis}', False),
+                                               om.MAngle(value, om.MAngle.kDegrees))
+        if rotationOrders:
+            plugMod.newPlugValueShort(dependFn.findPlug('rotateOrder', False), rotationOrders[i])
+        jntRad=jntsRad[i] if isinstance(jntsRad, list) else jntsRad
+        plugMod.newPlugValueDouble(dependFn.findPlug('radius', False), jntRad)
+    plugMod.doIt()
+    undoModifiers.recordModifiers([dagMod, plugMod])
+
+    return [om.MFnDagNode(jntObj).partialPathName() for jntObj in jntObjs]
+
 def aimLocators(locStartName:str, locEndName:str,
                 aimVector:list=[1,0,0], upVector:list=[0,1,0],
                 worldUpVector:list=[0,1,0]):
@@ -159,56 +352,6 @@ def jointLocParent(jntName:str, locName:str):
     
     cmds.parentConstraint(jntName, locName)
 
-def mirrorJoints(mirrorAxis:str='YZ', mirrorFunc:str='Behavior',
-                 search:str='', replace:str='', includeLocators:bool=False):
-    ''' 
-    Sets up joint mirroring based on provided axis and function. 
-    Returns a list of the newly created mirrored joint chain.
-    '''
-    mirrorAxisVal, mirrorFuncVal = ('XY','XZ','YZ'), ('Behavior', 'Orientation')
-    if mirrorAxis not in mirrorAxisVal or mirrorFunc not in mirrorFuncVal:
-        raise ValueError('Wrong value given for mirrorAxis or mirrorFunc')
-    
-    jntSelection=cmds.ls(selection=True, type='joint')
-    if not jntSelection:
-        return None
-
-    searchReplace=(search, replace)
-
-    if mirrorAxis=='XY':
-        cmds.mirrorJoint(mxy=True, mb=True, sr=searchReplace) if mirrorFunc == 'Behavior' else cmds.mirrorJoint(mxy=True, mb=False, sr=searchReplace)
-    elif mirrorAxis=='XZ':
-        cmds.mirrorJoint(mxz=True, mb=True, sr=searchReplace) if mirrorFunc == 'Behavior' else cmds.mirrorJoint(mxz=True, mb=False, sr=searchReplace)
-    else:
-        cmds.mirrorJoint(myz=True, mb=True, sr=searchReplace) if mirrorFunc == 'Behavior' else cmds.mirrorJoint(myz=True, mb=False, sr=searchReplace)
-    
-    cmds.select(hi=True)
-    mirroredChain=cmds.ls(selection=True, type='joint')
-    
-    if includeLocators:
-        mirroredSet={}
-        # select joint hierarchy
-        cmds.select(jntSelection, hi=True)
-        jntChain=cmds.ls(selection=True, type='joint')
-        for i, jnt in enumerate(jntChain):
-            constraints=cmds.listConnections(jnt, type='parentConstraint')
-            for constraint in constraints:
-                node=cmds.listConnections(constraint)[0]
-                nodeShp=cmds.listRelatives(node, type='shape')[0]
-                if cmds.nodeType(nodeShp)=='cLocator' or cmds.nodeType(nodeShp)=='locator':
-                    mirroredSet[mirroredChain[i]]=[node.replace(search, replace), cmds.getAttr(f'{nodeShp}.localScaleX')]
-                    break
-        print(mirroredSet)
-        if mirroredSet:
-            # create each mirrored locator
-            for jnt in mirroredSet:
-                locName=mirroredSet.get(jnt)[0]
-                locScale=mirroredSet.get(jnt)[1]
-                createLocator(locName, locScale=locScale)
-                jointLocParent(jnt, locName)
-    
-    return mirroredChain
-
 def getCurveRotation(childJoints:list):
     ''' Finds the control's orientation based on the joint children. '''
     if len(childJoints) < 2: # joint has only one child
@@ -259,9 +402,18 @@ def getCurveRotation(childJoints:list):
     return curveRotation
 
 def setIKFKSwitch(jntConstraintSelection:list, switchControl, 
-                  fkControls:list|None=None, ikControls:list|None=None):
-    ''' Sets up IK/FK joints and/or controllers switch configuration from the joint constraint selection to the provided switch control. '''
+                  fkControls:list|None=None, ikControls:list|None=None, useReverse:bool=False):
+    ''' 
+    Sets up IK/FK joints and/or controllers switch configuration from the joint constraint selection to the provided switch control.
+    Accepts parentConstraint & blendMatrix (matrix blend mode) nodes. 
+    Use Reverse drives the fk attribute with a reverse node instead of an expression, keeping the rig parallel evaluation friendly,
+    re-running it keeps the reverse node already driving fk.
+    '''
     for jntConstraint in jntConstraintSelection:
+        if cmds.nodeType(jntConstraint) == 'blendMatrix':
+            if 'ik' not in cmds.attributeInfo(switchControl, all=True):
+                cmds.addAttr(switchControl, shortName='ik', defaultValue=0, minValue=0, maxValue=1, attributeType="short", k=True)
+            cmds.connectAttr(f'{switchControl}.ik', f'{jntConstraint}.target[0].weight', force=True)
         if cmds.nodeType(jntConstraint) == 'parentConstraint':
             print(jntConstraint)
             attrs=cmds.attributeInfo(jntConstraint, all=True)
@@ -282,7 +434,18 @@ def setIKFKSwitch(jntConstraintSelection:list, switchControl,
                     cmds.connectAttr(f'{switchControl}.fk', f'{jntConstraint}.{attr}')
                     cmds.select(cl=True)
                     break
-    cmds.expression(s=f'{switchControl}.fk = 1 - {switchControl}.ik', name='ikSwitch')
+    if 'fk' not in cmds.attributeInfo(switchControl, all=True):
+        cmds.addAttr(switchControl, shortName='fk', defaultValue=1, minValue=0, maxValue=1, attributeType="short")
+    if useReverse:
+        # an existing reverse driver is reused, an expression or any other fk driver gets replaced
+        changes={'attributes':0, 'nodes':0, 'connections':0}
+        attrMod=_addSwitchAttributes([switchControl], changes)
+        dgMod=om.MDGModifier()
+        _queueSwitch(dgMod, switchControl, changes)
+        dgMod.doIt()
+        undoModifiers.recordModifiers([attrMod, dgMod])
+    else:
+        cmds.expression(s=f'{switchControl}.fk = 1 - {switchControl}.ik', name='ikSwitch')
 
     if fkControls:
         for ctrl in fkControls:
@@ -291,6 +454,129 @@ def setIKFKSwitch(jntConstraintSelection:list, switchControl,
         for ctrl in ikControls:
             cmds.connectAttr(f'{switchControl}.ik', f'{ctrl}.visibility')
 
+def _switchWeightPlugs(blendNode:str, ikJnts:list|None=None) -> dict:
+    '''
+    Private function, returns the {'ik', 'fk'} weight plugs of a parentConstraint or blendMatrix blend node.
+    Constraint weights are resolved from the target array: a weight belongs to the IK side when its target parent
+    matrix comes from one of the IK joints, without IK joints the first target is the IK one (createIKFKChains order).
+    '''
+    blendFn=om.MFnDependencyNode(getMObject(blendNode))
+    if blendFn.typeName=='blendMatrix':
+        targetPlug=blendFn.findPlug('target', False).elementByLogicalIndex(0)
+        return {'ik':[targetPlug.child(blendFn.attribute('weight'))], 'fk':[]}
+    ikIDs={om.MObjectHandle(getMObject(jnt)).hashCode() for jnt in ikJnts or []}
+    targetPlug=blendFn.findPlug('target', False)
+    weightPlugs={'ik':[], 'fk':[]}
+    for order, index in enumerate(sorted(targetPlug.getExistingArrayAttributeIndices())):
+        elementPlug=targetPlug.elementByLogicalIndex(index)
+        # the targetWeight input is the constraint weight attribute the switch connects to
+        weightPlug=elementPlug.child(blendFn.attribute('targetWeight')).source()
+        if weightPlug.isNull:
+            continue
+        if ikIDs:
+            targetSource=elementPlug.child(blendFn.attribute('targetParentMatrix')).source()
+            isIK=not targetSource.isNull and om.MObjectHandle(targetSource.node()).hashCode() in ikIDs
+        else:
+            isIK=order==0
+        weightPlugs['ik' if isIK else 'fk'].append(weightPlug)
+    return weightPlugs
+
+def _queueConnection(dgMod:om.MDGModifier, sourcePlug:om.MPlug, destPlug:om.MPlug) -> int:
+    ''' Private function, queues the connection unless it already exists, replacing any other incoming connection. '''
+    currentSource=destPlug.source()
+    if not currentSource.isNull:
+        if currentSource==sourcePlug:
+            return 0
+        dgMod.disconnect(currentSource, destPlug)
+    dgMod.connect(sourcePlug, destPlug)
+    return 1
+
+def setIKFKSwitches(limbs:list) -> dict:
+    '''
+    Builds or repairs the IK/FK switch of every limb, missing switch attributes are added first then every node &
+    connection is queued in a single DG modifier, both modifiers are recorded as one undo step.
+    Limbs are {'switch', 'blends', 'ik', 'fkControls', 'ikControls'} dictionaries, the createIKFKChains results
+    with an added switch control ('ik', 'fkControls' & 'ikControls' are optional).
+    The switch gets 'ik' & 'fk' attributes, fk is driven by a reverse node, blend weights & control visibilities are connected.
+    Idempotent: existing attributes, reverse nodes & matching connections are kept, so re-running it on a rebuilt rig
+    only queues what differs. Returns the {'attributes', 'nodes', 'connections'} counts of the applied changes.
+    '''
+    changes={'attributes':0, 'nodes':0, 'connections':0}
+    attrMod=_addSwitchAttributes(list(dict.fromkeys(limb['switch'] for limb in limbs)), changes)
+    dgMod=om.MDGModifier()
+    switchPlugs={}
+    for limb in limbs:
+        switchCtrl=limb['switch']
+        if switchCtrl not in switchPlugs:
+            switchPlugs[switchCtrl]=_queueSwitch(dgMod, switchCtrl, changes)
+        ikPlug, fkPlug = switchPlugs[switchCtrl]
+
+        for blendNode in limb.get('blends', []):
+            weightPlugs=_switchWeightPlugs(blendNode, limb.get('ik'))
+            for weightPlug in weightPlugs['ik']:
+                changes['connections']+=_queueConnection(dgMod, ikPlug, weightPlug)
+            for weightPlug in weightPlugs['fk']:
+                changes['connections']+=_queueConnection(dgMod, fkPlug, weightPlug)
+        for ctrlKey, sourcePlug in (('fkControls', fkPlug), ('ikControls', ikPlug)):
+            for ctrl in limb.get(ctrlKey) or []:
+                visibilityPlug=om.MFnDependencyNode(getMObject(ctrl)).findPlug('visibility', False)
+                changes['connections']+=_queueConnection(dgMod, sourcePlug, visibilityPlug)
+    dgMod.doIt()
+    undoModifiers.recordModifiers([attrMod, dgMod])
+    return changes
+
+def _addSwitchAttributes(switchCtrls:list, changes:dict) -> om.MDGModifier:
+    '''
+    Private function, adds the missing switch 'ik' & 'fk' attributes in their own modifier and executes it,
+    so the plugs exist before any connection gets queued. Returns the executed modifier to record.
+    '''
+    attrMod=om.MDGModifier()
+    for switchCtrl in switchCtrls:
+        switchObj=getMObject(switchCtrl)
+        switchFn=om.MFnDependencyNode(switchObj)
+        for attrName, defaultValue in (('ik', 0), ('fk', 1)):
+            if switchFn.hasAttribute(attrName):
+                continue
+            numericFn=om.MFnNumericAttribute()
+            attrObj=numericFn.create(attrName, attrName, om.MFnNumericData.kShort, defaultValue)
+            numericFn.setMin(0)
+            numericFn.setMax(1)
+            numericFn.keyable=attrName=='ik'
+            attrMod.addAttribute(switchObj, attrObj)
+            changes['attributes']+=1
+    attrMod.doIt()
+    return attrMod
+
+def _queueSwitch(dgMod:om.MDGModifier, switchCtrl:str, changes:dict) -> tuple:
+    '''
+    Private function, queues the reverse node driving the switch fk attribute when it is missing.
+    An expression driving fk (setIKFKSwitch default) is replaced by the reverse node.
+    The 'ik' & 'fk' attributes must exist (_addSwitchAttributes). Returns the (ik, fk) switch plugs.
+    '''
+    switchFn=om.MFnDependencyNode(getMObject(switchCtrl))
+    switchPlugs={attrName:switchFn.findPlug(attrName, False) for attrName in ('ik', 'fk')}
+
+    fkSource=switchPlugs['fk'].source()
+    fkDriver=om.MFnDependencyNode(fkSource.node()).typeName if not fkSource.isNull else None
+    if fkDriver=='reverse':
+        reverseFn=om.MFnDependencyNode(fkSource.node())
+        changes['connections']+=_queueConnection(dgMod, switchPlugs['ik'], reverseFn.findPlug('inputX', False))
+        return switchPlugs['ik'], switchPlugs['fk']
+
+    if fkDriver=='expression':
+        # deleting the expression also removes its connection to the fk attribute
+        dgMod.deleteNode(fkSource.node())
+    elif fkDriver:
+        dgMod.disconnect(fkSource, switchPlugs['fk'])
+    reverseObj=dgMod.createNode('reverse')
+    dgMod.renameNode(reverseObj, f"{switchCtrl.split('|')[-1]}_ikSwitch_reverse")
+    reverseFn=om.MFnDependencyNode(reverseObj)
+    dgMod.connect(switchPlugs['ik'], reverseFn.findPlug('inputX', False))
+    dgMod.connect(reverseFn.findPlug('outputX', False), switchPlugs['fk'])
+    changes['nodes']+=1
+    changes['connections']+=2
+    return switchPlugs['ik'], switchPlugs['fk']
+
 def createIKHandle(handleName:str, jointStart, jointEnd, poleTarget=None, 
                    ikCtrl=None, colorIndex:int=6, jntNameStr='jnt', distance=10, ctrlSize=4, 
                    shapeDirectory=None):
@@ -315,7 +601,7 @@ def createIKHandle(handleName:str, jointStart, jointEnd, poleTarget=None,
         if not shapeDirectory:
              shapeDirectory=os.path.join(cmds.pluginInfo('creativeSkeletons.py', query=True, path=True).strip('.py'), 
                                          'creativeLibrary', 'data')
-        shapeData=loadData(shapeDirectory, 'shapesCV_Data.json')
+        shapeData=shp.loadShapeLibrary(shapeDirectory)[1]
 
         if jntNameStr in poleTarget:
             ctrlName=poleTarget.replace(jntNameStr, 'ctrl')
@@ -325,34 +611,88 @@ def createIKHandle(handleName:str, jointStart, jointEnd, poleTarget=None,
         overrideColor=cmds.colorIndex(colorIndex, q=True)
         ctrl=shp.customShape(shapeData, 'sphere', name=ctrlName, typeOverride=overrideColor, radius=ctrlSize)
 
-        startVector=om.MVector(cmds.xform(jointStart, query=True, ws=True, t=True))
-        endVector=om.MVector(cmds.xform(jointEnd, query=True, ws=True, t=True))
-        midVector=om.MVector(cmds.xform(poleTarget, query=True, ws=True, t=True))
-
-        startEndVector=endVector - startVector
-        print(startEndVector)
-
-        startMidVector=midVector - startVector
-        print(startMidVector)
-
-        projection=(startMidVector*startEndVector.normal())*startEndVector.normal()
-        print(projection)
-
-        poleVectorDirection=(startMidVector-projection).normal()
-        print(poleVectorDirection)
-
-        poleVectorPosition=midVector + poleVectorDirection * distance
-        print(poleVectorPosition)
-        
-        cmds.xform(ctrl, ws=True, t=(poleVectorPosition.x, poleVectorPosition.y, poleVectorPosition.z))
+        points=[cmds.xform(jnt, query=True, ws=True, t=True) for jnt in (jointStart, poleTarget, jointEnd)]
+        poleVectorPosition=rigMath.poleVectorPositions(*points, distance=distance)[0]
+        cmds.xform(ctrl, ws=True, t=poleVectorPosition.tolist())
         cmds.poleVectorConstraint(ctrl, handleName)
 
+def createIKHandles(limbs:list, colorIndex:int=6, jntNameStr:str='jnt',
+                    distance:float=10, ctrlSize:float=4, shapeDirectory=None) -> list:
+    '''
+    Batch createIKHandle for every limb of a character, limbs are {'name', 'start', 'end', 'mid', 'ikCtrl'} dictionaries
+    ('mid' & 'ikCtrl' are optional). Every pole vector position is solved at once with rigMath.poleVectorPositions
+    from a single world matrix read per joint, pole controls are created in one DAG modifier with cached sphere shapes.
+    Returns per limb {'handle', 'poleControl'}, the pole control is None for limbs without a mid joint.
+    '''
+    validLimbs=[limb for limb in limbs if cmds.objectType(limb['start'])=='joint' and cmds.objectType(limb['end'])=='joint']
+    if len(validLimbs) != len(limbs):
+        cmds.warning(f'{len(limbs)-len(validLimbs)} limbs without start & end joints were skipped.')
+    poleLimbs=[limb for limb in validLimbs if limb.get('mid') and cmds.objectType(limb['mid'])=='joint']
+
+    limbHandles=[]
+    for limb in validLimbs:
+        cmds.ikHandle(startJoint=limb['start'], endEffector=limb['end'], name=limb['name'])
+        cmds.orientConstraint(limb['name'], limb['end'])
+        ikEffector=cmds.listRelatives(limb['end'], type='ikEffector')
+        if ikEffector:
+            cmds.rename(ikEffector, limb['name']+'_effector')
+        if limb.get('ikCtrl'):
+            cmds.parent(limb['name'], limb['ikCtrl'])
+        limbHandles.append({'handle':limb['name'], 'poleControl':None})
+    cmds.select(clear=True)
+    if not poleLimbs:
+        return limbHandles
+
+    if not shapeDirectory:
+        shapeDirectory=os.path.join(cmds.pluginInfo('creativeSkeletons.py', query=True, path=True).strip('.py'),
+                                    'creativeLibrary', 'data')
+    sphereCurves=shp.shapeCurveData(shapeDirectory, 'sphere')
+    jntPoints=np.array([list(getDagPath(limb[key]).inclusiveMatrix())[12:15]
+                        for limb in poleLimbs for key in ('start', 'mid', 'end')]).reshape(-1, 3, 3)
+    polePositions=rigMath.poleVectorPositions(jntPoints[:, 0], jntPoints[:, 1], jntPoints[:, 2], distance=distance)
+
+    dagMod=om.MDagModifier()
+    ctrlObjs=[]
+    for limb in poleLimbs:
+        midName=limb['mid'].split('|')[-1]
+        ctrlObj=dagMod.createNode('transform', om.MObject.kNullObj)
+        ctrlName=midName.replace(jntNameStr, 'ctrl') if jntNameStr in midName else midName+'_ctrl'
+        dagMod.renameNode(ctrlObj, ctrlName)
+        shp.queueCurveShapes(dagMod, ctrlObj, sphereCurves, radius=ctrlSize, name=ctrlName)
+        ctrlObjs.append(ctrlObj)
+    dagMod.doIt()
+
+    overrideColor=cmds.colorIndex(colorIndex, q=True)
+    plugMod=om.MDGModifier()
+    for ctrlObj, polePosition in zip(ctrlObjs, polePositions):
+        ctrlFn=om.MFnDependencyNode(ctrlObj)
+        for axis, value in zip('XYZ', polePosition):
+            plugMod.newPlugValueDouble(ctrlFn.findPlug(f'translate{axis}', False), value)
+        plugMod.newPlugValueBool(ctrlFn.findPlug('overrideEnabled', False), True)
+        plugMod.newPlugValueBool(ctrlFn.findPlug('overrideRGBColors', False), True)
+        for channel, value in zip('RGB', overrideColor):
+            plugMod.newPlugValueFloat(ctrlFn.findPlug(f'overrideColor{channel}', False), value)
+    plugMod.doIt()
+    undoModifiers.recordModifiers([dagMod, plugMod])
+
+    handleIDs={limbHandle['handle']:i for i, limbHandle in enumerate(limbHandles)}
+    for limb, ctrlObj in zip(poleLimbs, ctrlObjs):
+        ctrlName=om.MFnDagNode(ctrlObj).partialPathName()
+        cmds.poleVectorConstraint(ctrlName, limb['name'])
+        limbHandles[handleIDs[limb['name']]]['poleControl']=ctrlName
+    return limbHandles
+
 def createIKSpline(jointStart, jointMid, jointEnd, splineName:str,
                    ctrlStart=None, ctrlMid=None, ctrlEnd=None,
                    jntNameStr:str='jnt', jntControlName:str='ctrlJnt',
                    createCustomCrv:bool=True, splineCurveName:str='ikSpline_crv',
-                   rollTwist=True):
-    
+                   rollTwist=True, fitTolerance:float|None=None):
+    '''
+    Sets up a spline IK with start, mid & end control joints skinned to the spline curve.
+    The custom curve passes through every joint of the chain, a fit tolerance instead least squares fits
+    a degree 3 curve with the fewest CVs staying within the tolerance of the joint positions (see rigMath.fitCurve).
+    Returns {'handle', 'curve', 'controlJoints', 'cvCount', 'fitError'}, the fit error is None without a fit tolerance.
+    '''
     if cmds.objectType(jointStart) != 'joint' or cmds.objectType(jointMid) != 'joint' or cmds.objectType(jointEnd) != 'joint':
         return None
     
@@ -369,34 +709,35 @@ def createIKSpline(jointStart, jointMid, jointEnd, splineName:str,
         cmds.setAttr(f'{copyJnt}.rotateY', 0)
         cmds.setAttr(f'{copyJnt}.rotateZ', 0)
 
+    fitError=None
     if createCustomCrv:
-        cmds.select(cl=True)
-        cmds.select(jointStart, hi=True)
-        jntChain=cmds.ls(selection=True)
-        cmds.select(cl=True)
-        print(jntChain)
-
-        points=[]
-        for jnt in jntChain:
-            jntPos=cmds.xform(jnt, query=True, ws=True, t=True)
-            points.append(jntPos)
-            if jnt==jointEnd:
-                print(jnt)
-                break
-        if len(points)<=3:
-            degrees=2
+        jntChain=getJointChain(jointStart, jointEnd)
+        points=[cmds.xform(jnt, query=True, ws=True, t=True) for jnt in jntChain]
+        if fitTolerance is not None:
+            curveFit=rigMath.fitCurve(points, tolerance=fitTolerance)
+            splineCurve=cmds.curve(n=splineCurveName, d=curveFit['degree'], point=curveFit['cvs'].tolist(),
+                                   knot=curveFit['knots'].tolist())
+            fitError=curveFit['error']
+            om.MGlobal.displayInfo(f"{splineCurve} fitted with {len(curveFit['cvs'])} CVs for {len(points)} joints, "
+                                   f"max error: {fitError:.4f}")
+            if curveFit['error'] > fitTolerance:
+                cmds.warning(f"{splineCurve} fit error {curveFit['error']:.4f} exceeds the {fitTolerance} tolerance.")
         else:
-            degrees=3
-        splineCurve=cmds.curve(n=splineCurveName, d=degrees, point=points)
+            if len(points)<=3:
+                degrees=2
+            else:
+                degrees=3
+            splineCurve=cmds.curve(n=splineCurveName, d=degrees, point=points)
 
         splineHandle=cmds.ikHandle(name=splineName, solver='ikSplineSolver', createCurve=False, parentCurve=False,
                       startJoint=jointStart, endEffector=jointEnd, curve=splineCurve,
                       rootOnCurve=True)[0]
         
     else:
-        splineHandle=cmds.ikHandle(name=splineName, solver='ikSplineSolver', createCurve=True, parentCurve=False,
-                      startJoint=jointStart, endEffector=jointEnd, curve=splineCurve,
-                      rootOnCurve=True)[0]
+        # the solver creates the curve, returned after the handle & effector
+        splineHandle, _, splineCurve = cmds.ikHandle(name=splineName, solver='ikSplineSolver', createCurve=True,
+                                                     parentCurve=False, startJoint=jointStart, endEffector=jointEnd,
+                                                     rootOnCurve=True)
     
     cmds.select(clear=True)
     cmds.skinCluster(copyJoints[0], copyJoints[1], copyJoints[2], splineCurve, n=splineName+'_skinCluster', 
@@ -423,43 +764,147 @@ def createIKSpline(jointStart, jointMid, jointEnd, splineName:str,
         if ctrlMid:
             cmds.connectAttr(f'{ctrlMid}.rotateY', f'{pmaNode}.input1D[2]')
 
+    return {'handle':splineHandle, 'curve':splineCurve, 'controlJoints':copyJoints,
+            'cvCount':cmds.getAttr(f'{splineCurve}.spans') + cmds.getAttr(f'{splineCurve}.degree'), 'fitError':fitError}
+
+def getJointChain(jointStart:str, jointEnd:str) -> list:
+    '''
+    Returns the joints from the start to the end joint, both included, by walking up the end joint parents.
+    Returns an empty list when the start joint is not an ancestor of the end joint.
+    '''
+    startPath=getDagPath(jointStart)
+    jntPath=getDagPath(jointEnd)
+    jntChain=[]
+    while jntPath.length() and jntPath.hasFn(om.MFn.kJoint):
+        jntChain.append(jntPath.partialPathName())
+        if jntPath==startPath:
+            return jntChain[::-1]
+        jntPath.pop()
+    return []
+
+def getChainNames(jntChain:list, chainType:str, jntNameStr:str='jnt') -> list:
+    ''' Returns the IK or FK duplicate names of the joint chain: 'arm_jnt' becomes 'arm_ik_jnt', 'arm' becomes 'arm_ik'. '''
+    leafNames=[jnt.split('|')[-1] for jnt in jntChain]
+    return [name.replace(jntNameStr, f'{chainType}_{jntNameStr}') if jntNameStr in name else f'{name}_{chainType}'
+            for name in leafNames]
+
+def _readJointValues(jnt:str) -> dict:
+    ''' Private function, returns the local values createJoints needs to rebuild the joint in place. '''
+    dependFn=om.MFnDependencyNode(getMObject(jnt))
+    values={'translate':[dependFn.findPlug(f'translate{axis}', False).asDouble() for axis in 'XYZ'],
+            'rotationOrder':dependFn.findPlug('rotateOrder', False).asShort(),
+            'radius':dependFn.findPlug('radius', False).asDouble()}
+    for attr in ('jointOrient', 'rotate', 'preferredAngle'):
+        values[attr]=[dependFn.findPlug(f'{attr}{axis}', False).asMAngle().asDegrees() for axis in 'XYZ']
+    return values
+
+def createIKFKChains(limbs:list, jntNameStr:str='jnt', blendMode:str='constraint') -> list:
+    '''
+    Creates the IK & FK duplicate chains of every limb and blends the original chains between them.
+    Limbs are {'start', 'end'} joint dictionaries. Every duplicate name is computed up front so the chains of
+    all limbs are created with their final names in a single DAG modifier pass, without selecting or renaming.
+    Blend Mode 'constraint' adds a parentConstraint per joint, 'matrix' a blendMatrix/pickMatrix network
+    driving the joint offsetParentMatrix (see blendChainMatrices).
+    Returns per limb {'bind', 'ik', 'fk', 'blends'} with the chain joint & blend node names.
+    '''
+    if blendMode not in BLEND_MODES:
+        raise ValueError(f'{blendMode} is not an available blend mode, use: {list(BLEND_MODES)}')
+    bindChains=[]
+    for limb in limbs:
+        if cmds.objectType(limb['start']) != 'joint' or cmds.objectType(limb['end']) != 'joint':
+            cmds.warning(f"{limb['start']} or {limb['end']} is not a joint, limb skipped.")
+            continue
+        jntChain=getJointChain(limb['start'], limb['end'])
+        if not jntChain:
+            cmds.warning(f"{limb['start']} is not a parent of {limb['end']}, limb skipped.")
+            continue
+        bindChains.append(jntChain)
+    if not bindChains:
+        return []
+
+    # queue the IK & FK duplicates of every chain, parents within a chain are indices of the same call
+    jntNames, parents, jntValues = [], [], []
+    for jntChain in bindChains:
+        chainValues=[_readJointValues(jnt) for jnt in jntChain]
+        chainParent=cmds.listRelatives(jntChain[0], parent=True, fullPath=True)
+        for chainType in ('ik', 'fk'):
+            offset=len(jntNames)
+            jntNames.extend(getChainNames(jntChain, chainType, jntNameStr))
+            parents.extend([chainParent[0] if chainParent else None] + list(range(offset, offset+len(jntChain)-1)))
+            jntValues.extend(chainValues)
+    createdJnts=createJoints(jntNames, parents, [values['translate'] for values in jntValues],
+                             jointOrients=[values['jointOrient'] for values in jntValues],
+                             rotationOrders=[values['rotationOrder'] for values in jntValues],
+                             jntsRad=[values['radius'] for values in jntValues],
+                             rotates=[values['rotate'] for values in jntValues],
+                             preferredAngles=[values['preferredAngle'] for values in jntValues])
+
+    limbChains=[]
+    offset=0
+    for jntChain in bindChains:
+        ikChain=createdJnts[offset:offset+len(jntChain)]
+        fkChain=createdJnts[offset+len(jntChain):offset+2*len(jntChain)]
+        offset+=2*len(jntChain)
+        limbChains.append({'bind':jntChain, 'ik':ikChain, 'fk':fkChain, 'blends':[]})
+
+    if blendMode=='matrix':
+        blendChainMatrices(limbChains)
+        return limbChains
+    for limbChain in limbChains:
+        for jnt, ikJnt, fkJnt in zip(limbChain['bind'], limbChain['ik'], limbChain['fk']):
+            limbChain['blends'].append(cmds.parentConstraint(ikJnt, fkJnt, jnt, n=jnt.split('|')[-1]+'_ik_fk_constraint')[0])
+    return limbChains
+
+def blendChainMatrices(limbChains:list) -> list:
+    '''
+    Blends every bind joint between its IK & FK joints without constraints: a blendMatrix node blends the FK
+    (input) and IK (target 0) local matrices, a pickMatrix drops the shear and drives the bind joint offsetParentMatrix.
+    The bind joint translate, rotate & joint orient are zeroed since the offset parent matrix carries the whole transform.
+    All nodes are created in one DG modifier & connected in a second one, both recorded as a single undo step,
+    the blendMatrix names are added to the limb 'blends'.
+    '''
+    dgMod=om.MDGModifier()
+    blendNodes=[]
+    for limbChain in limbChains:
+        for jnt in limbChain['bind']:
+            jntName=jnt.split('|')[-1]
+            blendObj=dgMod.createNode('blendMatrix')
+            dgMod.renameNode(blendObj, f'{jntName}_ik_fk_blendMatrix')
+            pickObj=dgMod.createNode('pickMatrix')
+            dgMod.renameNode(pickObj, f'{jntName}_ik_fk_pickMatrix')
+            blendNodes.append((blendObj, pickObj))
+    dgMod.doIt()
+
+    connectMod=om.MDGModifier()
+    nodeIt=iter(blendNodes)
+    for limbChain in limbChains:
+        for jnt, ikJnt, fkJnt in zip(limbChain['bind'], limbChain['ik'], limbChain['fk']):
+            blendObj, pickObj = next(nodeIt)
+            blendFn, pickFn = om.MFnDependencyNode(blendObj), om.MFnDependencyNode(pickObj)
+            jntFn=om.MFnDependencyNode(getMObject(jnt))
+            targetPlug=blendFn.findPlug('target', False).elementByLogicalIndex(0)
+            connectMod.connect(om.MFnDependencyNode(getMObject(fkJnt)).findPlug('matrix', False),
+                               blendFn.findPlug('inputMatrix', False))
+            connectMod.connect(om.MFnDependencyNode(getMObject(ikJnt)).findPlug('matrix', False),
+                               targetPlug.child(blendFn.attribute('targetMatrix')))
+            connectMod.newPlugValueDouble(targetPlug.child(blendFn.attribute('weight')), 0.0)
+            connectMod.connect(blendFn.findPlug('outputMatrix', False), pickFn.findPlug('inputMatrix', False))
+            connectMod.newPlugValueBool(pickFn.findPlug('useShear', False), False)
+            connectMod.connect(pickFn.findPlug('outputMatrix', False), jntFn.findPlug('offsetParentMatrix', False))
+            for attr in ('translate', 'rotate', 'jointOrient'):
+                for axis in 'XYZ':
+                    connectMod.newPlugValueDouble(jntFn.findPlug(f'{attr}{axis}', False), 0.0)
+            limbChain['blends'].append(blendFn.name())
+    connectMod.doIt()
+    undoModifiers.recordModifiers([dgMod, connectMod])
+    return limbChains
+
 def createIKFKChain(jointStart, jointEnd, jntNameStr='jnt'):
     ''' Creates IK and FK duplicate joint chain and constraints the original chain to both. '''
     if cmds.objectType(jointStart) != 'joint' or cmds.objectType(jointEnd) != 'joint':
         return None
-    jntChain=[]
-    cmds.select(jointStart, hi=True)
-    tempJntChain=cmds.ls(selection=True, type='joint')
-    for tempJnt in tempJntChain:
-        jntChain.append(tempJnt)
-        if tempJnt in jointEnd:
-            break
-
-    if jntChain:
-        ikChain=[]
-        tempIKChain=cmds.duplicate(jntChain, parentOnly=True, name='temp_ik_jnt')
-        for i, ikJnt in enumerate(tempIKChain):
-            if jntNameStr in ikJnt:
-                ikJntName=jntChain[i].replace(jntNameStr, 'ik_'+jntNameStr)
-                cmds.rename(ikJnt, ikJntName)
-            else:
-                ikJntName=jntChain[i]+'_ik'
-                cmds.rename(ikJnt, ikJntName)
-            ikChain.append(ikJntName)
-
-        fkChain=[]
-        tempFKChain=cmds.duplicate(jntChain, parentOnly=True, name='temp_fk_jnt')
-        for i, fkJnt in enumerate(tempFKChain):
-            if jntNameStr in fkJnt:
-                fkJntName=jntChain[i].replace(jntNameStr, 'fk_'+jntNameStr)
-                cmds.rename(fkJnt, fkJntName)
-            else:
-                fkJntName=jntChain[i]+'_fk'
-                cmds.rename(fkJnt, fkJntName)
-            fkChain.append(fkJntName)
-
-        for i, jnt in enumerate(jntChain):
-            cmds.parentConstraint(ikChain[i], fkChain[i], jnt, n=jnt+'_ik_fk_constraint')
+    limbChains=createIKFKChains([{'start':jointStart, 'end':jointEnd}], jntNameStr=jntNameStr)
+    return limbChains[0] if limbChains else None
 
 def createIKFKControls(jointStart, jointEnd, ctrlSize:int=15,
                        jntSearchStr:str='jnt', ctrlReplaceStr:str='ctrl',
@@ -499,7 +944,7 @@ def createIKFKControls(jointStart, jointEnd, ctrlSize:int=15,
                 if not shapeDirectory:
                     cmds.warning('No IK Shape Created')
                     return
-                shapeData=loadData(shapeDirectory, 'shapesCV_Data.json')
+                shapeData=shp.loadShapeLibrary(shapeDirectory)[1]
                 overrideColor=cmds.colorIndex(colorIndex, q=True)
                 if jntSearchStr in jnt:
                     ctrlName=jnt.replace(jntSearchStr, 'ik_'+ctrlReplaceStr)
@@ -514,6 +959,119 @@ def createIKFKControls(jointStart, jointEnd, ctrlSize:int=15,
                 cmds.matchTransform(ctrlNode, jnt)
                 break
 
+def _controlName(jnt:str, prefix:str, jntSearchStr:str='jnt', ctrlReplaceStr:str='ctrl') -> str:
+    ''' Private function, returns the createIKFKControls control name of the joint: 'arm_jnt' becomes 'arm_fk_ctrl'. '''
+    jntName=jnt.split('|')[-1]
+    return jntName.replace(jntSearchStr, prefix+ctrlReplaceStr) if jntSearchStr in jntName else prefix+jntName
+
+def createLimbControls(limbs:list, ctrlSize:float=15,
+                       jntSearchStr:str='jnt', ctrlReplaceStr:str='ctrl',
+                       colorIndex:int=6, shapeDirectory=None, ikShape:str='star') -> list:
+    '''
+    Batch createIKFKControls for whole rigs, limbs are {'start', 'end'} joint dictionaries.
+    Every chain joint world matrix is read once, zero group transforms & curve rotations are solved in NumPy,
+    all zero groups, controls & their curve shapes (from the cached shape library) are created in one DAG modifier,
+    recorded with the transform values as a single undo step. Each chain joint gets an FK control, the end joint an IK control.
+    Returns per limb {'fkControls', 'ikControls', 'zeroGroups'}.
+    '''
+    if not shapeDirectory:
+        shapeDirectory=os.path.join(cmds.pluginInfo('creativeSkeletons.py', query=True, path=True).strip('.py'),
+                                    'creativeLibrary', 'data')
+    fkCurves=shp.circleCurveData()
+    ikCurves=shp.shapeCurveData(shapeDirectory, ikShape)
+
+    jntChains=[]
+    for limb in limbs:
+        jntChain=getJointChain(limb['start'], limb['end']) if cmds.objectType(limb['start'])=='joint' else []
+        if not jntChain:
+            cmds.warning(f"{limb['start']} is not a parent joint of {limb['end']}, limb skipped.")
+            continue
+        jntChains.append(jntChain)
+    if not jntChains:
+        return []
+
+    # single world matrix read per chain joint & per child joint
+    jntMatrices, childMatrices, ownerIDs = [], [], []
+    for jnt in (jnt for jntChain in jntChains for jnt in jntChain):
+        jntPath=getDagPath(jnt)
+        jntMatrices.append(list(jntPath.inclusiveMatrix()))
+        dagFn=om.MFnDagNode(jntPath)
+        for childID in range(dagFn.childCount()):
+            childObj=dagFn.child(childID)
+            if childObj.hasFn(om.MFn.kJoint):
+                childMatrices.append(list(om.MDagPath.getAPathTo(childObj).inclusiveMatrix()))
+                ownerIDs.append(len(jntMatrices)-1)
+    ownerIDs=np.array(ownerIDs, dtype=np.int64)
+
+    # zero groups follow the joints: FK zero groups live under the previous FK control, the IK zero group in world
+    parentIDs=[]
+    for jntChain in jntChains:
+        parentIDs.extend([-1] + list(range(len(parentIDs), len(parentIDs)+len(jntChain)-1)))
+    parentIDs=np.array(parentIDs, dtype=np.int64)
+    endIDs=np.cumsum([len(jntChain) for jntChain in jntChains]) - 1
+    worldMatrices=rigMath.toMatrixArray(jntMatrices)
+    inverseMatrices=np.linalg.inv(worldMatrices)
+    localMatrices=worldMatrices.copy()
+    hasParent=parentIDs >= 0
+    localMatrices[hasParent]=worldMatrices[hasParent] @ inverseMatrices[parentIDs[hasParent]]
+
+    childOffsets=np.zeros((0, 3))
+    if childMatrices:
+        childOffsets=(rigMath.toMatrixArray(childMatrices) @ inverseMatrices[ownerIDs])[:, 3, :3]
+    # leaf joints orient their control from their own offset to the previous chain joint
+    leafIDs=np.setdiff1d(np.flatnonzero(hasParent), ownerIDs)
+    childOffsets=np.concatenate([childOffsets, localMatrices[leafIDs, 3, :3]])
+    ownerIDs=np.concatenate([ownerIDs, leafIDs])
+    curveRotations=rigMath.matricesFromEuler(rigMath.controlCurveRotations(childOffsets, ownerIDs, len(worldMatrices)))
+
+    zeroMatrices=np.concatenate([localMatrices, worldMatrices[endIDs]])
+    zeroRotations=rigMath.eulerFromMatrices(zeroMatrices)
+    zeroScales=np.linalg.norm(zeroMatrices[:, :3, :3], axis=2)
+
+    ctrlNames=[_controlName(jnt, 'fk_', jntSearchStr, ctrlReplaceStr) for jntChain in jntChains for jnt in jntChain]
+    ctrlNames.extend(_controlName(jntChain[-1], 'ik_', jntSearchStr, ctrlReplaceStr) for jntChain in jntChains)
+
+    dagMod=om.MDagModifier()
+    zeroObjs, ctrlObjs = [], []
+    for i, ctrlName in enumerate(ctrlNames):
+        parentObj=ctrlObjs[parentIDs[i]] if i < len(parentIDs) and parentIDs[i] >= 0 else om.MObject.kNullObj
+        zeroObj=dagMod.createNode('transform', parentObj)
+        dagMod.renameNode(zeroObj, ctrlName+'_zero')
+        ctrlObj=dagMod.createNode('transform', zeroObj)
+        dagMod.renameNode(ctrlObj, ctrlName)
+        zeroObjs.append(zeroObj)
+        ctrlObjs.append(ctrlObj)
+        jntID=i if i < len(parentIDs) else endIDs[i-len(parentIDs)]
+        shp.queueCurveShapes(dagMod, ctrlObj, fkCurves if i < len(parentIDs) else ikCurves, radius=ctrlSize,
+                             rotation=curveRotations[jntID], name=ctrlName)
+    dagMod.doIt()
+
+    overrideColor=cmds.colorIndex(colorIndex, q=True)
+    plugMod=om.MDGModifier()
+    for i, (zeroObj, ctrlObj) in enumerate(zip(zeroObjs, ctrlObjs)):
+        zeroFn, ctrlFn = om.MFnDependencyNode(zeroObj), om.MFnDependencyNode(ctrlObj)
+        for axis, translate, rotate, scale in zip('XYZ', zeroMatrices[i, 3, :3], zeroRotations[i], zeroScales[i]):
+            plugMod.newPlugValueDouble(zeroFn.findPlug(f'translate{axis}', False), translate)
+            plugMod.newPlugValueMAngle(zeroFn.findPlug(f'rotate{axis}', False), om.MAngle(rotate, om.MAngle.kDegrees))
+            plugMod.newPlugValueDouble(zeroFn.findPlug(f'scale{axis}', False), scale)
+        plugMod.newPlugValueBool(ctrlFn.findPlug('overrideEnabled', False), True)
+        plugMod.newPlugValueBool(ctrlFn.findPlug('overrideRGBColors', False), True)
+        for channel, value in zip('RGB', overrideColor):
+            plugMod.newPlugValueFloat(ctrlFn.findPlug(f'overrideColor{channel}', False), value)
+    plugMod.doIt()
+    undoModifiers.recordModifiers([dagMod, plugMod])
+
+    limbControls=[]
+    offset=0
+    ctrlNames=[om.MFnDagNode(ctrlObj).partialPathName() for ctrlObj in ctrlObjs]
+    zeroNames=[om.MFnDagNode(zeroObj).partialPathName() for zeroObj in zeroObjs]
+    for limbID, jntChain in enumerate(jntChains):
+        ikID=len(parentIDs)+limbID
+        limbControls.append({'fkControls':ctrlNames[offset:offset+len(jntChain)], 'ikControls':[ctrlNames[ikID]],
+                             'zeroGroups':zeroNames[offset:offset+len(jntChain)]+[zeroNames[ikID]]})
+        offset+=len(jntChain)
+    return limbControls
+
 def createFootPivots(footHandle, ankleHandle, ballHandle,
                      footJoint, ankleJoint, ballJoint,
                      mainControl,
@@ -585,51 +1143,74 @@ def setChannelBoxAttr(objs:list, translateAttr:bool=True, rotateAttr:bool=True,
         else:
             cmds.setAttr(f'{objName}.visibility', keyable=True)
 
-def savePositions(vertSelectionList:list, setName:str):
+def savePositions(vertSelectionList:list, setName:str, mode:str='centroid', directory:str|None=None) -> dict:
+    '''
+    Stores the selection's vertex indices as a named vertex set on disk, keyed by each mesh topology hash.
+    The placement mode is stored alongside so the locator placement can be replayed on the same topology.
+    Returns the stored sets: {meshName: topologyHash}.
     '''
-    Returns a position set created from the vertex selection. 
-    Selection list should only include vertex set.
+    directory=directory or getVertexSetsFolder()
+    storedSets={}
+    for meshName, indices in mu.getComponentIndices(vertSelectionList).items():
+        topologyHash=mu.getTopologyHash(getDagPath(meshName))
+        fileName=f'{topologyHash}.json'
+        vertexSets=loadData(directory, fileName) if pathExists(os.path.join(directory, fileName)) else {}
+        vertexSets[setName]={'indices':indices.tolist(), 'mode':mode}
+        saveData(directory, fileName, vertexSets)
+        storedSets[meshName]=topologyHash
+    return storedSets
+
+def loadVertexSets(meshName:str, directory:str|None=None) -> dict:
+    ''' Returns every vertex set stored for the mesh topology: {setName: {'indices', 'mode'}}. '''
+    directory=directory or getVertexSetsFolder()
+    meshPath=getDagPath(meshName)
+    meshPath.extendToShape()
+    fileName=f'{mu.getTopologyHash(meshPath)}.json'
+    if not pathExists(os.path.join(directory, fileName)):
+        return {}
+    return loadData(directory, fileName)
+
+def replayVertexSets(meshName:str, setNames:list|None=None, mode:str|None=None,
+                     locScale:float=5, directory:str|None=None) -> list:
     '''
-    vertSelectionSet={}
-    vertPositions=getVertPositions(vertSelectionList)
-    vertSelectionSet[setName]=vertPositions
-    return vertSelectionSet
+    Rebuilds the locators of the stored vertex sets (or the provided set names) on the mesh in a single batch.
+    Sets are named after their locators; each set uses its stored placement mode unless a mode is provided.
+    The mesh points are read once for every set. Returns the created locator transform names.
+    '''
+    vertexSets=loadVertexSets(meshName, directory=directory)
+    setNames=[setName for setName in (setNames or vertexSets) if setName in vertexSets]
+    if not setNames:
+        cmds.warning(f'No stored vertex sets found for {meshName} topology.')
+        return []
+
+    meshPath=getDagPath(meshName)
+    meshPath.extendToShape()
+    points=mu.getMeshPoints(meshPath)
+    positions=[]
+    for setName in setNames:
+        indices=vertexSets[setName]['indices']
+        setMode=mode or vertexSets[setName]['mode']
+        if setMode=='volume':
+            positions.append(bvh.volumeCenter(meshPath.fullPathName(), indices))
+        else:
+            positions.append(mu.componentCenter(points[indices], mode=setMode))
+    return createLocators(setNames, [locScale]*len(setNames), positions=positions)
 
 def getVertPositions(selection:list):
-    ''' Returns a list of each vertex position values from the provided selection. '''
-    # use flatten flag to place the proper position values for each selected vert
-    verts=cmds.ls(selection, flatten=True)
-    # verify that the selection is not lower than 0 vertices before proceeding
-    if len(verts) <= 0:
+    '''
+    Returns a list of each vertex world position from the provided selection.
+    Every mesh is read with a single MFnMesh.getPoints call, positions follow the mesh & vertex index order.
+    '''
+    points=mu.getComponentPoints(selection)
+    if not len(points):
         return None
-    else:
-        verts_pos=[]
-        for vert in verts:
-            if '.vtx' not in vert:
-                cmds.warning('selection set can only include vertices')
-                return
-            # get the specific 'x', 'y' or 'z' position values and store them
-            vert_pos=cmds.xform(vert, q=True, ws=True, t=True)
-            verts_pos.append(vert_pos)
-        # sort from highest to least value of each every item using the direction position value 
-        verts_pos.sort(key=lambda position: position)
-        # verts_pos.sort()
-        return verts_pos
+    return points.tolist()
 
 def getRootJoints() -> list:
-    ''' Returns a list of root joints found in the current scene. '''
-    scene_joints=cmds.ls(type='joint')
-
-    if not scene_joints:
+    ''' Returns a list of root joints found in the current scene, served by the callback maintained skeleton graph. '''
+    root_joints=skeletonIndex.getSkeletonGraph().rootJoints()
+    if not root_joints:
         print("No joints found")
-        
-    root_joints=[]
-    for joint in scene_joints:
-        # if joint has no parent or parent is not a joint, store root joint
-        parent_jnt=cmds.listRelatives(joint, parent=True, fullPath=True)
-        if not parent_jnt or cmds.nodeType(parent_jnt[0]) != 'joint':
-            root_joints.append(joint)
-
     return root_joints
 
 def selectRootJnt(root_jnt:str, contains_list:bool=False, jnts:list=[]) -> None:
@@ -651,43 +1232,75 @@ def selectRootJnt(root_jnt:str, contains_list:bool=False, jnts:list=[]) -> None:
         print(f'{root_jnt} Selected')
 
 def getUnusedJoints(root_jtns:list):
+    ''' Returns {root joint: joints of its hierarchy not bound to any skinCluster}, read from the skeleton graph. '''
+    skeletonGraph=skeletonIndex.getSkeletonGraph()
     unbinded_jnts={}
     for root_jnt in root_jtns:
-        if cmds.nodeType(root_jnt) != 'joint':
+        if not cmds.objExists(root_jnt) or cmds.nodeType(root_jnt) != 'joint':
             continue
-        if not cmds.objExists(root_jnt):
-            continue
-
-        hierarchy=cmds.listRelatives(root_jnt, allDescendents=True, type='joint', fullPath=True)
-
-        hierarchy.append(root_jnt)
-
-        unused_jnts = []
-
-        for jnt in hierarchy:
-            is_bound=False
-            connections=cmds.listConnections(f'{jnt}.worldMatrix[0]', type='skinCluster')
-
-            if connections:
-                is_bound=True
+        unbinded_jnts[root_jnt]=skeletonGraph.unboundJoints(root_jnt)
+    return unbinded_jnts
 
-            if not is_bound:
-                unused_jnts.append(jnt)
-        unbinded_jnts[root_jnt]=unused_jnts
+def bindUnusedJoints(root_jnts_data:dict) -> dict:
+    '''
+    Adds the unused joints of every root to each skinCluster its hierarchy drives,
+    all skinClusters are edited in a single corrective operation. Returns {skinCluster: {'added', 'removed'}}.
+    '''
+    skeletonGraph=skeletonIndex.getSkeletonGraph()
+    analysis={}
+    for root_jnt, unbinded_jnts in root_jnts_data.items():
+        skinClusters=dict.fromkeys(skinCluster for jnt in skeletonGraph.hierarchy(root_jnt)
+                                   for skinCluster in skeletonGraph.skinClusters(jnt))
+        for skinCluster in skinClusters:
+            missing=analysis.setdefault(skinCluster, {'missing':[]})['missing']
+            missing.extend(jnt for jnt in unbinded_jnts if jnt not in missing)
+    return skinWeights.fixInfluences(analysis, addMissing=True)
+
+def _skinWeightsFileName(nodeName:str) -> str:
+    ''' Private function, returns the file name part of a node name, namespaces & paths are flattened. '''
+    return nodeName.split('|')[-1].replace(':', '_')
+
+def exportSkinWeights(meshes:list, directory:str|None=None) -> list:
+    '''
+    Exports the skin weights of every skinned mesh, one <meshName>.<skinCluster>.npz file per skinCluster.
+    Returns the written file paths.
+    '''
+    directory=directory or getSkinWeightsFolder()
+    filePaths=[]
+    for mesh in meshes:
+        for skinCluster in skinWeights.getSkinClusters([mesh]):
+            fileName=f'{_skinWeightsFileName(mesh)}.{_skinWeightsFileName(skinCluster)}'
+            filePaths.append(skinWeights.exportWeights(skinCluster, os.path.join(directory, fileName)))
+    return filePaths
+
+def importSkinWeights(meshes:list, directory:str|None=None, vertexMapping:str='auto') -> dict:
+    '''
+    Restores the exported skin weights of every mesh onto its current skinClusters, remapped by joint name
+    and by vertex index or nearest vertex. Files are matched to the skinClusters by name, skinClusters renamed
+    since the export take the remaining files in name order (a <meshName>.npz file from older exports included).
+    Returns {mesh: {skinCluster: import result}}.
+    '''
+    directory=directory or getSkinWeightsFolder()
+    results={}
+    for mesh in meshes:
+        meshFile=_skinWeightsFileName(mesh)
+        storedFiles={filePath.name[len(meshFile)+1:-len('.npz')]:str(filePath)
+                     for filePath in sorted(Path(directory).glob(f'{meshFile}.*.npz'))}
+        if pathExists(os.path.join(directory, f'{meshFile}.npz')):
+            storedFiles['']=os.path.join(directory, f'{meshFile}.npz')
+        skinClusters=skinWeights.getSkinClusters([mesh])
+        if not storedFiles or not skinClusters:
+            cmds.warning(f'No skinCluster or exported weights found for {mesh}.')
+            continue
 
-    return unbinded_jnts
+        matches={skinCluster:storedFiles.pop(_skinWeightsFileName(skinCluster)) for skinCluster in skinClusters
+                 if _skinWeightsFileName(skinCluster) in storedFiles}
+        unmatched=[skinCluster for skinCluster in skinClusters if skinCluster not in matches]
+        matches.update(zip(unmatched, storedFiles.values()))
+        results[mesh]={skinCluster:skinWeights.importWeights(skinCluster, filePath, vertexMapping=vertexMapping)
+                       for skinCluster, filePath in matches.items()}
+    return results
 
-def bindUnusedJoints(root_jnts_data:dict):
-    for root_jnt in root_jnts_data:
-        connections=cmds.listConnections(f'{root_jnt}.worldMatrix[0]', type='skinCluster')
-        print(connections)
-    
-    for unbinded_joint in root_jnts_data.get(root_jnt):
-        for connected_cluster in connections:
-            cmds.skinCluster(connected_cluster, edit=True, 
-                           addInfluence=unbinded_joint, 
-                           weight=0.0, lockWeights=False)
-            
 def getSkinnedMeshes(selection:list) -> list:
         ''' Returns a list of skinned meshes from the provided selection. '''
         skinned_meshes=[]
@@ -748,6 +1361,18 @@ def getDocumentsFolder() -> str:
     documents_path = os.path.join(str(Path.home()), 'Documents')
     return documents_path
 
+def getVertexSetsFolder() -> str:
+    ''' Returns the folder storing the vertex sets inside the documents path, creates it when missing. '''
+    folder_path=os.path.join(getDocumentsFolder(), 'creativeSkeletons', 'vertexSets')
+    os.makedirs(folder_path, exist_ok=True)
+    return folder_path
+
+def getSkinWeightsFolder() -> str:
+    ''' Returns the folder storing the exported skin weights inside the documents path, creates it when missing. '''
+    folder_path=os.path.join(getDocumentsFolder(), 'creativeSkeletons', 'skinWeights')
+    os.makedirs(folder_path, exist_ok=True)
+    return folder_path
+
 def pathExists(file_path: str) -> bool:
     ''' Checks if a path or file path exists. '''
     if os.path.exists(file_path):
@@ -0,0 +1,185 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import rigMath
+from ..creativeLibrary import undoModifiers
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
+import numpy as np
+
+MATCH_DIRECTIONS=('ikToFk', 'fkToIk')
+
+def sampleMatrices(plugs:list, frames) -> np.ndarray:
+    '''
+    Evaluates every matrix plug at every frame through an MDGContext in one sweep, the current time never changes.
+    Returns the (F,N,4,4) matrices.
+    '''
+    samples=np.empty((len(frames), len(plugs), 16))
+    timeUnit=om.MTime.uiUnit()
+    for frameID, frame in enumerate(frames):
+        contextGuard=om.MDGContextGuard(om.MDGContext(om.MTime(float(frame), timeUnit)))
+        for plugID, plug in enumerate(plugs):
+            samples[frameID, plugID]=list(om.MFnMatrixData(plug.asMObject()).matrix())
+        del contextGuard
+    return samples.reshape(len(frames), len(plugs), 4, 4)
+
+def _matrixPlug(node:str, attr:str='worldMatrix') -> om.MPlug:
+    ''' Private function, returns the first element plug of the node matrix array attribute. '''
+    return om.MFnDependencyNode(md.getMObject(node)).findPlug(attr, False).elementByLogicalIndex(0)
+
+def _matchTargets(limb:dict, direction:str) -> list:
+    '''
+    Private function, returns the (control, source node, driven node) matches of the limb:
+    the control follows the source node keeping its current offset to the node it drives.
+    IK to FK matches every FK control to its IK joint, FK to IK matches the IK control to the FK joint of the IK end.
+    '''
+    if direction=='ikToFk':
+        return list(zip(limb['fkControls'], limb['ikJoints'], limb['fkJoints']))
+    endID=limb.get('ikEnd', 2)
+    return [(limb['ikControl'], limb['fkJoints'][endID], limb['ikJoints'][endID])]
+
+def matchLimbs(limbs:list, direction:str='ikToFk', frameRange:tuple|None=None) -> dict:
+    '''
+    Matches the IK or FK controls of every limb to the other side without toggling the IK/FK switch.
+    Limbs are {'fkControls', 'fkJoints', 'ikJoints', 'ikControl', 'poleControl', 'ikEnd'} dictionaries
+    ('poleControl' & 'ikEnd', the IK end joint index defaulting to 2, are optional).
+    Every source, control & parent matrix of every limb is evaluated for the whole frame range in a single
+    MDGContext sweep, control values are solved in NumPy and each channel gets all of its keys in one call.
+    FK to IK also places the pole control with rigMath.poleVectorPositions, keeping its current distance.
+    Without a frame range the current frame values are set (and keyed on animated channels).
+    The whole match is recorded as a single undo step.
+    Returns {'frames', 'controls'} with the frame count and matched control names.
+    '''
+    if direction not in MATCH_DIRECTIONS:
+        raise ValueError(f'{direction} is not an available match direction, use: {list(MATCH_DIRECTIONS)}')
+    currentFrame=cmds.currentTime(query=True)
+    frames=np.arange(frameRange[0], frameRange[1]+1) if frameRange else np.array([currentFrame])
+
+    targets=[target for limb in limbs for target in _matchTargets(limb, direction)]
+    poleLimbs=[limb for limb in limbs if direction=='fkToIk' and limb.get('poleControl')]
+    # every matrix is read in the same sweep, the last sample row is the current frame reference
+    nodes=list(dict.fromkeys([node for target in targets for node in target]
+                             + [jnt for limb in poleLimbs for jnt in (limb['fkJoints'][:limb.get('ikEnd', 2)+1]
+                                                                      + [limb['ikJoints'][limb.get('ikEnd', 2)//2]])]
+                             + [limb['poleControl'] for limb in poleLimbs]))
+    nodeIDs={node:i for i, node in enumerate(nodes)}
+    parentNodes=[target[0] for target in targets] + [limb['poleControl'] for limb in poleLimbs]
+    plugs=[_matrixPlug(node) for node in nodes] + [_matrixPlug(node, 'parentMatrix') for node in parentNodes]
+    samples=sampleMatrices(plugs, np.append(frames, currentFrame))
+    worldSamples, parentSamples = samples[:, :len(nodes)], samples[:, len(nodes):]
+
+    # solve the new control world matrices, offsets are measured at the current frame
+    controlWorlds={}
+    for control, sourceNode, drivenNode in targets:
+        controlSamples, drivenSamples = worldSamples[:, nodeIDs[control]], worldSamples[:, nodeIDs[drivenNode]]
+        offset=controlSamples[-1] @ np.linalg.inv(drivenSamples[-1])
+        controlWorlds[control]=offset @ worldSamples[:-1, nodeIDs[sourceNode]]
+
+    changes=[]
+    try:
+        _writeMatches(targets, poleLimbs, nodeIDs, worldSamples, parentSamples, controlWorlds,
+                      frames, frameRange is not None, changes)
+    finally:
+        # every curve & value edit of every limb is a single undo step
+        undoModifiers.recordModifiers(changes)
+    return {'frames':len(frames), 'controls':[target[0] for target in targets] + [limb['poleControl'] for limb in poleLimbs]}
+
+def _writeMatches(targets:list, poleLimbs:list, nodeIDs:dict, worldSamples:np.ndarray, parentSamples:np.ndarray,
+                  controlWorlds:dict, frames:np.ndarray, bake:bool, changes:list):
+    ''' Private function, writes the matched control & pole control values solved by matchLimbs. '''
+    # controls under a matched control follow its new matrices instead of the sampled ones
+    for targetID, (control, sourceNode, drivenNode) in enumerate(targets):
+        parentMatrices=parentSamples[:-1, targetID]
+        ancestor=_matchedAncestor(control, controlWorlds)
+        if ancestor:
+            relative=parentMatrices @ np.linalg.inv(worldSamples[:-1, nodeIDs[ancestor]])
+            parentMatrices=relative @ controlWorlds[ancestor]
+        _writeTransform(control, controlWorlds[control] @ np.linalg.inv(parentMatrices), frames, bake, changes)
+
+    for poleID, limb in enumerate(poleLimbs):
+        endID=limb.get('ikEnd', 2)
+        startPoints, midPoints, endPoints = (worldSamples[:-1, nodeIDs[limb['fkJoints'][jntID]], 3, :3]
+                                             for jntID in (0, endID//2, endID))
+        poleDistance=np.linalg.norm(worldSamples[-1, nodeIDs[limb['poleControl']], 3, :3]
+                                    - worldSamples[-1, nodeIDs[limb['ikJoints'][endID//2]], 3, :3])
+        polePoints=rigMath.poleVectorPositions(startPoints, midPoints, endPoints, distance=poleDistance)
+        poleParents=np.linalg.inv(parentSamples[:-1, len(targets)+poleID])
+        poleLocal=np.einsum('fi,fij->fj', np.hstack([polePoints, np.ones((len(frames), 1))]), poleParents)
+        _writeChannels(limb['poleControl'], 'translate', poleLocal[:, :3], frames, bake, changes)
+
+def _matchedAncestor(control:str, controlWorlds:dict) -> str|None:
+    ''' Private function, returns the closest parent of the control that is matched as well. '''
+    dagPath=md.getDagPath(control)
+    matchedPaths={md.getDagPath(node).fullPathName():node for node in controlWorlds}
+    while dagPath.length() > 1:
+        dagPath.pop()
+        if dagPath.fullPathName() in matchedPaths:
+            return matchedPaths[dagPath.fullPathName()]
+    return None
+
+def _writeTransform(control:str, localMatrices:np.ndarray, frames:np.ndarray, bake:bool, changes:list):
+    '''
+    Private function, writes the translate & rotate values of the (F,4,4) local matrices.
+    The rotate axis (and joint orient on joints) are removed first, angles follow the control rotate order without flips.
+    '''
+    dependFn=om.MFnDependencyNode(md.getMObject(control))
+    rotations=localMatrices[:, :3, :3]
+    rotateAxis=rigMath.matricesFromEuler([[dependFn.findPlug(f'rotateAxis{axis}', False).asMAngle().asDegrees() for axis in 'XYZ']])[0]
+    rotations=np.linalg.inv(rotateAxis) @ rotations
+    if dependFn.object().hasFn(om.MFn.kJoint):
+        jointOrient=rigMath.matricesFromEuler([[dependFn.findPlug(f'jointOrient{axis}', False).asMAngle().asDegrees() for axis in 'XYZ']])[0]
+        rotations=rotations @ np.linalg.inv(jointOrient)
+    rotateOrder=rigMath.ROTATE_ORDERS[dependFn.findPlug('rotateOrder', False).asShort()]
+    angles=rigMath.filterEulerAngles(rigMath.eulerFromMatrices(rotations, rotateOrder), rotateOrder)
+    _writeChannels(control, 'translate', localMatrices[:, 3, :3], frames, bake, changes)
+    _writeChannels(control, 'rotate', angles, frames, bake, changes)
+
+def _writeChannels(node:str, attr:str, values:np.ndarray, frames:np.ndarray, bake:bool, changes:list):
+    '''
+    Private function, writes the (F,3) values of the node x, y, z channels, skipping locked or non keyable channels.
+    Baking replaces the frame range keys with a single MFnAnimCurve.addKeys call per channel,
+    otherwise the values are set and the current frame key is edited (or added) on channels that are already animated.
+    Every edit goes through an MDGModifier or MAnimCurveChange appended to the changes, for undoModifiers to record.
+    Rotate values are given in degrees.
+    '''
+    dependFn=om.MFnDependencyNode(md.getMObject(node))
+    timeUnit=om.MTime.uiUnit()
+    values=np.radians(values) if attr=='rotate' else np.asarray(values)
+    plugMod=om.MDGModifier()
+    for axisID, axis in enumerate('XYZ'):
+        plug=dependFn.findPlug(f'{attr}{axis}', False)
+        if plug.isLocked or not plug.isKeyable or plug.isDestination and not oma.MAnimUtil.isAnimated(plug):
+            continue
+        animCurves=oma.MAnimUtil.findAnimation(plug)
+        curveChange=oma.MAnimCurveChange()
+        animFn=oma.MFnAnimCurve()
+        if not bake:
+            plugMod.newPlugValueDouble(plug, float(values[-1, axisID]))
+            if animCurves:
+                animFn.setObject(animCurves[0])
+                currentTime=om.MTime(float(frames[-1]), timeUnit)
+                keyID=animFn.find(currentTime)
+                if keyID is None:
+                    animFn.addKey(currentTime, float(values[-1, axisID]), change=curveChange)
+                else:
+                    animFn.setValue(keyID, float(values[-1, axisID]), change=curveChange)
+                changes.append(curveChange)
+            continue
+
+        if animCurves:
+            animFn.setObject(animCurves[0])
+            # remove the frame range keys, last first so the remaining key indices stay valid
+            startTime, endTime = om.MTime(float(frames[0]), timeUnit), om.MTime(float(frames[-1]), timeUnit)
+            for keyID in reversed(range(animFn.numKeys)):
+                if startTime <= animFn.input(keyID) <= endTime:
+                    animFn.remove(keyID, change=curveChange)
+        else:
+            curveMod=om.MDGModifier()
+            animFn.create(plug, oma.MFnAnimCurve.kAnimCurveUnknown, curveMod)
+            curveMod.doIt()
+            changes.append(curveMod)
+        times=om.MTimeArray([om.MTime(float(frame), timeUnit) for frame in frames])
+        animFn.addKeys(times, om.MDoubleArray(values[:, axisID].tolist()),
+                       oma.MFnAnimCurve.kTangentAuto, oma.MFnAnimCurve.kTangentAuto, True, change=curveChange)
+        changes.append(curveChange)
+    plugMod.doIt()
+    changes.append(plugMod)
@@ -0,0 +1,185 @@
+from ..creativeLibrary import limbMatch
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import copy
+
+# limb templates per rig, names use the {side} token and are resolved inside every character namespace
+LIMB_TEMPLATES={'creativeRig':{
+    'arm':{'sides':('left', 'right'),
+           'fkControls':['{side}_shoulder_fk_ctrl', '{side}_elbow_fk_ctrl', '{side}_wrist_fk_ctrl'],
+           'fkJoints':['{side}_shoulder_fk_jnt', '{side}_elbow_fk_jnt', '{side}_wrist_fk_jnt'],
+           'ikJoints':['{side}_shoulder_ik_jnt', '{side}_elbow_ik_jnt', '{side}_wrist_ik_jnt'],
+           'ikControl':'{side}_wrist_ik_ctrl', 'poleControl':'{side}_elbow_ik_ctrl',
+           'switch':'{side}_arm_settings_ctrl.IK', 'ikEnd':2},
+    'leg':{'sides':('left', 'right'),
+           'fkControls':['{side}_hip_fk_ctrl', '{side}_knee_fk_ctrl', '{side}_ankle_fk_ctrl', '{side}_ball_fk_ctrl'],
+           'fkJoints':['{side}_hip_fk_jnt', '{side}_knee_fk_jnt', '{side}_ankle_fk_jnt', '{side}_ball_fk_jnt'],
+           'ikJoints':['{side}_hip_ik_jnt', '{side}_knee_ik_jnt', '{side}_ankle_ik_jnt', '{side}_ball_ik_jnt'],
+           'ikControl':'{side}_foot_ik_ctrl', 'poleControl':'{side}_knee_ik_ctrl',
+           'switch':'{side}_leg_settings_ctrl.IK', 'ikEnd':2}}}
+NODE_KEYS=('fkControls', 'fkJoints', 'ikJoints', 'ikControl', 'poleControl')
+
+class limbRegistry():
+    '''
+    Describes the IK/FK limbs of every rig type and resolves them per character namespace.
+    A namespace is resolved once into MObjectHandles and cached, names are only rebuilt from the handles
+    when matching, so renamed or re-parented nodes keep working and no name is concatenated per call.
+    The cache is dropped when a scene is opened or created, or when a cached node gets deleted.
+    '''
+    def __init__(self, templates:dict|None=None):
+        self.templates=copy.deepcopy(templates if templates is not None else LIMB_TEMPLATES)
+        self.resolved={} # namespace: resolved limbs
+        self.callbackIDs=[om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._sceneChanged),
+                          om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._sceneChanged)]
+
+    def removeCallbacks(self):
+        if self.callbackIDs:
+            om.MMessage.removeCallbacks(self.callbackIDs)
+        self.callbackIDs=[]
+
+    def register(self, rigName:str, limbName:str, limbTemplate:dict):
+        ''' Adds or replaces a limb template ({'sides', 'fkControls', 'fkJoints', 'ikJoints', 'ikControl', 'poleControl', 'switch', 'ikEnd'}). '''
+        self.templates.setdefault(rigName, {})[limbName]=copy.deepcopy(limbTemplate)
+        self.clearCache()
+
+    def unregister(self, rigName:str, limbName:str|None=None):
+        ''' Removes a limb template, or every limb of the rig when no limb name is provided. '''
+        if limbName is None:
+            self.templates.pop(rigName, None)
+        else:
+            self.templates.get(rigName, {}).pop(limbName, None)
+        self.clearCache()
+
+    def clearCache(self):
+        self.resolved.clear()
+
+    def namespaces(self) -> list:
+        ''' Returns every namespace holding at least one registered limb switch, '' stands for the root namespace. '''
+        switchNames={self._switchNode(limbTemplate, side)
+                     for rigTemplates in self.templates.values() for limbTemplate in rigTemplates.values()
+                     for side in limbTemplate.get('sides', ('',))}
+        switchNodes=cmds.ls(list(switchNames), recursive=True) or []
+        return sorted({node.rpartition(':')[0] for node in switchNodes})
+
+    def resolve(self, namespace:str='') -> list:
+        ''' Returns the resolved limbs of the namespace, from the cache while every cached node still exists. '''
+        cachedLimbs=self.resolved.get(namespace)
+        if cachedLimbs and all(self.isValid(limb) for limb in cachedLimbs):
+            return cachedLimbs
+
+        resolvedLimbs=[]
+        for rigName, rigTemplates in self.templates.items():
+            for limbName, limbTemplate in rigTemplates.items():
+                for side in limbTemplate.get('sides', ('',)):
+                    resolvedLimb=self._resolveLimb(limbTemplate, side, namespace)
+                    if resolvedLimb:
+                        resolvedLimb.update({'rig':rigName, 'limb':limbName, 'side':side, 'namespace':namespace})
+                        resolvedLimbs.append(resolvedLimb)
+        self.resolved[namespace]=resolvedLimbs
+        return resolvedLimbs
+
+    def resolveLimbs(self, namespaces:list|None=None, limbNames:list|None=None, sides:list|None=None) -> list:
+        ''' Returns the resolved limbs of the namespaces (every character when none are provided) filtered by name & side. '''
+        namespaces=self.namespaces() if namespaces is None else namespaces
+        return [limb for namespace in namespaces for limb in self.resolve(namespace)
+                if (limbNames is None or limb['limb'] in limbNames) and (sides is None or limb['side'] in sides)]
+
+    def limbs(self, namespaces:list|None=None, limbNames:list|None=None, sides:list|None=None) -> list:
+        ''' Returns the limbMatch ready limbs (current node names) of the namespaces, every character when none are provided. '''
+        return [self.toMatchLimb(limb) for limb in self.resolveLimbs(namespaces, limbNames, sides)]
+
+    def match(self, direction:str='ikToFk', frameRange:tuple|None=None, namespaces:list|None=None,
+              limbNames:list|None=None, sides:list|None=None) -> dict:
+        ''' Matches every selected limb of every character in a single batched limbMatch.matchLimbs call. '''
+        limbs=self.limbs(namespaces, limbNames, sides)
+        if not limbs:
+            cmds.warning('No registered limbs were found in the scene.')
+            return {'frames':0, 'controls':[]}
+        return limbMatch.matchLimbs(limbs, direction, frameRange)
+
+    def isValid(self, resolvedLimb:dict) -> bool:
+        ''' Checks that every node of the resolved limb still exists. '''
+        return all(handle.isValid() for handle in self._handles(resolvedLimb))
+
+    def toMatchLimb(self, resolvedLimb:dict) -> dict:
+        ''' Returns the limb with its current node names, as limbMatch.matchLimbs expects. '''
+        matchLimb={key:value for key, value in resolvedLimb.items() if key not in NODE_KEYS and key!='switch'}
+        for key in NODE_KEYS:
+            handles=resolvedLimb.get(key)
+            if isinstance(handles, list):
+                matchLimb[key]=[self._name(handle) for handle in handles]
+            elif handles is not None:
+                matchLimb[key]=self._name(handles)
+        switchHandle, switchAttr = resolvedLimb['switch']
+        matchLimb['switch']=f'{self._name(switchHandle)}.{switchAttr}'
+        return matchLimb
+
+    def _resolveLimb(self, limbTemplate:dict, side:str, namespace:str) -> dict|None:
+        ''' Private method, returns the limb node handles or None when a required node is missing. '''
+        resolvedLimb={'ikEnd':limbTemplate.get('ikEnd', 2)}
+        for key in NODE_KEYS:
+            names=limbTemplate.get(key)
+            if names is None:
+                continue
+            handles=[self._handle(self._nodeName(name, side, namespace)) for name in (names if isinstance(names, list) else [names])]
+            if any(handle is None for handle in handles):
+                if key=='poleControl':
+                    continue
+                return None
+            resolvedLimb[key]=handles if isinstance(names, list) else handles[0]
+        switchHandle=self._handle(self._nodeName(self._switchNode(limbTemplate, side), '', namespace))
+        if switchHandle is None:
+            return None
+        resolvedLimb['switch']=(switchHandle, limbTemplate['switch'].rpartition('.')[2])
+        return resolvedLimb
+
+    def _handles(self, resolvedLimb:dict) -> list:
+        ''' Private method, returns every node handle of the resolved limb. '''
+        handles=[resolvedLimb['switch'][0]]
+        for key in NODE_KEYS:
+            value=resolvedLimb.get(key)
+            handles.extend(value if isinstance(value, list) else [value] if value is not None else [])
+        return handles
+
+    def _switchNode(self, limbTemplate:dict, side:str) -> str:
+        return limbTemplate['switch'].rpartition('.')[0].format(side=side)
+
+    def _nodeName(self, name:str, side:str, namespace:str) -> str:
+        name=name.format(side=side)
+        return f'{namespace}:{name}' if namespace else name
+
+    def _handle(self, nodeName:str) -> om.MObjectHandle|None:
+        selectionLs=om.MSelectionList()
+        try:
+            selectionLs.add(nodeName)
+        except RuntimeError:
+            return None
+        return om.MObjectHandle(selectionLs.getDependNode(0))
+
+    def _name(self, handle:om.MObjectHandle) -> str:
+        nodeObj=handle.object()
+        if nodeObj.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(nodeObj).partialPathName()
+        return om.MFnDependencyNode(nodeObj).name()
+
+    def _sceneChanged(self, clientData):
+        self.clearCache()
+
+# remove the callbacks of a previous module load before replacing the shared registry
+if globals().get('_LIMB_REGISTRY') is not None:
+    _LIMB_REGISTRY.removeCallbacks()
+_LIMB_REGISTRY=None
+
+def getLimbRegistry() -> limbRegistry:
+    ''' Returns the shared limb registry, created on first use. '''
+    global _LIMB_REGISTRY
+    if _LIMB_REGISTRY is None:
+        _LIMB_REGISTRY=limbRegistry()
+    return _LIMB_REGISTRY
+
+def clearLimbRegistry():
+    ''' Removes the shared limb registry & its callbacks. '''
+    global _LIMB_REGISTRY
+    if _LIMB_REGISTRY is not None:
+        _LIMB_REGISTRY.removeCallbacks()
+    _LIMB_REGISTRY=None
@@ -0,0 +1,73 @@
+from ..creativeLibrary import creativeModules as md
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+class locatorHistory():
+    '''
+    Undo/redo stack of staged locator steps, independent from maya's global undo queue.
+    Each step stores a compact locator state: {sequenceID, name, position, scale, components, created}.
+    Undoing or redoing a step only touches its own locator, nothing else in the scene is replayed.
+    '''
+    def __init__(self, maxDepth:int=50):
+        ''' Initialize an empty history, older steps are dropped past the maximum depth. '''
+        self.maxDepth=maxDepth
+        self.steps=[]
+        self.index=0 # steps before the index are done, steps after it can be redone
+
+    def canUndo(self) -> bool:
+        return self.index > 0
+
+    def canRedo(self) -> bool:
+        return self.index < len(self.steps)
+
+    def clear(self):
+        ''' Removes every step, the staged locators are left in the scene. '''
+        self.steps.clear()
+        self.index=0
+
+    def record(self, sequenceID:str, locName:str, components:list|None=None, created:bool=True) -> dict:
+        '''
+        Records a staged locator step and discards any step that could still be redone.
+        Created locators are deleted on undo & rebuilt on redo, stored (existing) locators are only unstaged.
+        '''
+        step={'sequenceID':sequenceID, 'name':locName, 'components':components, 'created':created}
+        step.update(self._readState(locName))
+        del self.steps[self.index:]
+        self.steps.append(step)
+        if len(self.steps) > self.maxDepth:
+            self.steps.pop(0)
+        self.index=len(self.steps)
+        return step
+
+    def undo(self) -> dict|None:
+        ''' Reverts the last done step, returns it or None when there is nothing to undo. '''
+        if not self.canUndo():
+            return None
+        self.index-=1
+        step=self.steps[self.index]
+        if step['created'] and cmds.objExists(step['name']):
+            # keep any edit made after the creation so the redo restores the locator as it was left
+            step.update(self._readState(step['name']))
+            dagMod=om.MDagModifier()
+            dagMod.deleteNode(md.getMObject(step['name']))
+            dagMod.doIt()
+        return step
+
+    def redo(self) -> dict|None:
+        ''' Re-applies the next undone step, returns it or None when there is nothing to redo. '''
+        if not self.canRedo():
+            return None
+        step=self.steps[self.index]
+        self.index+=1
+        if step['created'] and not cmds.objExists(step['name']):
+            step['name']=md.createLocators([step['name']], [step['scale']], positions=[step['position']])[0]
+        return step
+
+    def _readState(self, locName:str) -> dict:
+        ''' Private method, returns the locator world position & local scale. '''
+        if not cmds.objExists(locName):
+            return {'position':[0.0, 0.0, 0.0], 'scale':1.0}
+        locShape=next((shape for shape in cmds.listRelatives(locName, shapes=True) or []
+                       if cmds.nodeType(shape) in md.LOCATOR_TYPES), None)
+        return {'position':cmds.xform(locName, query=True, worldSpace=True, translation=True),
+                'scale':cmds.getAttr(f'{locShape}.localScaleX') if locShape else 1.0}
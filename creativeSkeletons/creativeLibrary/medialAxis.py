@@ -0,0 +1,360 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import meshUtils as mu
+import maya.cmds as cmds
+import numpy as np
+
+# 6-connected & 26-connected voxel neighborhood offsets
+NEIGHBOR_OFFSETS=np.array([[1,0,0], [-1,0,0], [0,1,0], [0,-1,0], [0,0,1], [0,0,-1]])
+FULL_NEIGHBOR_OFFSETS=np.array([[x,y,z] for x in (-1,0,1) for y in (-1,0,1) for z in (-1,0,1) if x or y or z])
+
+# voxel related functions
+def voxelizeMesh(points:np.ndarray, triangles:np.ndarray,
+                 resolution:int=64, chunkSize:int=250000) -> tuple:
+    '''
+    Voxelizes a closed mesh by casting a parity ray along Z through every XY voxel column.
+    Triangles are processed in chunks and only columns crossed by the surface are stored.
+    Returns the inside voxel coordinates (N,3), the grid origin and the voxel size.
+    '''
+    points=np.asarray(points, dtype=np.float64)
+    triangles=np.asarray(triangles, dtype=np.int64)
+    bboxMin, bboxMax = points.min(axis=0), points.max(axis=0)
+    voxelSize=(bboxMax-bboxMin).max() / resolution
+    # pad the grid by a voxel so the outer border is always outside
+    origin=bboxMin - voxelSize
+    gridShape=np.ceil((bboxMax-origin)/voxelSize).astype(np.int64) + 1
+
+    columnIDs, hitDepths = [], []
+    for chunkStart in range(0, len(triangles), chunkSize):
+        triPoints=(points[triangles[chunkStart:chunkStart+chunkSize]] - origin) / voxelSize - 0.5
+        triMin, triMax = triPoints.min(axis=1), triPoints.max(axis=1)
+        startX, startY = np.ceil(triMin[:, 0]).astype(np.int64), np.ceil(triMin[:, 1]).astype(np.int64)
+        countX=np.maximum(np.floor(triMax[:, 0]).astype(np.int64) - startX + 1, 0)
+        countY=np.maximum(np.floor(triMax[:, 1]).astype(np.int64) - startY + 1, 0)
+
+        # expand every triangle into the voxel columns covered by its XY bounding box
+        counts=countX*countY
+        pairTris=np.repeat(np.arange(len(triPoints)), counts)
+        offsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        columnX=startX[pairTris] + offsets % countX[pairTris]
+        columnY=startY[pairTris] + offsets // countX[pairTris]
+
+        # 2D barycentric test of the column center against the projected triangle
+        pointA, pointB, pointC = triPoints[pairTris, 0], triPoints[pairTris, 1], triPoints[pairTris, 2]
+        area=(pointB[:, 0]-pointA[:, 0])*(pointC[:, 1]-pointA[:, 1]) - (pointC[:, 0]-pointA[:, 0])*(pointB[:, 1]-pointA[:, 1])
+        valid=np.abs(area) > 1e-12
+        area=np.where(valid, area, 1.0)
+        weightB=((columnX-pointA[:, 0])*(pointC[:, 1]-pointA[:, 1]) - (pointC[:, 0]-pointA[:, 0])*(columnY-pointA[:, 1])) / area
+        weightC=((pointB[:, 0]-pointA[:, 0])*(columnY-pointA[:, 1]) - (columnX-pointA[:, 0])*(pointB[:, 1]-pointA[:, 1])) / area
+        weightA=1.0 - weightB - weightC
+        valid&=(weightA >= 0.0) & (weightB >= 0.0) & (weightC > 0.0)
+        depth=weightA*pointA[:, 2] + weightB*pointB[:, 2] + weightC*pointC[:, 2]
+
+        columnIDs.append((columnX*gridShape[1] + columnY)[valid])
+        hitDepths.append(depth[valid])
+
+    columnIDs, hitDepths = np.concatenate(columnIDs), np.concatenate(hitDepths)
+    sortOrder=np.lexsort((hitDepths, columnIDs))
+    columnIDs, hitDepths = columnIDs[sortOrder], hitDepths[sortOrder]
+
+    # pair consecutive hits of each column (entry, exit), columns with an odd hit count drop their last hit
+    firstHit=np.r_[True, columnIDs[1:] != columnIDs[:-1]]
+    hitRank=np.arange(len(columnIDs)) - np.maximum.accumulate(np.where(firstHit, np.arange(len(columnIDs)), 0))
+    entries=np.flatnonzero((hitRank % 2 == 0))
+    entries=entries[(entries+1 < len(columnIDs))]
+    entries=entries[columnIDs[entries+1] == columnIDs[entries]]
+
+    startZ=np.ceil(hitDepths[entries]).astype(np.int64)
+    countZ=np.maximum(np.floor(hitDepths[entries+1]).astype(np.int64) - startZ + 1, 0)
+    spanColumns=np.repeat(columnIDs[entries], countZ)
+    voxelZ=np.repeat(startZ, countZ) + np.arange(countZ.sum()) - np.repeat(np.cumsum(countZ) - countZ, countZ)
+    voxels=np.stack([spanColumns // gridShape[1], spanColumns % gridShape[1], voxelZ], axis=1)
+    return np.unique(voxels, axis=0), origin, voxelSize
+
+def _voxelKeys(voxels:np.ndarray) -> np.ndarray:
+    ''' Private function, packs (N,3) integer voxel coordinates into a single int64 key per voxel. '''
+    voxels=voxels + (1 << 20) # keeps every coordinate positive inside its 21 bits
+    return (voxels[:, 0] << 42) | (voxels[:, 1] << 21) | voxels[:, 2]
+
+def voxelNeighbors(voxels:np.ndarray, offsets:np.ndarray=NEIGHBOR_OFFSETS) -> np.ndarray:
+    '''
+    Returns the (N,K) index of each voxel's neighbors for the K offsets, -1 where the neighbor is outside.
+    Neighbors are looked up in the sorted packed voxel keys, no grid is allocated.
+    '''
+    neighbors=np.full((len(voxels), len(offsets)), -1, dtype=np.int64)
+    if not len(voxels):
+        return neighbors
+    keys=_voxelKeys(voxels)
+    sortOrder=np.argsort(keys)
+    sortedKeys=keys[sortOrder]
+    for offsetID, offset in enumerate(offsets):
+        offsetKeys=_voxelKeys(voxels + offset)
+        found=np.minimum(np.searchsorted(sortedKeys, offsetKeys), len(sortedKeys) - 1)
+        neighbors[:, offsetID]=np.where(sortedKeys[found] == offsetKeys, sortOrder[found], -1)
+    return neighbors
+
+def distanceTransform(voxels:np.ndarray, chunkSize:int=1 << 22) -> np.ndarray:
+    '''
+    Returns the exact euclidean distance (in voxels) from each inside voxel to the closest outside voxel.
+    Computed as three separable 1D passes over the runs of inside voxels, only the voxels themselves are stored.
+    '''
+    squared=np.full(len(voxels), np.inf)
+    if not len(voxels):
+        return squared
+    for axis in range(3):
+        squared=_distancePass(voxels, squared, axis, chunkSize)
+    return np.sqrt(squared)
+
+def _distancePass(voxels:np.ndarray, squared:np.ndarray, axis:int, chunkSize:int) -> np.ndarray:
+    '''
+    Private function, returns the squared distances after a 1D lower envelope pass along the axis.
+    Every voxel missing from the list is outside (zero distance), so the closest value of a voxel always comes from
+    its own run of consecutive inside voxels or the outside voxels closing that run.
+    Runs of the same length are solved together as (R,L,L) blocks of at most chunkSize values.
+    '''
+    lineAxes=[lineAxis for lineAxis in range(3) if lineAxis!=axis]
+    order=np.lexsort((voxels[:, axis], voxels[:, lineAxes[1]], voxels[:, lineAxes[0]]))
+    coords=voxels[order]
+    newRun=np.r_[True, (coords[1:, lineAxes] != coords[:-1, lineAxes]).any(axis=1) | (np.diff(coords[:, axis]) != 1)]
+    runStarts=np.flatnonzero(newRun)
+    runLengths=np.diff(np.r_[runStarts, len(coords)])
+    runIDs=np.cumsum(newRun) - 1
+    runPositions=np.arange(len(coords)) - runStarts[runIDs]
+    # distance to the outside voxels before & after the run
+    result=np.minimum(runPositions + 1, runLengths[runIDs] - runPositions).astype(np.float64)**2
+
+    values=squared[order]
+    for runLength in np.unique(runLengths):
+        lengthRuns=runStarts[runLengths == runLength]
+        squaredOffsets=((np.arange(runLength)[:, None] - np.arange(runLength)[None, :])**2).astype(np.float64)
+        runsPerChunk=max(1, chunkSize // (runLength*runLength))
+        for chunkStart in range(0, len(lengthRuns), runsPerChunk):
+            voxelIDs=lengthRuns[chunkStart:chunkStart+runsPerChunk, None] + np.arange(runLength)
+            runValues=values[voxelIDs]
+            if not np.isfinite(runValues).any():
+                continue
+            envelope=(runValues[:, None, :] + squaredOffsets[None]).min(axis=2)
+            result[voxelIDs]=np.minimum(result[voxelIDs], envelope)
+
+    squared=np.empty_like(result)
+    squared[order]=result
+    return squared
+
+# skeleton related functions
+def geodesicDistance(neighbors:np.ndarray, seed:int, fullNeighbors:np.ndarray|None=None) -> np.ndarray:
+    '''
+    Returns the breadth first (voxel step) distance from the seed voxel, -1 for unreachable voxels.
+    When the 26-connected neighbors are provided, steps alternate between both neighborhoods (octagonal distance)
+    which keeps the distance level sets much closer to euclidean spheres.
+    '''
+    distance=np.full(len(neighbors), -1, dtype=np.int64)
+    distance[seed]=0
+    frontier=np.array([seed])
+    step=0
+    while frontier.size:
+        step+=1
+        stepNeighbors=fullNeighbors if fullNeighbors is not None and step % 2 else neighbors
+        candidates=stepNeighbors[frontier].ravel()
+        candidates=np.unique(candidates[candidates >= 0])
+        frontier=candidates[distance[candidates] < 0]
+        distance[frontier]=step
+    return distance
+
+def labelComponents(neighbors:np.ndarray, groups:np.ndarray) -> np.ndarray:
+    ''' Returns a connected component label for each voxel, voxels only connect inside the same group. '''
+    labels=np.arange(len(neighbors))
+    sameGroup=(neighbors >= 0) & (groups[np.maximum(neighbors, 0)] == groups[:, None])
+    safeNeighbors=np.where(sameGroup, neighbors, np.arange(len(neighbors))[:, None])
+    while True:
+        newLabels=labels[safeNeighbors].min(axis=1)
+        newLabels=np.minimum(newLabels, labels)
+        # pointer jumping speeds up the propagation across long components
+        newLabels=newLabels[newLabels]
+        if np.array_equal(newLabels, labels):
+            return labels
+        labels=newLabels
+
+def extractSkeletonGraph(voxels:np.ndarray, bandWidth:float=2.0) -> tuple:
+    '''
+    Collapses the voxels into a curve skeleton graph.
+    Voxels are thinned by geodesic level sets grown from the thick core of the volume, every connected band becomes a
+    node placed at its distance weighted centroid (pulled onto the medial axis by the distance transform).
+    Returns node positions in voxel space (M,3), node radii (M,) and parent indices (M,), -1 for the root.
+    '''
+    neighbors=voxelNeighbors(voxels)
+    fullNeighbors=voxelNeighbors(voxels, FULL_NEIGHBOR_OFFSETS)
+    distanceField=distanceTransform(voxels)
+    # root the tree at the thick voxel closest to the volume centroid, plain maxima often tie on the extremities
+    thick=np.flatnonzero(distanceField >= distanceField.max()*0.75)
+    seed=int(thick[np.argmin(np.linalg.norm(voxels[thick] - voxels.mean(axis=0), axis=1))])
+    geodesic=geodesicDistance(neighbors, seed, fullNeighbors)
+
+    # unreachable voxels (separate shells) are dropped
+    reachable=geodesic >= 0
+    bands=np.where(reachable, geodesic // bandWidth, -1).astype(np.int64)
+    labels=labelComponents(fullNeighbors, bands)
+    labels[~reachable]=-1
+    nodeKeys, nodeIDs = np.unique(labels[reachable], return_inverse=True)
+    voxelNodes=np.full(len(voxels), -1, dtype=np.int64)
+    voxelNodes[reachable]=nodeIDs
+
+    weights=distanceField[reachable]**2
+    positions=np.zeros((len(nodeKeys), 3))
+    np.add.at(positions, nodeIDs, voxels[reachable]*weights[:, None])
+    totalWeights=np.bincount(nodeIDs, weights=weights, minlength=len(nodeKeys))
+    positions/=totalWeights[:, None]
+    radii=np.zeros(len(nodeKeys))
+    np.maximum.at(radii, nodeIDs, distanceField[reachable])
+    nodeBands=np.zeros(len(nodeKeys), dtype=np.int64)
+    nodeBands[nodeIDs]=bands[reachable]
+
+    # nodes connect to the touching node of the previous band, giving a tree rooted at the seed band
+    pairA=np.repeat(voxelNodes, fullNeighbors.shape[1])
+    pairB=np.where(fullNeighbors.ravel() >= 0, voxelNodes[np.maximum(fullNeighbors.ravel(), 0)], -1)
+    valid=(pairA >= 0) & (pairB >= 0)
+    pairA, pairB = pairA[valid], pairB[valid]
+    isParent=nodeBands[pairB] == nodeBands[pairA] - 1
+    parents=np.full(len(nodeKeys), -1, dtype=np.int64)
+    parents[pairA[isParent]]=pairB[isParent]
+    return positions, radii, parents
+
+def simplifyGraph(positions:np.ndarray, parents:np.ndarray, radii:np.ndarray|None=None, tolerance:float=1.0,
+                  minBranchLength:float=3.0, radiusScale:float=1.5) -> tuple:
+    '''
+    Simplifies a skeleton tree into a joint graph.
+    Leaf branches shorter than the minimum length (or the branch point radius times the radius scale) are pruned,
+    then each chain between branch points is reduced with Douglas-Peucker.
+    Returns the joint positions (J,3) and parent indices (J,), -1 for the root.
+    '''
+    positions=np.asarray(positions, dtype=np.float64)
+    parents=np.array(parents, dtype=np.int64)
+    radii=np.zeros(len(parents)) if radii is None else np.asarray(radii)
+    children=[[] for i in range(len(parents))]
+    for node, parent in enumerate(parents):
+        if parent >= 0:
+            children[parent].append(node)
+    root=int(np.flatnonzero(parents < 0)[0])
+
+    # prune leaf branches shorter than the minimum length, repeated until every leaf is long enough
+    pruned=True
+    while pruned:
+        pruned=False
+        for node in range(len(parents)):
+            if children[node] or parents[node] < 0:
+                continue
+            chain=[node]
+            while parents[chain[-1]] >= 0 and len(children[parents[chain[-1]]]) == 1:
+                chain.append(parents[chain[-1]])
+            # a branch point losing all its children becomes a leaf itself, collapsing tip fans & blobs
+            branchPoint=parents[chain[-1]]
+            if branchPoint < 0:
+                continue
+            chainLength=np.linalg.norm(np.diff(positions[chain + [branchPoint]], axis=0), axis=1).sum()
+            # radius of the body the branch grows out of, branch points near a tip have a shrinking radius
+            localRadius, ancestor = radii[branchPoint], branchPoint
+            while parents[ancestor] >= 0 and np.linalg.norm(positions[ancestor] - positions[branchPoint]) < chainLength:
+                ancestor=parents[ancestor]
+                localRadius=max(localRadius, radii[ancestor])
+            if chainLength < max(minBranchLength, localRadius*radiusScale):
+                children[branchPoint].remove(chain[-1])
+                for chainNode in chain:
+                    parents[chainNode]=-2 # flag as removed
+                    children[chainNode]=[]
+                pruned=True
+
+    # walk every chain between branch points and only keep its Douglas-Peucker points
+    jointPositions, jointParents = [positions[root]], [-1]
+    stack=[(child, 0) for child in children[root]]
+    while stack:
+        node, parentJoint = stack.pop()
+        chain=[node]
+        while len(children[chain[-1]]) == 1:
+            chain.append(children[chain[-1]][0])
+        chainPoints=np.vstack([jointPositions[parentJoint], positions[chain]])
+        keep=_douglasPeucker(chainPoints, tolerance)[1:]
+        for pointID in keep:
+            # points closer than the tolerance collapse into their parent joint
+            if np.linalg.norm(chainPoints[pointID] - jointPositions[parentJoint]) < tolerance:
+                continue
+            jointPositions.append(chainPoints[pointID])
+            jointParents.append(parentJoint)
+            parentJoint=len(jointPositions) - 1
+        stack.extend((child, parentJoint) for child in children[chain[-1]])
+
+    return np.array(jointPositions), np.array(jointParents)
+
+def _douglasPeucker(points:np.ndarray, tolerance:float) -> list:
+    ''' Private function, returns the indices of the points kept by the Douglas-Peucker simplification. '''
+    keep=np.zeros(len(points), dtype=bool)
+    keep[[0, -1]]=True
+    stack=[(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment=points[end] - points[start]
+        segmentLength=np.linalg.norm(segment)
+        offsets=points[start+1:end] - points[start]
+        if segmentLength < 1e-12:
+            distances=np.linalg.norm(offsets, axis=1)
+        else:
+            distances=np.linalg.norm(np.cross(offsets, segment/segmentLength), axis=1)
+        farthest=int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split=start + 1 + farthest
+            keep[split]=True
+            stack.extend([(start, split), (split, end)])
+    return list(np.flatnonzero(keep))
+
+def meshJointGraph(points:np.ndarray, triangles:np.ndarray, resolution:int=64,
+                   bandWidth:float=2.0, tolerance:float=1.0, minBranchLength:float=4.0) -> tuple:
+    '''
+    Runs the full pipeline: voxelize, distance transform, level set thinning and simplification.
+    Tolerance & minimum branch length are given in voxels. Returns world joint positions (J,3) and parents (J,).
+    '''
+    voxels, origin, voxelSize = voxelizeMesh(points, triangles, resolution=resolution)
+    if not len(voxels):
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    positions, radii, parents = extractSkeletonGraph(voxels, bandWidth=bandWidth)
+    jointPositions, jointParents = simplifyGraph(positions, parents, radii, tolerance=tolerance,
+                                                 minBranchLength=minBranchLength)
+    # voxel coordinates are stored at the voxel center
+    return origin + (jointPositions + 0.5)*voxelSize, jointParents
+
+# maya related functions
+def buildSkeletonFromMesh(meshName:str|None=None, jntName:str='skeleton', resolution:int=64,
+                          tolerance:float=1.0, minBranchLength:float=4.0,
+                          orientJoint:str='xyz', secAxisOrient:str='yup',
+                          jntsRad:float=3, prefix:str='', suffix:str='_jnt') -> list:
+    '''
+    Extracts a joint graph from the mesh (or selected mesh) volume and builds it with the batched joint builder.
+    Mesh must be closed (watertight) for the voxelization. Returns the created joint names, root first.
+    '''
+    if not meshName:
+        selection=cmds.ls(selection=True, type='transform')
+        if not selection:
+            cmds.warning('Select a mesh to extract the skeleton from.')
+            return []
+        meshName=selection[0]
+    meshPath=md.getDagPath(meshName)
+    meshPath.extendToShape()
+    jointPositions, jointParents = meshJointGraph(mu.getMeshPoints(meshPath), mu.getMeshTriangles(meshPath),
+                                                  resolution=resolution, tolerance=tolerance,
+                                                  minBranchLength=minBranchLength)
+    if not len(jointPositions):
+        cmds.warning(f'No volume found for {meshName}, mesh must be closed.')
+        return []
+
+    # joints are created without orientation, so local translations are plain world offsets
+    parentPositions=np.where(jointParents[:, None] >= 0, jointPositions[np.maximum(jointParents, 0)], 0.0)
+    translates=jointPositions - parentPositions
+    jntNames=[f'{prefix}{jntName}_{i:02d}{suffix}' for i in range(len(jointPositions))]
+    parents=[int(parent) if parent >= 0 else None for parent in jointParents]
+    # joint creation (recorded by the plugin command) & orientation are a single undo step
+    cmds.undoInfo(openChunk=True, chunkName='medialAxis: buildSkeletonFromMesh')
+    try:
+        createdJnts=md.createJoints(jntNames, parents, translates.tolist(), jntsRad=jntsRad)
+        cmds.joint(createdJnts[0], edit=True, orientJoint=orientJoint,
+                   secondaryAxisOrient=secAxisOrient, children=True, zeroScaleOrient=True)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return createdJnts
@@ -0,0 +1,225 @@
+from ..creativeLibrary import meshUtils as mu
+import maya.api.OpenMaya as om
+import numpy as np
+
+# remove the callbacks of a previous module load before replacing the cache
+for _entry in globals().get('_BVH_CACHE', {}).values():
+    om.MMessage.removeCallbacks(_entry.get('callbackIDs', []))
+# mesh name: {'bvh', 'topologyHash', 'pointHash', 'dirty', 'callbackIDs'}
+_BVH_CACHE={}
+
+class triangleBVH():
+    ''' Bounding volume hierarchy over mesh triangles stored as flat NumPy arrays. '''
+    def __init__(self, points:np.ndarray, triangles:np.ndarray, leafSize:int=8):
+        ''' Builds the hierarchy by splitting triangle centroids at the median of the longest axis. '''
+        self.points=np.asarray(points, dtype=np.float64)
+        self.triangles=np.asarray(triangles, dtype=np.int64)
+        triPoints=self.points[self.triangles]
+        triMin, triMax = triPoints.min(axis=1), triPoints.max(axis=1)
+        centroids=triPoints.mean(axis=1)
+
+        # precompute triangle edges for the ray intersection test
+        self.triOrigin=triPoints[:, 0]
+        self.triEdgeA=triPoints[:, 1] - triPoints[:, 0]
+        self.triEdgeB=triPoints[:, 2] - triPoints[:, 0]
+
+        order=np.arange(len(self.triangles))
+        nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount = [], [], [], [], [], []
+        stack=[(0, len(order), -1, False)]
+        while stack:
+            start, end, parentID, isRight = stack.pop()
+            nodeID=len(nodeMin)
+            if parentID>=0:
+                (nodeRight if isRight else nodeLeft)[parentID]=nodeID
+
+            nodeTris=order[start:end]
+            nodeMin.append(triMin[nodeTris].min(axis=0))
+            nodeMax.append(triMax[nodeTris].max(axis=0))
+            nodeLeft.append(-1)
+            nodeRight.append(-1)
+            nodeStart.append(start)
+            nodeCount.append(end-start)
+            if end-start <= leafSize:
+                continue
+
+            nodeCentroids=centroids[nodeTris]
+            axis=np.argmax(nodeCentroids.max(axis=0) - nodeCentroids.min(axis=0))
+            mid=(end-start)//2
+            order[start:end]=nodeTris[np.argpartition(nodeCentroids[:, axis], mid)]
+            # inner nodes keep no triangles, only leaves are tested
+            nodeCount[nodeID]=0
+            stack.append((start+mid, end, nodeID, True))
+            stack.append((start, start+mid, nodeID, False))
+
+        self.order=order
+        self.nodeMin, self.nodeMax = np.array(nodeMin), np.array(nodeMax)
+        self.nodeLeft, self.nodeRight = np.array(nodeLeft), np.array(nodeRight)
+        self.nodeStart, self.nodeCount = np.array(nodeStart), np.array(nodeCount)
+
+    def intersectRays(self, origins:np.ndarray, directions:np.ndarray, tMax:np.ndarray|float=np.inf) -> tuple:
+        '''
+        Returns every hit along the rays as (rayIDs, distances) arrays, not only the closest one.
+        Every ray is traversed at the same time, one hierarchy level per iteration.
+        '''
+        origins=np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions=np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        tMax=np.broadcast_to(np.asarray(tMax, dtype=np.float64), (len(origins),))
+        with np.errstate(divide='ignore'):
+            invDirections=1.0 / np.where(np.abs(directions) < 1e-12, 1e-12, directions)
+
+        rayIDs=np.arange(len(origins))
+        nodeIDs=np.zeros(len(origins), dtype=np.int64)
+        hitRays, hitDistances = [], []
+        while rayIDs.size:
+            # slab test against the node bounding boxes
+            slabA=(self.nodeMin[nodeIDs] - origins[rayIDs]) * invDirections[rayIDs]
+            slabB=(self.nodeMax[nodeIDs] - origins[rayIDs]) * invDirections[rayIDs]
+            tNear=np.minimum(slabA, slabB).max(axis=1)
+            tFar=np.maximum(slabA, slabB).min(axis=1)
+            keep=(tFar >= np.maximum(tNear, 0.0)) & (tNear <= tMax[rayIDs])
+            rayIDs, nodeIDs = rayIDs[keep], nodeIDs[keep]
+
+            isLeaf=self.nodeLeft[nodeIDs] < 0
+            if isLeaf.any():
+                leafRays, leafNodes = rayIDs[isLeaf], nodeIDs[isLeaf]
+                counts=self.nodeCount[leafNodes]
+                pairRays=np.repeat(leafRays, counts)
+                offsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                pairTris=self.order[np.repeat(self.nodeStart[leafNodes], counts) + offsets]
+                distances, valid = self._intersectTriangles(origins[pairRays], directions[pairRays], pairTris)
+                valid&=distances <= tMax[pairRays]
+                hitRays.append(pairRays[valid])
+                hitDistances.append(distances[valid])
+
+            innerRays, innerNodes = rayIDs[~isLeaf], nodeIDs[~isLeaf]
+            rayIDs=np.concatenate([innerRays, innerRays])
+            nodeIDs=np.concatenate([self.nodeLeft[innerNodes], self.nodeRight[innerNodes]])
+
+        if not hitRays:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(hitRays), np.concatenate(hitDistances)
+
+    def _intersectTriangles(self, origins:np.ndarray, directions:np.ndarray, triIDs:np.ndarray) -> tuple:
+        ''' Private method, vectorized Moller-Trumbore test for ray & triangle pairs. '''
+        edgeA, edgeB = self.triEdgeA[triIDs], self.triEdgeB[triIDs]
+        pVector=np.cross(directions, edgeB)
+        determinant=np.einsum('ij,ij->i', edgeA, pVector)
+        valid=np.abs(determinant) > 1e-12
+        invDeterminant=1.0 / np.where(valid, determinant, 1.0)
+
+        tVector=origins - self.triOrigin[triIDs]
+        u=np.einsum('ij,ij->i', tVector, pVector) * invDeterminant
+        qVector=np.cross(tVector, edgeA)
+        v=np.einsum('ij,ij->i', directions, qVector) * invDeterminant
+        distances=np.einsum('ij,ij->i', edgeB, qVector) * invDeterminant
+        valid&=(u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (distances >= 0.0)
+        return distances, valid
+
+def lineVolumeMidpoints(bvh:triangleBVH, center:np.ndarray, directions:np.ndarray) -> np.ndarray:
+    '''
+    Casts a line through the center along each direction and returns the mid-point between
+    the closest surface hit on each side of the center. Lines missing either side are returned as NaN.
+    '''
+    directions=np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    directions=directions / np.linalg.norm(directions, axis=1, keepdims=True) # never normalize the caller's array
+    # start every line outside of the mesh so both the entry & the exit hits are found
+    length=np.linalg.norm(bvh.nodeMax[0] - bvh.nodeMin[0]) + np.linalg.norm(center - bvh.nodeMin[0])
+    origins=center - directions*length
+    rayIDs, distances = bvh.intersectRays(origins, directions, tMax=2*length)
+
+    entryHits=np.full(len(directions), -np.inf)
+    exitHits=np.full(len(directions), np.inf)
+    before=distances <= length
+    np.maximum.at(entryHits, rayIDs[before], distances[before])
+    np.minimum.at(exitHits, rayIDs[~before], distances[~before])
+
+    midpoints=origins + directions*((entryHits + exitHits)*0.5)[:, None]
+    midpoints[~(np.isfinite(entryHits) & np.isfinite(exitHits))]=np.nan
+    return midpoints
+
+def loopDirections(points:np.ndarray, numDirections:int=8) -> np.ndarray:
+    ''' Returns evenly spread directions lying on the best fit plane of the provided loop points. '''
+    centered=points - points.mean(axis=0)
+    # the smallest singular vector is the loop's normal (limb axis), the other two span the loop plane
+    axisU, axisV = np.linalg.svd(centered, full_matrices=False)[2][:2]
+    angles=np.linspace(0.0, np.pi, numDirections, endpoint=False)
+    return np.cos(angles)[:, None]*axisU + np.sin(angles)[:, None]*axisV
+
+# cache related functions
+def _markDirty(node, clientData):
+    ''' Private node dirty callback, flags the cached hierarchy to be validated on the next query. '''
+    entry=_BVH_CACHE.get(clientData)
+    if entry:
+        entry['dirty']=True
+
+def _meshRemoved(node, clientData):
+    ''' Private node pre removal callback, drops the cached hierarchy of the deleted mesh & its callbacks. '''
+    entry=_BVH_CACHE.pop(clientData, None)
+    if entry:
+        om.MMessage.removeCallbacks(entry['callbackIDs'])
+
+def getMeshBVH(meshName:str) -> triangleBVH:
+    '''
+    Returns the cached object space hierarchy of the mesh, built once per topology & point hash.
+    A node dirty callback flags the cache so unchanged meshes skip the hash validation,
+    a pre removal callback drops the cached hierarchy when the mesh gets deleted.
+    '''
+    entry=_BVH_CACHE.get(meshName)
+    if entry and not entry['dirty']:
+        return entry['bvh']
+
+    selectionList=om.MSelectionList()
+    selectionList.add(meshName)
+    meshPath=selectionList.getDagPath(0)
+    meshPath.extendToShape()
+    points=mu.getMeshPoints(meshPath, space=om.MSpace.kObject)
+    topologyHash, pointHash = mu.getTopologyHash(meshPath), mu.getPointHash(points)
+
+    if entry and entry['topologyHash']==topologyHash and entry['pointHash']==pointHash:
+        entry['dirty']=False
+        return entry['bvh']
+
+    bvh=triangleBVH(points, mu.getMeshTriangles(meshPath))
+    if entry:
+        callbackIDs=entry['callbackIDs']
+    else:
+        callbackIDs=[om.MNodeMessage.addNodeDirtyCallback(meshPath.node(), _markDirty, meshName),
+                     om.MNodeMessage.addNodePreRemovalCallback(meshPath.node(), _meshRemoved, meshName)]
+    _BVH_CACHE[meshName]={'bvh':bvh, 'topologyHash':topologyHash, 'pointHash':pointHash,
+                          'dirty':False, 'callbackIDs':callbackIDs}
+    return bvh
+
+def clearBVHCache():
+    ''' Removes every cached hierarchy alongside its callbacks. '''
+    for entry in _BVH_CACHE.values():
+        try:
+            om.MMessage.removeCallbacks(entry['callbackIDs'])
+        except RuntimeError:
+            pass # node has already been deleted
+    _BVH_CACHE.clear()
+
+def volumeCenter(meshName:str, vertIndices:np.ndarray, numDirections:int=8, iterations:int=3) -> np.ndarray:
+    '''
+    Returns the world position inside the mesh volume for the provided edge loop or face ring vertices.
+    Averages the entry/exit mid-point of several lines cast across the loop, falls back to the loop centroid.
+    Each iteration casts the lines again from the previous result to pull off-center loops inward.
+    '''
+    selectionList=om.MSelectionList()
+    selectionList.add(meshName)
+    meshPath=selectionList.getDagPath(0)
+    bvh=getMeshBVH(meshName)
+
+    # work in object space so moving the mesh transform never invalidates the cached hierarchy
+    loopPoints=bvh.points[np.asarray(vertIndices)]
+    center=loopPoints.mean(axis=0)
+    if len(loopPoints) >= 3:
+        directions=loopDirections(loopPoints, numDirections)
+        for i in range(iterations):
+            midpoints=lineVolumeMidpoints(bvh, center, directions)
+            midpoints=midpoints[~np.isnan(midpoints).any(axis=1)]
+            if not len(midpoints):
+                break
+            center=midpoints.mean(axis=0)
+
+    worldMatrix=np.array(list(meshPath.inclusiveMatrix())).reshape(4, 4)
+    return (np.append(center, 1.0) @ worldMatrix)[:3]
@@ -0,0 +1,79 @@
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+import hashlib
+
+PLACEMENT_MODES=('centroid', 'bbox')
+
+def getMeshPoints(meshPath:om.MDagPath, space=om.MSpace.kWorld) -> np.ndarray:
+    ''' Returns every vertex position of the mesh as an (N,3) array with a single MFnMesh.getPoints call. '''
+    points=om.MFnMesh(meshPath).getPoints(space)
+    return np.array(points, dtype=np.float64)[:, :3]
+
+def getMeshTriangles(meshPath:om.MDagPath) -> np.ndarray:
+    ''' Returns the triangulated vertex indices of the mesh as a (T,3) array. '''
+    triangleVerts=om.MFnMesh(meshPath).getTriangles()[1]
+    return np.array(triangleVerts, dtype=np.int64).reshape(-1, 3)
+
+def getTopologyHash(meshPath:om.MDagPath) -> str:
+    ''' Returns a hash of the mesh topology (polygon vertex counts & vertex ids), positions are ignored. '''
+    polyCounts, polyVerts = om.MFnMesh(meshPath).getVertices()
+    topologyHash=hashlib.sha1(np.array(polyCounts, dtype=np.int32).tobytes())
+    topologyHash.update(np.array(polyVerts, dtype=np.int32).tobytes())
+    return topologyHash.hexdigest()
+
+def getPointHash(points:np.ndarray) -> str:
+    ''' Returns a hash of the provided point positions. '''
+    return hashlib.sha1(np.ascontiguousarray(points, dtype=np.float64).tobytes()).hexdigest()
+
+def getComponentIndices(selectionLs:list) -> dict:
+    '''
+    Returns the vertex indices of the provided selection grouped by mesh shape: {meshShape: array}.
+    Faces & edges are converted to vertices; a mesh selected without components uses all its vertices.
+    '''
+    vertSelection=cmds.polyListComponentConversion(selectionLs, toVertex=True)
+    if not vertSelection:
+        return {}
+    selectionList=om.MSelectionList()
+    for item in vertSelection:
+        selectionList.add(item)
+
+    meshIndices={}
+    selectionIt=om.MItSelectionList(selectionList)
+    while not selectionIt.isDone():
+        dagPath, component = selectionIt.getComponent()
+        if dagPath.hasFn(om.MFn.kMesh):
+            dagPath.extendToShape()
+            meshName=dagPath.fullPathName()
+            if component.isNull():
+                indices=np.arange(om.MFnMesh(dagPath).numVertices)
+            else:
+                indices=np.array(om.MFnSingleIndexedComponent(component).getElements(), dtype=np.int64)
+            meshIndices[meshName]=np.union1d(meshIndices.get(meshName, np.empty(0, dtype=np.int64)), indices)
+        selectionIt.next()
+    return meshIndices
+
+def getComponentPoints(selectionLs:list, pointCache:dict|None=None) -> np.ndarray:
+    '''
+    Returns the world positions of every vertex found in the selection as an (N,3) array.
+    A point cache dictionary can be shared between calls so each mesh is only read once.
+    '''
+    pointCache=pointCache if pointCache is not None else {}
+    points=[]
+    for meshName, indices in getComponentIndices(selectionLs).items():
+        if meshName not in pointCache:
+            selectionList=om.MSelectionList()
+            selectionList.add(meshName)
+            pointCache[meshName]=getMeshPoints(selectionList.getDagPath(0))
+        points.append(pointCache[meshName][indices])
+    if not points:
+        return np.empty((0, 3))
+    return np.concatenate(points)
+
+def componentCenter(points:np.ndarray, mode:str='centroid') -> np.ndarray:
+    ''' Returns the centroid or bounding box center of the provided (N,3) points. '''
+    if mode not in PLACEMENT_MODES:
+        raise ValueError(f'{mode} is not an available placement mode, use: {PLACEMENT_MODES}')
+    if mode=='centroid':
+        return points.mean(axis=0)
+    return (points.min(axis=0) + points.max(axis=0)) * 0.5
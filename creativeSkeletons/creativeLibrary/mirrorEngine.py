@@ -0,0 +1,146 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import rigMath
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+import re
+
+def compileNameMap(searchReplace:list|tuple):
+    '''
+    Compiles search & replace pairs into a single name mapping function.
+    Accepts one (search, replace) pair or a list of pairs; every pair is applied in one regex pass.
+    '''
+    if searchReplace and isinstance(searchReplace[0], str):
+        searchReplace=[searchReplace]
+    table={search:replace for search, replace in searchReplace if search}
+    if not table:
+        return lambda name: name
+    # longest strings first so overlapping search values resolve to the most specific one
+    pattern=re.compile('|'.join(re.escape(search) for search in sorted(table, key=len, reverse=True)))
+    return lambda name: pattern.sub(lambda match: table[match.group(0)], name)
+
+def readHierarchy(rootJnts:list) -> dict:
+    '''
+    Reads every joint under the provided roots with a single traversal per root.
+    Returns names, parent indices (-1 for roots), world matrices and the root's parent data.
+    '''
+    names, parents, worldMatrices = [], [], []
+    rotationOrders, radii, rootParents = [], [], {}
+    dagIt=om.MItDag()
+    for rootJnt in rootJnts:
+        rootPath=md.getDagPath(rootJnt)
+        dagIt.reset(rootPath, om.MItDag.kDepthFirst, om.MFn.kJoint)
+        pathIDs={}
+        while not dagIt.isDone():
+            dagPath=dagIt.getPath()
+            dagFn=om.MFnDagNode(dagPath)
+            pathIDs[dagPath.fullPathName()]=len(names)
+
+            parentPath=om.MDagPath(dagPath).pop()
+            parentID=pathIDs.get(parentPath.fullPathName(), -1)
+            if parentID<0:
+                # store the root's original parent & its world matrix to compute the mirrored local values
+                parentName=parentPath.partialPathName() if parentPath.length() else None
+                rootParents[len(names)]=(parentName, list(dagPath.exclusiveMatrix()))
+
+            names.append(dagFn.name())
+            parents.append(parentID)
+            worldMatrices.append(list(dagPath.inclusiveMatrix()))
+            rotationOrders.append(dagFn.findPlug('rotateOrder', False).asShort())
+            radii.append(dagFn.findPlug('radius', False).asDouble())
+            dagIt.next()
+
+    return {'names':names, 'parents':parents, 'worldMatrices':rigMath.toMatrixArray(worldMatrices),
+            'rotationOrders':rotationOrders, 'radii':radii, 'rootParents':rootParents}
+
+LOCATOR_DRIVERS=('constraint', 'matrix') # how mirrored locators follow their mirrored joint
+
+def getConstrainedLocators(jnts:list) -> dict:
+    '''
+    Returns the locator & locator scale driven by each joint: {joint: (locator, scale)}.
+    Locators are found through a parent constraint or a joint world matrix connected to their offset parent matrix,
+    so locators mirrored with either locator driver are found again on a second pass.
+    Connections are walked through the API so no selection or command queries are needed.
+    '''
+    jntLocators={}
+    for jnt in jnts:
+        jntFn=om.MFnDependencyNode(md.getMObject(jnt))
+        for plug in jntFn.getConnections():
+            for dstPlug in plug.connectedTo(False, True):
+                drivenObj=dstPlug.node()
+                if drivenObj.hasFn(om.MFn.kParentConstraint):
+                    locObj=om.MFnDagNode(drivenObj).parent(0)
+                elif drivenObj.hasFn(om.MFn.kTransform) and om.MFnAttribute(dstPlug.attribute()).name=='offsetParentMatrix':
+                    locObj=drivenObj
+                else:
+                    continue
+                locFn=om.MFnDagNode(locObj)
+                for i in range(locFn.childCount()):
+                    shapeFn=om.MFnDagNode(locFn.child(i))
+                    if shapeFn.typeName in md.LOCATOR_TYPES:
+                        jntLocators[jnt]=(locFn.name(), shapeFn.findPlug('localScaleX', False).asDouble())
+                        break
+                if jnt in jntLocators:
+                    break
+            if jnt in jntLocators:
+                break
+    return jntLocators
+
+def mirrorJointHierarchy(rootJnts:list|None=None, mirrorAxis:str='YZ', mirrorFunc:str='Behavior',
+                         searchReplace:list|tuple=('', ''), includeLocators:bool=False,
+                         locatorDriver:str='constraint') -> list:
+    '''
+    Mirrors every joint under the provided roots (or selected joints) in a single batch.
+    Matrices are read once, reflected with rigMath and the joints are created through one DAG modifier.
+    Mirrored locators follow their joint with a parent constraint (as cmds.mirrorJoint based mirroring did) or,
+    with the 'matrix' locator driver, with the joint world matrix connected to their offset parent matrix.
+    The whole mirror is a single undo step. Returns a list of the newly created mirrored joints,
+    the user's selection is left untouched.
+    '''
+    if locatorDriver not in LOCATOR_DRIVERS:
+        raise ValueError(f'{locatorDriver} is not an available locator driver, use: {list(LOCATOR_DRIVERS)}')
+    if not rootJnts:
+        rootJnts=cmds.ls(selection=True, type='joint')
+    if not rootJnts:
+        return None
+
+    hierarchy=readHierarchy(rootJnts)
+    mirroredWorld=rigMath.mirrorMatrices(hierarchy['worldMatrices'], mirrorAxis, mirrorFunc)
+
+    # mirrored joints are parented to their mirrored parent, roots keep the original root's parent
+    parentWorld=np.empty_like(mirroredWorld)
+    parents=[]
+    for i, parentID in enumerate(hierarchy['parents']):
+        if parentID<0:
+            parentName, parentMatrix = hierarchy['rootParents'][i]
+            parentWorld[i]=rigMath.toMatrixArray(parentMatrix)[0]
+            parents.append(parentName)
+        else:
+            parentWorld[i]=mirroredWorld[parentID]
+            parents.append(parentID)
+    local=rigMath.localMatrices(mirroredWorld, parentWorld)
+    nameMap=compileNameMap(searchReplace)
+    mirroredNames=[nameMap(name) for name in hierarchy['names']]
+
+    cmds.undoInfo(openChunk=True, chunkName='mirrorEngine: mirrorJointHierarchy')
+    try:
+        mirroredChain=md.createJoints(mirroredNames, parents, local[:, 3, :3].tolist(),
+                                      jointOrients=rigMath.eulerFromMatrices(local).tolist(),
+                                      rotationOrders=hierarchy['rotationOrders'],
+                                      jntsRad=hierarchy['radii'])
+        if includeLocators:
+            jntLocators=getConstrainedLocators(hierarchy['names'])
+            mirroredSet=[(mirroredChain[i], *jntLocators[jnt]) for i, jnt in enumerate(hierarchy['names'])
+                         if jnt in jntLocators]
+            if mirroredSet:
+                useMatrix=locatorDriver=='matrix'
+                mirroredLocs=md.createLocators([nameMap(locName) for jnt, locName, locScale in mirroredSet],
+                                               [locScale for jnt, locName, locScale in mirroredSet],
+                                               drivers=[jnt for jnt, locName, locScale in mirroredSet] if useMatrix else None)
+                if not useMatrix:
+                    for (jnt, locName, locScale), mirroredLoc in zip(mirroredSet, mirroredLocs):
+                        cmds.parentConstraint(jnt, mirroredLoc)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    return mirroredChain
@@ -0,0 +1,99 @@
+from ..creativeLibrary import creativeModules as md
+import maya.cmds as cmds
+import time
+
+BENCHMARK_PREFIX='blendBenchmark' # kept free of 'ik'/'fk', setIKFKSwitch finds the constraint weights by name
+
+def buildBlendTestRig(blendMode:str='constraint', limbCount:int=20, jntCount:int=4,
+                      frameRange:tuple=(1, 120)) -> dict:
+    '''
+    Builds an animated IK/FK test rig under a single group: limbCount chains of jntCount joints blended
+    with the provided blend mode, their IK & FK chains keyed over the frame range and the switch keyed from FK to IK.
+    Returns {'group', 'switch', 'limbChains'}.
+    '''
+    rigGrp=cmds.createNode('transform', name=f'{BENCHMARK_PREFIX}_{blendMode}_grp', skipSelect=True)
+    switchCtrl=cmds.createNode('transform', name=f'{BENCHMARK_PREFIX}_{blendMode}_switch', parent=rigGrp, skipSelect=True)
+
+    jntNames, parents, translates, limbs = [], [], [], []
+    for limbID in range(limbCount):
+        for jntID in range(jntCount):
+            jntNames.append(f'{BENCHMARK_PREFIX}_{blendMode}_{limbID:03d}_{jntID:02d}_jnt')
+            parents.append(len(jntNames)-2 if jntID else rigGrp)
+            translates.append([limbID*10.0, 0.0, 0.0] if not jntID else [0.0, -5.0, 0.0])
+        limbs.append({'start':jntNames[-jntCount], 'end':jntNames[-1]})
+    md.createJoints(jntNames, parents, translates, jntsRad=1)
+    limbChains=md.createIKFKChains(limbs, blendMode=blendMode)
+    md.setIKFKSwitch([blend for limbChain in limbChains for blend in limbChain['blends']], switchCtrl,
+                     useReverse=blendMode=='matrix')
+
+    startFrame, endFrame = frameRange
+    for limbChain in limbChains:
+        for chain, angle in ((limbChain['ik'], 30), (limbChain['fk'], -45)):
+            cmds.setKeyframe(chain, attribute='rotateZ', time=startFrame, value=0)
+            cmds.setKeyframe(chain, attribute='rotateZ', time=endFrame, value=angle)
+    cmds.setKeyframe(switchCtrl, attribute='ik', time=startFrame, value=0)
+    cmds.setKeyframe(switchCtrl, attribute='ik', time=(startFrame+endFrame)//2, value=1)
+    return {'group':rigGrp, 'switch':switchCtrl, 'limbChains':limbChains}
+
+def deleteBlendTestRig(testRig:dict):
+    ''' Deletes the test rig and the blend, reverse & animation nodes connected to it. '''
+    nodes=[testRig['group']]
+    for limbChain in testRig['limbChains']:
+        nodes.extend(limbChain['blends'])
+        for blend in limbChain['blends']:
+            nodes.extend(cmds.listConnections(blend, source=False, type='pickMatrix') or [])
+    nodes.extend(cmds.listConnections(testRig['switch'], type='reverse') or [])
+    nodes.extend(cmds.listConnections(testRig['switch'], type='animCurve') or [])
+    for limbChain in testRig['limbChains']:
+        nodes.extend(cmds.listConnections(limbChain['ik']+limbChain['fk'], type='animCurve') or [])
+    cmds.delete([node for node in dict.fromkeys(nodes) if cmds.objExists(node)])
+
+def measurePlayback(frameRange:tuple=(1, 120)) -> float:
+    '''
+    Plays the frame range once as fast as possible and returns the frames per second.
+    Interactive sessions use maya's playback (evaluation & draw), batch sessions step the current time.
+    '''
+    startFrame, endFrame = frameRange
+    frameCount=endFrame-startFrame+1
+    currentTime=cmds.currentTime(query=True)
+    if cmds.about(batch=True):
+        startTime=time.perf_counter()
+        for frame in range(startFrame, endFrame+1):
+            cmds.currentTime(frame, edit=True, update=True)
+        elapsed=time.perf_counter()-startTime
+    else:
+        playbackState={'minTime':cmds.playbackOptions(query=True, minTime=True),
+                       'maxTime':cmds.playbackOptions(query=True, maxTime=True),
+                       'loop':cmds.playbackOptions(query=True, loop=True),
+                       'playbackSpeed':cmds.playbackOptions(query=True, playbackSpeed=True),
+                       'maxPlaybackSpeed':cmds.playbackOptions(query=True, maxPlaybackSpeed=True)}
+        cmds.playbackOptions(minTime=startFrame, maxTime=endFrame, loop='once', playbackSpeed=0, maxPlaybackSpeed=0)
+        cmds.currentTime(startFrame, edit=True)
+        try:
+            startTime=time.perf_counter()
+            cmds.play(forward=True, wait=True)
+            elapsed=time.perf_counter()-startTime
+        finally:
+            cmds.playbackOptions(**playbackState)
+    cmds.currentTime(currentTime, edit=True)
+    return frameCount / max(elapsed, 1e-9)
+
+def benchmarkBlendModes(limbCount:int=20, jntCount:int=4, frameRange:tuple=(1, 120), passes:int=3) -> dict:
+    '''
+    Plays back the same animated test rig built with every blend mode and compares their frame rates.
+    Each rig is measured alone in the scene (best of the passes) and deleted afterwards.
+    Returns {blendMode: fps, 'speedup': matrix fps / constraint fps, 'evaluationMode'}.
+    '''
+    report={'evaluationMode':cmds.evaluationManager(query=True, mode=True)[0]}
+    for blendMode in md.BLEND_MODES:
+        testRig=buildBlendTestRig(blendMode, limbCount, jntCount, frameRange)
+        try:
+            report[blendMode]=max(measurePlayback(frameRange) for _ in range(passes))
+        finally:
+            deleteBlendTestRig(testRig)
+    report['speedup']=report['matrix'] / max(report['constraint'], 1e-9)
+    print(f"IK/FK blend benchmark, {limbCount} limbs x {jntCount} joints, {report['evaluationMode']} evaluation:")
+    for blendMode in md.BLEND_MODES:
+        print(f'{blendMode}: {report[blendMode]:.1f} fps')
+    print(f"matrix blending is {report['speedup']:.2f}x the constraint frame rate")
+    return report
@@ -0,0 +1,260 @@
+import numpy as np
+
+# pure math functions, no maya modules are required so they can be used & tested outside of maya
+# matrices follow maya's row vector convention: rows 0-2 are the x, y, z axes and row 3 is the translation
+
+MIRROR_AXES={'YZ':0, 'XZ':1, 'XY':2} # mirror plane mapped to the world axis it flips
+MIRROR_FUNCTIONS=('Behavior', 'Orientation')
+ROTATE_ORDERS=('xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx') # maya rotateOrder enum order
+ORIENT_JOINTS=('xyz', 'yzx', 'zxy', 'zyx', 'yxz', 'xzy', 'none')
+SECONDARY_AXIS_ORIENTS={'xup':(1, 0, 0), 'xdown':(-1, 0, 0), 'yup':(0, 1, 0), 'ydown':(0, -1, 0),
+                        'zup':(0, 0, 1), 'zdown':(0, 0, -1), 'none':(0, 1, 0)}
+# control curve rotation (degrees) per dominant child axis, matching creativeModules.getCurveRotation
+CONTROL_AXIS_ROTATIONS=np.array([(0, 0, 90), (0, 0, 0), (90, 0, 0)], dtype=np.float64)
+
+def toMatrixArray(matrices) -> np.ndarray:
+    ''' Returns an (N,4,4) float array from a list of flat 16 value matrices or 4x4 matrices. '''
+    return np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+def reflectionMatrix(mirrorAxis:str='YZ') -> np.ndarray:
+    ''' Returns the 4x4 reflection matrix across the provided mirror plane. '''
+    if mirrorAxis not in MIRROR_AXES:
+        raise ValueError(f'{mirrorAxis} is not an available mirror axis, use: {list(MIRROR_AXES)}')
+    reflection=np.identity(4)
+    reflection[MIRROR_AXES[mirrorAxis], MIRROR_AXES[mirrorAxis]]=-1
+    return reflection
+
+def mirrorMatrices(worldMatrices, mirrorAxis:str='YZ', mirrorFunc:str='Behavior') -> np.ndarray:
+    '''
+    Returns the mirrored world matrices across the provided plane.
+    Behavior flips every axis so rotations mirror, Orientation keeps the original world orientation.
+    '''
+    if mirrorFunc not in MIRROR_FUNCTIONS:
+        raise ValueError(f'{mirrorFunc} is not an available mirror function, use: {list(MIRROR_FUNCTIONS)}')
+    worldMatrices=toMatrixArray(worldMatrices)
+    mirrored=worldMatrices @ reflectionMatrix(mirrorAxis)
+    if mirrorFunc=='Behavior':
+        # negating all three axes of a reflected frame brings it back to a right handed rotation
+        mirrored[:, :3, :3]*=-1
+    else:
+        mirrored[:, :3, :3]=worldMatrices[:, :3, :3]
+    return mirrored
+
+def localMatrices(worldMatrices, parentMatrices) -> np.ndarray:
+    ''' Returns the local (parent space) matrices from the world and parent world matrices. '''
+    return toMatrixArray(worldMatrices) @ np.linalg.inv(toMatrixArray(parentMatrices))
+
+def orthonormalize(rotations) -> np.ndarray:
+    ''' Returns the (N,3,3) rotation matrices with unit length axes, removing any scale. '''
+    rotations=np.asarray(rotations, dtype=np.float64)
+    return rotations / np.linalg.norm(rotations, axis=2, keepdims=True)
+
+def eulerFromMatrices(rotations, rotateOrder:str='xyz') -> np.ndarray:
+    '''
+    Returns (N,3) x, y, z euler angles in degrees for the rotation order (xyz is the joint orient order).
+    Gimbal locked rotations resolve the last rotated axis angle to zero.
+    '''
+    if rotateOrder not in ROTATE_ORDERS:
+        raise ValueError(f'{rotateOrder} is not an available rotation order, use: {list(ROTATE_ORDERS)}')
+    rotations=orthonormalize(np.asarray(rotations, dtype=np.float64)[:, :3, :3])
+    # re-index the axes so the rotation order reads as xyz, odd axis permutations mirror the angles
+    axisOrder=['xyz'.index(axis) for axis in rotateOrder]
+    rotations=rotations[:, axisOrder][:, :, axisOrder]
+    sign=1.0 if rotateOrder in ('xyz', 'yzx', 'zxy') else -1.0
+
+    sinY=np.clip(-sign*rotations[:, 0, 2], -1.0, 1.0)
+    angleY=np.arcsin(sinY)
+    locked=np.abs(sinY) > 1-1e-9
+
+    angleX=np.where(locked,
+                    np.arctan2(-sign*rotations[:, 2, 1], rotations[:, 1, 1]),
+                    np.arctan2(sign*rotations[:, 1, 2], rotations[:, 2, 2]))
+    angleZ=np.where(locked, 0.0, np.arctan2(sign*rotations[:, 0, 1], rotations[:, 0, 0]))
+    angles=np.empty((len(rotations), 3))
+    angles[:, axisOrder]=np.degrees(np.stack([angleX, angleY, angleZ], axis=1))
+    return angles
+
+def matricesFromEuler(angles, rotateOrder:str='xyz') -> np.ndarray:
+    ''' Returns (N,3,3) rotation matrices from (N,3) x, y, z euler angles in degrees applied in the rotation order. '''
+    if rotateOrder not in ROTATE_ORDERS:
+        raise ValueError(f'{rotateOrder} is not an available rotation order, use: {list(ROTATE_ORDERS)}')
+    angles=np.radians(np.asarray(angles, dtype=np.float64).reshape(-1, 3))
+    cosines, sines = np.cos(angles), np.sin(angles)
+    rotations=np.tile(np.identity(3), (len(angles), 1, 1))
+    for axis in rotateOrder:
+        axisID='xyz'.index(axis)
+        first, second = (axisID+1) % 3, (axisID+2) % 3
+        axisRotation=np.tile(np.identity(3), (len(angles), 1, 1))
+        axisRotation[:, first, first]=cosines[:, axisID]
+        axisRotation[:, first, second]=sines[:, axisID]
+        axisRotation[:, second, first]=-sines[:, axisID]
+        axisRotation[:, second, second]=cosines[:, axisID]
+        # row vectors: the first rotated axis is the left most matrix
+        rotations=rotations @ axisRotation
+    return rotations
+
+def filterEulerAngles(angles, rotateOrder:str='xyz') -> np.ndarray:
+    '''
+    Returns the (F,3) euler angle sequence without flips: every frame picks, between its angles and the equivalent
+    (a+180, 180-b, c+180) solution, the one closest to the previous frame once both are unwrapped around it.
+    '''
+    angles=np.array(angles, dtype=np.float64).reshape(-1, 3)
+    middleID='xyz'.index(rotateOrder[1])
+    flipSigns=np.ones(3)
+    flipSigns[middleID]=-1.0
+    flipOffsets=np.full(3, 180.0)
+    for frame in range(1, len(angles)):
+        previous=angles[frame-1]
+        candidates=np.stack([angles[frame], angles[frame]*flipSigns + flipOffsets])
+        candidates-=np.round((candidates - previous) / 360.0) * 360.0
+        angles[frame]=candidates[np.argmin(np.abs(candidates - previous).sum(axis=1))]
+    return angles
+
+def jointChainMatrices(startPoint, endPoint, jntNums:int=2,
+                       orientJoint:str='xyz', secAxisOrient:str='yup') -> np.ndarray:
+    '''
+    Returns the (N,4,4) world matrices of the joints creativeModules.buildJointChain would create.
+    Joints are evenly spaced from start to end, the first orient axis aims down the chain and the
+    second points towards the secondary axis world direction; 'none' keeps the world orientation.
+    '''
+    if orientJoint not in ORIENT_JOINTS:
+        raise ValueError(f'{orientJoint} is not an available joint orientation, use: {list(ORIENT_JOINTS)}')
+    if secAxisOrient not in SECONDARY_AXIS_ORIENTS:
+        raise ValueError(f'{secAxisOrient} is not an available secondary axis orientation, use: {list(SECONDARY_AXIS_ORIENTS)}')
+    startPoint=np.asarray(startPoint, dtype=np.float64)[:3]
+    endPoint=np.asarray(endPoint, dtype=np.float64)[:3]
+    ratios=np.linspace(0.0, 1.0, max(jntNums, 2))
+
+    matrices=np.tile(np.identity(4), (len(ratios), 1, 1))
+    matrices[:, 3, :3]=startPoint + (endPoint-startPoint) * ratios[:, None]
+    aimVector=endPoint-startPoint
+    aimLength=np.linalg.norm(aimVector)
+    if orientJoint=='none' or aimLength < 1e-9:
+        return matrices
+
+    aimVector/=aimLength
+    upVector=np.asarray(SECONDARY_AXIS_ORIENTS[secAxisOrient], dtype=np.float64)
+    secondary=upVector - np.dot(upVector, aimVector) * aimVector
+    if np.linalg.norm(secondary) < 1e-6:
+        # the chain runs along the up direction, fall back to the next world axis
+        upVector=np.roll(np.abs(upVector), 1)
+        secondary=upVector - np.dot(upVector, aimVector) * aimVector
+    secondary/=np.linalg.norm(secondary)
+
+    primaryID, secondaryID, thirdID = ('xyz'.index(axis) for axis in orientJoint)
+    rotation=np.zeros((3, 3))
+    rotation[primaryID]=aimVector
+    rotation[secondaryID]=secondary
+    # keep the frame right handed whatever the axis order
+    rotation[thirdID]=np.cross(rotation[(thirdID+1) % 3], rotation[(thirdID+2) % 3])
+    # the end joint is zeroed out in buildJointChain so it inherits the chain orientation
+    matrices[:, :3, :3]=rotation
+    return matrices
+
+def controlCurveRotations(childOffsets, ownerIDs, count:int) -> np.ndarray:
+    '''
+    Returns (count,3) control curve rotations in degrees, a vectorized creativeModules.getCurveRotation:
+    the curve normal follows the axis with the largest average absolute child offset of each joint.
+    Child offsets are (M,3) local child translations, owner IDs the joint index (0 to count-1) of each child.
+    '''
+    offsetSums=np.zeros((count, 3))
+    np.add.at(offsetSums, np.asarray(ownerIDs, dtype=np.int64), np.abs(np.asarray(childOffsets, dtype=np.float64).reshape(-1, 3)))
+    return CONTROL_AXIS_ROTATIONS[np.argmax(offsetSums, axis=1)]
+
+def poleVectorPositions(startPoints, midPoints, endPoints, distance:float=10,
+                        fallbackVector=(0, 0, 1)) -> np.ndarray:
+    '''
+    Returns (N,3) pole vector positions for N limbs, the vectorized creativeModules.createIKHandle placement:
+    the mid point pushed by the distance along its perpendicular offset from the start to end line.
+    Straight limbs, whose mid point lies on that line, push along the fallback vector made perpendicular to the limb;
+    when the fallback runs along the limb the world axis least aligned with the limb is used instead.
+    '''
+    startPoints, midPoints, endPoints = (np.asarray(points, dtype=np.float64).reshape(-1, 3)
+                                         for points in (startPoints, midPoints, endPoints))
+    limbAxes=endPoints - startPoints
+    limbLengths=np.linalg.norm(limbAxes, axis=1)
+    limbAxes=np.divide(limbAxes, limbLengths[:, None], out=np.zeros_like(limbAxes), where=limbLengths[:, None] > 1e-9)
+
+    startMids=midPoints - startPoints
+    offsets=startMids - np.einsum('ij,ij->i', startMids, limbAxes)[:, None] * limbAxes
+    offsetLengths=np.linalg.norm(offsets, axis=1)
+    straight=offsetLengths <= 1e-6 * np.maximum(limbLengths, 1.0)
+    if straight.any():
+        axes=limbAxes[straight]
+        fallbacks=np.broadcast_to(np.asarray(fallbackVector, dtype=np.float64), axes.shape).copy()
+        fallbacks-=np.einsum('ij,ij->i', fallbacks, axes)[:, None] * axes
+        parallel=np.linalg.norm(fallbacks, axis=1) < 1e-6
+        if parallel.any():
+            worldAxes=np.identity(3)[np.argmin(np.abs(axes[parallel]), axis=1)]
+            fallbacks[parallel]=worldAxes - np.einsum('ij,ij->i', worldAxes, axes[parallel])[:, None] * axes[parallel]
+        offsets[straight]=fallbacks
+        offsetLengths[straight]=np.linalg.norm(fallbacks, axis=1)
+    return midPoints + offsets / offsetLengths[:, None] * distance
+
+def chordLengthParameters(points) -> np.ndarray:
+    ''' Returns the (N,) normalized chord length parameters of the points, from 0 to 1. '''
+    points=np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    distances=np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+    return distances / distances[-1] if distances[-1] > 1e-12 else np.linspace(0.0, 1.0, len(points))
+
+def approximationKnots(params, cvCount:int, degree:int=3) -> np.ndarray:
+    '''
+    Returns the full clamped knot vector (cvCount+degree+1 values) for a least squares fit of the parameters,
+    interior knots are placed so every knot span holds parameters (The NURBS Book, eq. 9.68 & 9.69).
+    '''
+    params=np.asarray(params, dtype=np.float64)
+    spans=cvCount - degree
+    interior=np.zeros(max(spans-1, 0))
+    if spans > 1:
+        positions=len(params) / spans * np.arange(1, spans)
+        steps=positions.astype(np.int64)
+        ratios=positions - steps
+        interior=(1.0-ratios) * params[steps-1] + ratios * params[steps]
+    return np.concatenate([np.zeros(degree+1), interior, np.ones(degree+1)])
+
+def bsplineBasis(params, knots, degree:int=3) -> np.ndarray:
+    ''' Returns the (N,cvCount) B-spline basis function values of every parameter (Cox-de Boor recursion). '''
+    params=np.asarray(params, dtype=np.float64)[:, None]
+    knots=np.asarray(knots, dtype=np.float64)
+    basis=((knots[:-1] <= params) & (params < knots[1:])).astype(np.float64)
+    # the curve end parameter belongs to the last non empty span
+    lastSpan=np.flatnonzero(knots[:-1] < knots[1:])[-1]
+    basis[params[:, 0] >= knots[-1], lastSpan]=1.0
+
+    for order in range(1, degree+1):
+        leftWidths=knots[order:-1] - knots[:-order-1]
+        rightWidths=knots[order+1:] - knots[1:-order]
+        left=np.divide(params - knots[:-order-1], leftWidths, out=np.zeros((len(params), len(leftWidths))),
+                       where=leftWidths > 0) * basis[:, :-1]
+        right=np.divide(knots[order+1:] - params, rightWidths, out=np.zeros((len(params), len(rightWidths))),
+                        where=rightWidths > 0) * basis[:, 1:]
+        basis=left + right
+    return basis
+
+def fitCurve(points, tolerance:float=0.1, degree:int=3, maxCVs:int|None=None) -> dict:
+    '''
+    Least squares fits a clamped B-spline with the fewest CVs keeping every point within the tolerance.
+    The curve ends are pinned to the first & last points, points are chord length parameterized.
+    The degree is lowered for less than degree+1 points, the CV count never exceeds the point count (interpolation).
+    Returns {'cvs' (C,3), 'knots' (maya knot vector, C+degree-1 values), 'degree', 'error' (max point distance at
+    its parameter, an upper bound of the closest distance)}.
+    '''
+    points=np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) < 2:
+        raise ValueError(f'{len(points)} points can not be fitted, at least 2 are required')
+    degree=min(degree, len(points)-1)
+    maxCVs=min(maxCVs or len(points), len(points))
+    params=chordLengthParameters(points)
+
+    for cvCount in range(degree+1, maxCVs+1):
+        knots=approximationKnots(params, cvCount, degree)
+        basis=bsplineBasis(params, knots, degree)
+        cvs=np.empty((cvCount, 3))
+        cvs[0], cvs[-1] = points[0], points[-1]
+        if cvCount > 2:
+            residuals=points - np.outer(basis[:, 0], points[0]) - np.outer(basis[:, -1], points[-1])
+            cvs[1:-1]=np.linalg.lstsq(basis[:, 1:-1], residuals, rcond=None)[0]
+        error=np.linalg.norm(basis @ cvs - points, axis=1).max()
+        if error <= tolerance:
+            break
+    return {'cvs':cvs, 'knots':knots[1:-1], 'degree':degree, 'error':float(error)}
@@ -0,0 +1,148 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import symmetryMap
+from ..creativeLibrary import rigMath
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+import re
+
+CHECKS=('rotations', 'orientFlips', 'scale', 'secondaryAxis', 'names', 'mirrorPartners', 'tempNodes')
+NAME_PATTERN=r'^[A-Za-z][A-Za-z0-9_]*_jnt$' # matches the builder's default joint suffix
+# sided name patterns & their opposite side replacement
+MIRROR_RENAMES=((r'^L_', 'R_'), (r'^R_', 'L_'), (r'_L(?=_|$)', '_R'), (r'_R(?=_|$)', '_L'),
+                (r'left', 'right'), (r'right', 'left'), (r'Left', 'Right'), (r'Right', 'Left'))
+TEMP_NODE_PATTERNS=('*_TEMP_GRP', '*_TEMP', '*_cls', '*_clsHandle')
+AXIS_IDS={'x':0, 'y':1, 'z':2}
+
+def snapshotSkeleton(rootJnts:list|None=None) -> dict:
+    '''
+    Reads every joint under the roots (every joint in the scene when no roots are provided) in a single MItDag traversal.
+    Returns flat arrays: {'names', 'parents', 'roots', 'rotations', 'scales', 'worldMatrices'}.
+    Parents & roots are joint indices, -1 marks a joint without a joint parent.
+    '''
+    names, parents, roots, rotations, scales, worldMatrices = [], [], [], [], [], []
+    pathIDs={}
+    startPaths=[md.getDagPath(rootJnt) for rootJnt in rootJnts] if rootJnts else [None]
+    for startPath in startPaths:
+        dagIt=om.MItDag(om.MItDag.kDepthFirst, om.MFn.kJoint)
+        if startPath is not None:
+            dagIt.reset(startPath, om.MItDag.kDepthFirst, om.MFn.kJoint)
+        while not dagIt.isDone():
+            dagPath=dagIt.getPath()
+            dagIt.next()
+            fullName=dagPath.fullPathName()
+            if fullName in pathIDs:
+                continue
+            parentID=pathIDs.get(fullName.rsplit('|', 1)[0], -1)
+            pathIDs[fullName]=len(names)
+
+            transformFn=om.MFnTransform(dagPath)
+            names.append(dagPath.partialPathName())
+            parents.append(parentID)
+            # depth first order visits parents first, so the root is always known
+            roots.append(roots[parentID] if parentID>=0 else len(names)-1)
+            rotation=transformFn.rotation()
+            rotations.append([rotation.x, rotation.y, rotation.z])
+            scales.append(transformFn.scale())
+            worldMatrices.append(list(dagPath.inclusiveMatrix()))
+
+    return {'names':names,
+            'parents':np.array(parents, dtype=np.int64),
+            'roots':np.array(roots, dtype=np.int64),
+            'rotations':np.degrees(np.array(rotations, dtype=np.float64).reshape(-1, 3)),
+            'scales':np.array(scales, dtype=np.float64).reshape(-1, 3),
+            'worldMatrices':rigMath.toMatrixArray(worldMatrices) if worldMatrices else np.zeros((0, 4, 4))}
+
+def _issues(names:list, mask:np.ndarray, values:np.ndarray) -> list:
+    ''' Private function, returns the {'node', 'value'} issues of the flagged joints. '''
+    return [{'node':names[i], 'value':np.round(values[i], 4).tolist()} for i in np.flatnonzero(mask)]
+
+def validateRig(rootJnts:list|None=None, checks:tuple=CHECKS, namePattern:str=NAME_PATTERN,
+                mirrorAxis:str='YZ', secondaryAxis:str='y', tolerance:float=1e-3) -> dict:
+    '''
+    Validates the skeleton from a single snapshot, every check runs vectorized over the joint arrays.
+    Returns {'jointCount', 'passed', 'issues': {check: [{'node', 'value'}]}}.
+    '''
+    invalidChecks=[check for check in checks if check not in CHECKS]
+    if invalidChecks:
+        raise ValueError(f'{invalidChecks} are not available checks, use: {list(CHECKS)}')
+    if secondaryAxis not in AXIS_IDS:
+        raise ValueError(f'{secondaryAxis} is not an available secondary axis, use: {list(AXIS_IDS)}')
+
+    snapshot=snapshotSkeleton(rootJnts)
+    names, parents = snapshot['names'], snapshot['parents']
+    worldMatrices=snapshot['worldMatrices']
+    axes=rigMath.orthonormalize(worldMatrices[:, :3, :3])
+    secondary=axes[:, AXIS_IDS[secondaryAxis]]
+    hasParent=parents >= 0
+    issues={}
+
+    if 'rotations' in checks:
+        # built joints keep their orientation in the joint orient, rotate values should stay at zero
+        issues['rotations']=_issues(names, np.abs(snapshot['rotations']).max(axis=1) > tolerance, snapshot['rotations'])
+
+    if 'orientFlips' in checks:
+        # the secondary axis turning more than 90 degrees from its parent joint is a flip
+        parentDots=np.ones(len(names))
+        parentDots[hasParent]=np.einsum('ij,ij->i', secondary[hasParent], secondary[parents[hasParent]])
+        issues['orientFlips']=_issues(names, parentDots < 0.0, parentDots)
+
+    if 'scale' in checks:
+        scales=snapshot['scales']
+        issues['scale']=_issues(names, scales.max(axis=1) - scales.min(axis=1) > tolerance, scales)
+
+    if 'secondaryAxis' in checks:
+        # every joint secondary axis should share the hemisphere of its hierarchy's average secondary axis
+        averages=np.zeros((len(names), 3))
+        np.add.at(averages, snapshot['roots'], secondary)
+        averageDots=np.einsum('ij,ij->i', secondary, averages[snapshot['roots']])
+        issues['secondaryAxis']=_issues(names, averageDots < 0.0, averageDots)
+
+    if 'names' in checks:
+        leafNames=[name.split('|')[-1] for name in names]
+        pattern=re.compile(namePattern)
+        invalid=np.array([not pattern.match(name) for name in leafNames], dtype=bool)
+        issues['names']=[{'node':names[i], 'value':namePattern} for i in np.flatnonzero(invalid)]
+
+    if 'mirrorPartners' in checks:
+        issues['mirrorPartners']=_mirrorIssues(names, worldMatrices[:, 3, :3], mirrorAxis, tolerance)
+
+    if 'tempNodes' in checks:
+        issues['tempNodes']=[{'node':node, 'value':'temporary node'} for node in cmds.ls(TEMP_NODE_PATTERNS) or []]
+
+    return {'jointCount':len(names), 'passed':not any(issues.values()), 'issues':issues}
+
+def _mirrorIssues(names:list, positions:np.ndarray, mirrorAxis:str, tolerance:float) -> list:
+    '''
+    Private function, returns the joints missing their mirror partner.
+    Sided names need the opposite side name, joints off the mirror plane need a joint at the reflected position.
+    '''
+    leafNames=[name.split('|')[-1] for name in names]
+    nameSet=set(leafNames)
+    issues, flagged = [], set()
+    for i, leafName in enumerate(leafNames):
+        for sidePattern, otherSide in MIRROR_RENAMES:
+            if not re.search(sidePattern, leafName):
+                continue
+            partnerName=re.sub(sidePattern, otherSide, leafName, count=1)
+            if partnerName not in nameSet:
+                issues.append({'node':names[i], 'value':partnerName})
+                flagged.add(i)
+            break
+
+    partners=symmetryMap.matchMirroredPoints(positions, mirrorAxis=mirrorAxis, tolerance=max(tolerance, 1e-6))
+    offPlane=np.abs(positions[:, rigMath.MIRROR_AXES[mirrorAxis]]) > tolerance
+    for i in np.flatnonzero(offPlane & (partners < 0)):
+        if i not in flagged:
+            issues.append({'node':names[i], 'value':'no joint at the mirrored position'})
+    return issues
+
+def printReport(report:dict):
+    ''' Prints the validation report, one line per issue, and warns with the issue count. '''
+    issueCount=sum(len(checkIssues) for checkIssues in report['issues'].values())
+    print(f"Validated {report['jointCount']} joints, {issueCount} issues found.")
+    for check, checkIssues in report['issues'].items():
+        for issue in checkIssues:
+            print(f"[{check}] {issue['node']}: {issue['value']}")
+    if issueCount:
+        cmds.warning(f'Rig validation found {issueCount} issues, see the script editor for details.')
@@ -1,4 +1,13 @@
+import maya.api.OpenMaya as om
 import maya.cmds as mc
+import numpy as np
+import json
+import os
+
+SHAPES_FILE = 'shapesCV_Data.json'
+CIRCLE_SECTIONS = 8
+_SHAPE_LIBRARIES = {} # json path: (modified time, shape data)
+_CURVE_DATA = {} # (json path, modified time, shape label): curve data
 
 def circleShape(name='crnode', radius=1, typeOverride=None):
     '''
@@ -114,3 +123,78 @@ def customShape(shapeData:dict, shapeLabel='square', radius=1, name='crnode', ty
 
     return crv
 
+
+def loadShapeLibrary(shapeDirectory:str) -> tuple:
+    '''
+    Returns (json path, shape data) of the shape library, the json file is only read again once it changed on disk.
+    The returned data is shared, copy it before editing.
+    '''
+    jsonPath = os.path.join(shapeDirectory, SHAPES_FILE)
+    modifiedTime = os.path.getmtime(jsonPath)
+    cached = _SHAPE_LIBRARIES.get(jsonPath)
+    if cached is None or cached[0] != modifiedTime:
+        with open(jsonPath, 'r') as file:
+            _SHAPE_LIBRARIES[jsonPath] = (modifiedTime, json.load(file))
+    return jsonPath, _SHAPE_LIBRARIES[jsonPath][1]
+
+def circleCurveData(sections:int=CIRCLE_SECTIONS) -> list:
+    ''' Returns the unit radius periodic circle curve data matching mc.circle( nr=(0, 1, 0) ). '''
+    angles = -np.pi/4 - np.linspace(0.0, 2*np.pi, sections, endpoint=False)
+    # cvs sit on a wider polygon so the cubic curve passes at radius 1 between them
+    cvRadius = 6.0 / (4.0 + 2.0*np.cos(2*np.pi/sections))
+    cvs = np.stack([np.cos(angles), np.zeros(sections), np.sin(angles)], axis=1) * cvRadius
+    return [_curveData(cvs, 3, om.MFnNurbsCurve.kPeriodic)]
+
+def shapeCurveData(shapeDirectory:str, shapeLabel:str) -> list:
+    '''
+    Returns the unit radius curve data of every curve of the library shape: [{'cvs', 'knots', 'degree', 'form'}].
+    Parsed once per shape & library version, later calls return the cached arrays.
+    '''
+    jsonPath, shapeData = loadShapeLibrary(shapeDirectory)
+    cacheKey = (jsonPath, _SHAPE_LIBRARIES[jsonPath][0], shapeLabel)
+    if cacheKey not in _CURVE_DATA:
+        shapeName = shapeData[shapeLabel]
+        curveData = []
+        for shapeNode, numCV in shapeName['CV_Numbers'].items():
+            degree = shapeName['Degrees'][shapeNode]
+            form = shapeName['Form_Index'][shapeNode]
+            cv_pos = shapeName['CV_Positions']
+            cvs = np.array([cv_pos[f'{shapeNode}.cv[{n}]'] for n in range(numCV) if f'{shapeNode}.cv[{n}]' in cv_pos])
+            if form == 2:
+                # periodic shapes store the overlapping cvs, keep the unique ones
+                cvs = cvs[:len(cvs)-degree]
+            curveData.append(_curveData(cvs, degree, om.MFnNurbsCurve.kPeriodic if form == 2 else om.MFnNurbsCurve.kOpen))
+        _CURVE_DATA[cacheKey] = curveData
+    return _CURVE_DATA[cacheKey]
+
+def _curveData(cvs:np.ndarray, degree:int, form:int) -> dict:
+    ''' Private function, returns the curve data with uniform knots, periodic curves repeat their first cvs. '''
+    if form == om.MFnNurbsCurve.kPeriodic:
+        cvs = np.concatenate([cvs, cvs[:degree]])
+        knots = np.arange(-(degree-1), len(cvs), dtype=np.float64)
+    else:
+        spans = len(cvs) - degree
+        knots = np.concatenate([np.zeros(degree-1), np.arange(spans+1), np.full(degree-1, spans)]).astype(np.float64)
+    return {'cvs':np.asarray(cvs, dtype=np.float64), 'knots':knots, 'degree':degree, 'form':form}
+
+def queueCurveShapes(dagMod:om.MDagModifier, ctrlObj:om.MObject, curveData:list, radius:float=1, rotation=None,
+                     name:str='crnode') -> list:
+    '''
+    Queues the nurbs curve shapes of the curve data under the control transform in the DAG modifier, without any
+    command or history. The geometry is set as the shape cached curve value, so undoing the modifier removes the shapes.
+    CVs are scaled by the radius and rotated by the optional (3,3) rotation matrix in object space.
+    Returns the shape MObjects, created once the modifier runs.
+    '''
+    shapeObjs = []
+    for i, curve in enumerate(curveData):
+        cvs = curve['cvs'] * radius
+        if rotation is not None:
+            cvs = cvs @ rotation
+        dataObj = om.MFnNurbsCurveData().create()
+        om.MFnNurbsCurve().create(om.MPointArray(cvs.tolist()), om.MDoubleArray(curve['knots'].tolist()),
+                                  curve['degree'], curve['form'], False, False, dataObj)
+        shapeObj = dagMod.createNode('nurbsCurve', ctrlObj)
+        dagMod.renameNode(shapeObj, f'{name}Shape' if not i else f'{name}Shape{i}')
+        dagMod.newPlugValue(om.MFnDependencyNode(shapeObj).findPlug('cached', False), dataObj)
+        shapeObjs.append(shapeObj)
+    return shapeObjs
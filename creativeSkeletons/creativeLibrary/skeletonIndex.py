@@ -0,0 +1,284 @@
+import maya.api.OpenMaya as om
+
+class skeletonGraph():
+    '''
+    In-memory joint graph of the scene: parent & children links, root joints and skinCluster bindings.
+    Built with a single MItDag traversal and kept current through DG/DAG message callbacks,
+    so root, hierarchy & binding queries never scan the scene again.
+    Only joint & skinCluster nodes are watched: type filtered node added/removed callbacks plus per node parent
+    callbacks on the indexed joints & connection callbacks on the skinClusters, other scene edits never reach the graph.
+    Joints are keyed by their MObjectHandle hash code, names are only resolved for the returned results.
+    '''
+    def __init__(self):
+        self.handles={} # joint & bound skinCluster hash: MObjectHandle
+        self.parents={} # joint hash: parent joint hash or None for roots
+        self.children={} # joint hash: set of child joint hashes
+        self.roots=set()
+        self.bindings={} # joint hash: set of skinCluster hashes driven by the joint world matrix
+        self.callbackIDs=[]
+        self.nodeCallbacks={} # joint & skinCluster hash: callback IDs registered on the node itself
+        self.dirty=True # rebuilt on the next query, set after a scene is opened or created
+        self.addCallbacks()
+
+    def addCallbacks(self):
+        ''' Registers the callbacks keeping the graph in sync with the scene. '''
+        self.callbackIDs=[om.MDGMessage.addNodeAddedCallback(self._jointAdded, 'joint'),
+                          om.MDGMessage.addNodeRemovedCallback(self._jointRemoved, 'joint'),
+                          om.MDGMessage.addNodeAddedCallback(self._skinClusterAdded, 'skinCluster'),
+                          om.MDGMessage.addNodeRemovedCallback(self._skinClusterRemoved, 'skinCluster'),
+                          om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._sceneChanged),
+                          om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._sceneChanged)]
+
+    def removeCallbacks(self):
+        ''' Removes every registered callback, the graph stops tracking the scene. '''
+        if self.callbackIDs:
+            om.MMessage.removeCallbacks(self.callbackIDs)
+        self.callbackIDs=[]
+        self._removeNodeCallbacks()
+
+    def rebuild(self):
+        ''' Rebuilds the whole graph with one MItDag traversal & one pass over the skinCluster nodes. '''
+        self.handles.clear()
+        self.parents.clear()
+        self.children.clear()
+        self.roots.clear()
+        self.bindings.clear()
+        self._removeNodeCallbacks()
+
+        dagIter=om.MItDag(om.MItDag.kDepthFirst, om.MFn.kJoint)
+        while not dagIter.isDone():
+            self._addJoint(dagIter.currentItem())
+            dagIter.next()
+
+        skinIter=om.MItDependencyNodes(om.MFn.kSkinClusterFilter)
+        while not skinIter.isDone():
+            skinCluster=skinIter.thisNode()
+            self._watchSkinCluster(skinCluster)
+            matrixPlug=om.MFnDependencyNode(skinCluster).findPlug('matrix', False)
+            for index in matrixPlug.getExistingArrayAttributeIndices():
+                for sourcePlug in matrixPlug.elementByLogicalIndex(index).connectedTo(True, False):
+                    self._bind(sourcePlug.node(), skinCluster, True)
+            skinIter.next()
+        self.dirty=False
+
+    def ensure(self):
+        ''' Rebuilds the graph when the scene changed under it. '''
+        if self.dirty:
+            self.rebuild()
+
+    # queries
+    def rootJoints(self) -> list:
+        ''' Returns the root joint names, O(roots). '''
+        self.ensure()
+        return [self._name(jointID) for jointID in self.roots if self._object(jointID) is not None]
+
+    def isRoot(self, jntName:str) -> bool:
+        ''' Returns True when the joint has no parent joint. '''
+        self.ensure()
+        return self._hash(jntName) in self.roots
+
+    def parentJoint(self, jntName:str) -> str|None:
+        ''' Returns the parent joint name or None for root joints. '''
+        self.ensure()
+        parentID=self.parents.get(self._hash(jntName))
+        return self._name(parentID) if parentID is not None else None
+
+    def childJoints(self, jntName:str) -> list:
+        ''' Returns the direct child joint names. '''
+        self.ensure()
+        return [self._name(childID) for childID in self.children.get(self._hash(jntName), ())]
+
+    def hierarchy(self, rootJnt:str, fullPath:bool=True) -> list:
+        ''' Returns the root joint and all of its descendant joints in depth first order, O(result). '''
+        self.ensure()
+        return [self._name(jointID, fullPath) for jointID in self._descendants(self._hash(rootJnt))]
+
+    def skinClusters(self, jntName:str) -> list:
+        ''' Returns the skinCluster names the joint is bound to. '''
+        self.ensure()
+        return [om.MFnDependencyNode(self._object(skinID)).name()
+                for skinID in self.bindings.get(self._hash(jntName), ())
+                if self._object(skinID) is not None]
+
+    def unboundJoints(self, rootJnt:str, fullPath:bool=True) -> list:
+        ''' Returns the joints of the root hierarchy that are not bound to any skinCluster, O(result). '''
+        self.ensure()
+        return [self._name(jointID, fullPath) for jointID in self._descendants(self._hash(rootJnt))
+                if not self.bindings.get(jointID)]
+
+    # graph edits
+    def _addJoint(self, jointObj:om.MObject):
+        ''' Private method, adds or refreshes a joint and its parent link. '''
+        handle=om.MObjectHandle(jointObj)
+        jointID=handle.hashCode()
+        self.handles[jointID]=handle
+        self.children.setdefault(jointID, set())
+        if jointID not in self.nodeCallbacks:
+            self._watchJoint(jointObj, jointID)
+        dagFn=om.MFnDagNode(jointObj)
+        parentObj=dagFn.parent(0) if dagFn.parentCount() else None
+        self._setParent(jointID, parentObj)
+
+    def _setParent(self, jointID:int, parentObj:om.MObject|None):
+        ''' Private method, relinks the joint under its new parent, non joint parents make it a root. '''
+        oldParentID=self.parents.get(jointID)
+        if oldParentID is not None:
+            self.children.get(oldParentID, set()).discard(jointID)
+        if parentObj is not None and parentObj.hasFn(om.MFn.kJoint):
+            parentID=om.MObjectHandle(parentObj).hashCode()
+            if parentID not in self.handles:
+                self._addJoint(parentObj)
+            self.parents[jointID]=parentID
+            self.children[parentID].add(jointID)
+            self.roots.discard(jointID)
+        else:
+            self.parents[jointID]=None
+            self.roots.add(jointID)
+
+    def _removeJoint(self, jointID:int):
+        ''' Private method, removes the joint, its children become roots until they get reparented. '''
+        parentID=self.parents.pop(jointID, None)
+        if parentID is not None:
+            self.children.get(parentID, set()).discard(jointID)
+        for childID in self.children.pop(jointID, set()):
+            self.parents[childID]=None
+            self.roots.add(childID)
+        self.roots.discard(jointID)
+        self.handles.pop(jointID, None)
+        self.bindings.pop(jointID, None)
+        self._removeNodeCallbacks(jointID)
+
+    def _bind(self, jointObj:om.MObject, skinCluster:om.MObject, made:bool):
+        ''' Private method, records or removes a joint to skinCluster binding. '''
+        if not jointObj.hasFn(om.MFn.kJoint):
+            return
+        jointID=om.MObjectHandle(jointObj).hashCode()
+        skinID=om.MObjectHandle(skinCluster).hashCode()
+        self.handles.setdefault(skinID, om.MObjectHandle(skinCluster))
+        if made:
+            self.bindings.setdefault(jointID, set()).add(skinID)
+        elif jointID in self.bindings:
+            self.bindings[jointID].discard(skinID)
+
+    def _descendants(self, rootID:int) -> list:
+        ''' Private method, returns the root & descendant joint hashes in depth first order. '''
+        if rootID not in self.parents:
+            return []
+        ordered, stack = [], [rootID]
+        while stack:
+            jointID=stack.pop()
+            if self._object(jointID) is None:
+                continue
+            ordered.append(jointID)
+            stack.extend(self.children.get(jointID, ()))
+        return ordered
+
+    def _watchJoint(self, jointObj:om.MObject, jointID:int):
+        ''' Private method, registers the parent added & removed callbacks of an indexed joint. '''
+        try:
+            jointPath=om.MDagPath.getAPathTo(jointObj)
+        except RuntimeError:
+            self.dirty=True # not in the DAG yet, rebuilt on the next query
+            return
+        self.nodeCallbacks[jointID]=[om.MDagMessage.addParentAddedDagPathCallback(jointPath, self._parentAdded, jointID),
+                                     om.MDagMessage.addParentRemovedDagPathCallback(jointPath, self._parentRemoved, jointID)]
+
+    def _watchSkinCluster(self, skinCluster:om.MObject):
+        ''' Private method, registers the connection callback of a skinCluster, its matrix inputs are the bindings. '''
+        skinID=om.MObjectHandle(skinCluster).hashCode()
+        if skinID not in self.nodeCallbacks:
+            self.nodeCallbacks[skinID]=[om.MNodeMessage.addAttributeChangedCallback(skinCluster, self._skinConnectionChanged)]
+
+    def _removeNodeCallbacks(self, nodeID:int|None=None):
+        ''' Private method, removes the callbacks registered on a single node, on every node when none is provided. '''
+        nodeIDs=list(self.nodeCallbacks) if nodeID is None else [nodeID]
+        for nodeID in nodeIDs:
+            try:
+                om.MMessage.removeCallbacks(self.nodeCallbacks.pop(nodeID, []))
+            except RuntimeError:
+                pass # node has already been deleted
+
+    def _object(self, nodeID:int) -> om.MObject|None:
+        ''' Private method, returns the node of a hash code, None when it has been deleted. '''
+        handle=self.handles.get(nodeID)
+        return handle.object() if handle is not None and handle.isValid() else None
+
+    def _name(self, jointID:int, fullPath:bool=False) -> str:
+        ''' Private method, returns the joint partial or full path name. '''
+        dagFn=om.MFnDagNode(self._object(jointID))
+        return dagFn.fullPathName() if fullPath else dagFn.partialPathName()
+
+    def _hash(self, nodeName:str) -> int|None:
+        ''' Private method, returns the hash code of a node name, None when it doesn't exist. '''
+        selectionLs=om.MSelectionList()
+        try:
+            selectionLs.add(nodeName)
+        except RuntimeError:
+            return None
+        return om.MObjectHandle(selectionLs.getDependNode(0)).hashCode()
+
+    # callbacks
+    def _jointAdded(self, node, clientData):
+        ''' Private joint added callback, indexes the new joint. '''
+        if not self.dirty:
+            self._addJoint(node)
+
+    def _jointRemoved(self, node, clientData):
+        ''' Private joint removed callback, drops the joint & its node callbacks. '''
+        if not self.dirty:
+            self._removeJoint(om.MObjectHandle(node).hashCode())
+
+    def _skinClusterAdded(self, node, clientData):
+        ''' Private skinCluster added callback, watches its connections, the bindings follow as they get connected. '''
+        if not self.dirty:
+            self._watchSkinCluster(node)
+
+    def _skinClusterRemoved(self, node, clientData):
+        ''' Private skinCluster removed callback, drops its bindings & connection callback. '''
+        if self.dirty:
+            return
+        skinID=om.MObjectHandle(node).hashCode()
+        for skinIDs in self.bindings.values():
+            skinIDs.discard(skinID)
+        self._removeNodeCallbacks(skinID)
+
+    def _skinConnectionChanged(self, msg, plug, otherPlug, clientData):
+        ''' Private skinCluster attribute callback, records the joints connected to or disconnected from its matrix inputs. '''
+        if self.dirty or not msg & (om.MNodeMessage.kConnectionMade | om.MNodeMessage.kConnectionBroken):
+            return
+        if plug.isElement and om.MFnAttribute(plug.attribute()).name=='matrix' and msg & om.MNodeMessage.kIncomingDirection:
+            self._bind(otherPlug.node(), plug.node(), bool(msg & om.MNodeMessage.kConnectionMade))
+
+    def _parentAdded(self, child, parent, jointID):
+        ''' Private parent added callback of an indexed joint, relinks it under its new parent. '''
+        if not self.dirty and jointID in self.handles:
+            self._setParent(jointID, parent.node() if parent.isValid() else None)
+
+    def _parentRemoved(self, child, parent, jointID):
+        ''' Private parent removed callback of an indexed joint, a deleted joint reports its parent removal last. '''
+        if not self.dirty and jointID in self.handles:
+            self._setParent(jointID, None)
+
+    def _sceneChanged(self, clientData):
+        ''' Private scene opened/created callback, the graph gets rebuilt on the next query. '''
+        self.dirty=True
+
+# remove the callbacks of a previous module load before replacing the shared graph
+if globals().get('_SKELETON_GRAPH') is not None:
+    _SKELETON_GRAPH.removeCallbacks()
+_SKELETON_GRAPH=None
+
+def getSkeletonGraph() -> skeletonGraph:
+    ''' Returns the shared skeleton graph, built on first use and kept current by its callbacks. '''
+    global _SKELETON_GRAPH
+    if _SKELETON_GRAPH is None:
+        _SKELETON_GRAPH=skeletonGraph()
+    _SKELETON_GRAPH.ensure()
+    return _SKELETON_GRAPH
+
+def clearSkeletonGraph():
+    ''' Removes the shared skeleton graph & its callbacks. '''
+    global _SKELETON_GRAPH
+    if _SKELETON_GRAPH is not None:
+        _SKELETON_GRAPH.removeCallbacks()
+    _SKELETON_GRAPH=None
@@ -0,0 +1,191 @@
+from ..creativeLibrary import creativeModules as md
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import math
+
+# snapshot related functions
+def snapshotSkeleton(rootJnt:str) -> dict:
+    '''
+    Returns a data snapshot of the joint hierarchy under the provided root joint.
+    Hierarchy is read with a single MItDag traversal; joint order is always parent before child.
+    '''
+    joints={}
+    order=[]
+    dagIt=om.MItDag()
+    dagIt.reset(md.getMObject(rootJnt), om.MItDag.kDepthFirst, om.MFn.kJoint)
+    while not dagIt.isDone():
+        dagFn=om.MFnDagNode(dagIt.getPath())
+        jntName=dagFn.name()
+
+        # root joint parent is ignored so the snapshot can be rebuilt anywhere
+        parentObj=dagFn.parent(0)
+        parentName=None
+        if jntName!=rootJnt and parentObj.hasFn(om.MFn.kJoint):
+            parentName=om.MFnDependencyNode(parentObj).name()
+
+        joints[jntName]={'parent':parentName,
+                         'translate':[dagFn.findPlug(f'translate{axis}', False).asDouble() for axis in 'XYZ'],
+                         'jointOrient':[math.degrees(dagFn.findPlug(f'jointOrient{axis}', False).asDouble()) for axis in 'XYZ'],
+                         'rotateOrder':dagFn.findPlug('rotateOrder', False).asShort(),
+                         'radius':dagFn.findPlug('radius', False).asDouble()}
+        order.append(jntName)
+        dagIt.next()
+
+    return {'root':rootJnt, 'order':order, 'joints':joints}
+
+def saveSkeletonSnapshot(path:str, file_name:str, rootJnt:str) -> dict:
+    ''' Saves the snapshot of the provided root joint hierarchy into a json file, returns the snapshot. '''
+    snapshot=snapshotSkeleton(rootJnt)
+    md.saveData(path, file_name, snapshot)
+    return snapshot
+
+# diff related functions
+def _vectorsMatch(vectorA:list, vectorB:list, tolerance:float) -> bool:
+    ''' Private function to compare two vectors within a tolerance value. '''
+    return all(abs(a-b) <= tolerance for a, b in zip(vectorA, vectorB))
+
+def diffSkeleton(desired:dict, current:dict,
+                 tolerance:float=1e-4, orientTolerance:float=1e-3) -> dict:
+    '''
+    Returns the differences needed to turn the current snapshot into the desired snapshot.
+    Joints missing from one side are matched by parent and position to detect renames before
+    being reported as added or removed.
+    '''
+    desiredJnts, currentJnts = desired['joints'], current['joints']
+    addedCandidates=[jnt for jnt in desired['order'] if jnt not in currentJnts]
+    removedCandidates=[jnt for jnt in current['order'] if jnt not in desiredJnts]
+
+    # desired order is parent first, so a renamed parent is resolved before its children
+    renamed={}
+    for jnt in addedCandidates:
+        jntData=desiredJnts[jnt]
+        for oldJnt in removedCandidates:
+            if oldJnt in renamed:
+                continue
+            oldData=currentJnts[oldJnt]
+            oldParent=renamed.get(oldData['parent'], oldData['parent'])
+            if oldParent==jntData['parent'] and _vectorsMatch(oldData['translate'], jntData['translate'], tolerance):
+                renamed[oldJnt]=jnt
+                break
+
+    added=[jnt for jnt in addedCandidates if jnt not in renamed.values()]
+    removed=[jnt for jnt in removedCandidates if jnt not in renamed]
+
+    moved=[]
+    reoriented=[]
+    oldNames={newJnt:oldJnt for oldJnt, newJnt in renamed.items()}
+    for jnt in desired['order']:
+        if jnt in added:
+            continue
+        jntData=desiredJnts[jnt]
+        currentData=currentJnts[oldNames.get(jnt, jnt)]
+        currentParent=renamed.get(currentData['parent'], currentData['parent'])
+        if currentParent!=jntData['parent'] or not _vectorsMatch(currentData['translate'], jntData['translate'], tolerance):
+            moved.append(jnt)
+        if currentData['rotateOrder']!=jntData['rotateOrder'] or \
+           not _vectorsMatch(currentData['jointOrient'], jntData['jointOrient'], orientTolerance):
+            reoriented.append(jnt)
+
+    return {'added':added, 'removed':removed, 'renamed':renamed,
+            'moved':moved, 'reoriented':reoriented}
+
+def isDiffEmpty(diff:dict) -> bool:
+    ''' Checks if a skeleton diff contains any change. '''
+    return not any(diff.values())
+
+# apply related functions
+def _getSkinClusters(jnts:list) -> list:
+    ''' Private function that returns every skinCluster connected to the provided joints. '''
+    skinClusters=set()
+    for jnt in jnts:
+        if cmds.objExists(jnt):
+            skinClusters.update(cmds.listConnections(f'{jnt}.worldMatrix', type='skinCluster') or [])
+    return list(skinClusters)
+
+def _reparentJoint(jnt:str, parent:str|None, rootParent:str|None=None, isRoot:bool=False):
+    ''' Private function, parents the joint to its desired parent (root parent or world when None) if it isn't already. '''
+    parent=parent or rootParent
+    if isRoot and not rootParent:
+        return
+    currentParent=(cmds.listRelatives(jnt, parent=True, fullPath=True) or [None])[0]
+    if parent is None:
+        if currentParent is not None:
+            cmds.parent(jnt, world=True)
+    elif currentParent is None or md.getDagPath(currentParent)!=md.getDagPath(parent):
+        cmds.parent(jnt, parent)
+
+def applySkeletonDiff(diff:dict, desired:dict, rootParent=None) -> dict:
+    '''
+    Applies a skeleton diff on the scene, only joints listed in the diff are edited.
+    Moved and reoriented joints keep their skin binding by editing them in move joints mode.
+    Joints without a desired parent are moved under the root parent, or to the world when none is provided;
+    the root joint itself is only re-parented when a root parent is provided.
+    The whole diff is a single undo step. Returns the applied diff.
+    '''
+    if isDiffEmpty(diff):
+        return diff
+    desiredJnts=desired['joints']
+
+    cmds.undoInfo(openChunk=True, chunkName='skeletonReconciler: applySkeletonDiff')
+    try:
+        for oldJnt, newJnt in diff['renamed'].items():
+            cmds.rename(oldJnt, newJnt)
+
+        if diff['added']:
+            # createJoints records its modifiers through the plugin command, so the new joints undo with the chunk
+            # parents that are also being added are passed as indices for the batch creation
+            addedIDs={jnt:i for i, jnt in enumerate(diff['added'])}
+            parents=[]
+            for jnt in diff['added']:
+                parent=desiredJnts[jnt]['parent']
+                parents.append(addedIDs.get(parent, parent if parent else rootParent))
+            md.createJoints(diff['added'], parents,
+                            [desiredJnts[jnt]['translate'] for jnt in diff['added']],
+                            jointOrients=[desiredJnts[jnt]['jointOrient'] for jnt in diff['added']],
+                            rotationOrders=[desiredJnts[jnt]['rotateOrder'] for jnt in diff['added']],
+                            jntsRad=[desiredJnts[jnt]['radius'] for jnt in diff['added']])
+
+        editedJnts=list(dict.fromkeys(diff['moved']+diff['reoriented']))
+        skinClusters=_getSkinClusters(editedJnts+diff['removed'])
+        for skinCluster in skinClusters:
+            cmds.skinCluster(skinCluster, edit=True, moveJointsMode=True)
+        try:
+            for jnt in diff['moved']:
+                jntData=desiredJnts[jnt]
+                _reparentJoint(jnt, jntData['parent'], rootParent, isRoot=jnt==desired['root'])
+                cmds.setAttr(f'{jnt}.translate', *jntData['translate'])
+            for jnt in diff['reoriented']:
+                jntData=desiredJnts[jnt]
+                cmds.setAttr(f'{jnt}.jointOrient', *jntData['jointOrient'])
+                cmds.setAttr(f'{jnt}.rotateOrder', jntData['rotateOrder'])
+
+            # remove influences first so the skin weights get redistributed before deletion
+            for jnt in diff['removed']:
+                for skinCluster in _getSkinClusters([jnt]):
+                    cmds.skinCluster(skinCluster, edit=True, removeInfluence=jnt)
+        finally:
+            for skinCluster in skinClusters:
+                cmds.skinCluster(skinCluster, edit=True, moveJointsMode=False)
+
+        # any surviving child has already been moved to its desired parent
+        removedJnts=[jnt for jnt in diff['removed'] if cmds.objExists(jnt)]
+        if removedJnts:
+            cmds.delete(removedJnts)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    return diff
+
+def reconcileSkeleton(desired:dict, rootJnt:str|None=None, rootParent:str|None=None) -> dict:
+    '''
+    Rebuilds the scene skeleton incrementally from a desired snapshot (template or saved data).
+    Builds the full skeleton if the root joint doesn't exist yet, the root parent receives the root & parentless joints
+    (world when none is provided). Returns the applied diff.
+    '''
+    rootJnt=rootJnt or desired['root']
+    if not cmds.objExists(rootJnt):
+        current={'root':rootJnt, 'order':[], 'joints':{}}
+    else:
+        current=snapshotSkeleton(rootJnt)
+    diff=diffSkeleton(desired, current)
+    return applySkeletonDiff(diff, desired, rootParent=rootParent)
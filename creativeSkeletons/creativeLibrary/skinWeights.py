@@ -0,0 +1,219 @@
+from ..creativeLibrary import skeletonIndex
+from ..creativeLibrary import spatialIndex
+from ..creativeLibrary import meshUtils as mu
+from ..creativeLibrary import undoModifiers
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
+import numpy as np
+
+WEIGHT_THRESHOLD=1e-4 # influences whose highest weight stays at or below are treated as unused
+EXPORT_THRESHOLD=1e-6 # weights at or below are dropped from the sparse weight files
+VERTEX_MAPPINGS=('auto', 'index', 'nearest')
+
+class weightChange():
+    '''
+    Skin weight edit recorded through undoModifiers: doIt writes the new weights of the vertices,
+    undoIt restores every influence weight they had before, so normalized neighbors come back as well.
+    '''
+    def __init__(self, skinFn:oma.MFnSkinCluster, meshPath:om.MDagPath, components:om.MObject,
+                 influenceIndices:om.MIntArray, weights:om.MDoubleArray, normalize:bool=True):
+        self.skinFn, self.meshPath, self.components = skinFn, meshPath, components
+        self.influenceIndices, self.weights, self.normalize = influenceIndices, weights, normalize
+        self.oldWeights, influenceCount = skinFn.getWeights(meshPath, components)
+        self.oldInfluenceIndices=om.MIntArray(list(range(influenceCount)))
+
+    def doIt(self):
+        self.skinFn.setWeights(self.meshPath, self.components, self.influenceIndices, self.weights, self.normalize)
+
+    def undoIt(self):
+        self.skinFn.setWeights(self.meshPath, self.components, self.oldInfluenceIndices, self.oldWeights, False)
+
+def getSkinClusters(meshes:list|None=None) -> list:
+    ''' Returns the skinClusters deforming the provided meshes, every skinCluster in the scene when none are provided. '''
+    if meshes is None:
+        return cmds.ls(type='skinCluster') or []
+    skinClusters=[]
+    for mesh in meshes:
+        history=cmds.listHistory(mesh, pruneDagObjects=True) or []
+        skinClusters.extend(cmds.ls(history, type='skinCluster') or [])
+    return list(dict.fromkeys(skinClusters))
+
+def getSkinFn(skinCluster:str) -> oma.MFnSkinCluster:
+    selectionLs=om.MSelectionList()
+    selectionLs.add(skinCluster)
+    return oma.MFnSkinCluster(selectionLs.getDependNode(0))
+
+def readWeights(skinCluster:str) -> tuple:
+    '''
+    Reads the whole weight matrix of the skinCluster with a single MFnSkinCluster.getWeights call.
+    Returns (weights (V,I) array, influence full path names, deformed mesh MDagPath).
+    '''
+    skinFn=getSkinFn(skinCluster)
+    meshPath=om.MDagPath.getAPathTo(skinFn.getOutputGeometry()[0])
+    componentFn=om.MFnSingleIndexedComponent()
+    components=componentFn.create(om.MFn.kMeshVertComponent)
+    componentFn.setCompleteData(om.MFnMesh(meshPath).numVertices)
+
+    weights, influenceCount = skinFn.getWeights(meshPath, components)
+    influences=[influencePath.fullPathName() for influencePath in skinFn.influenceObjects()]
+    weights=np.fromiter(weights, dtype=np.float64, count=len(weights))
+    return weights.reshape(-1, max(influenceCount, 1)), influences, meshPath
+
+def analyzeInfluences(skinClusters:list|None=None, rootJnts:list|None=None,
+                      threshold:float=WEIGHT_THRESHOLD) -> dict:
+    '''
+    Finds per skinCluster the influences whose weight never exceeds the threshold on any vertex,
+    and, when root joints are provided, the joints of their hierarchies the skinCluster is missing.
+    Only hierarchies already driving the skinCluster are considered for missing joints.
+    Returns {skinCluster: {'mesh', 'unused', 'missing', 'maxWeights'}}.
+    '''
+    skinClusters=getSkinClusters() if skinClusters is None else skinClusters
+    skeletonGraph=skeletonIndex.getSkeletonGraph()
+    hierarchies=[skeletonGraph.hierarchy(rootJnt) for rootJnt in rootJnts or []]
+
+    analysis={}
+    for skinCluster in skinClusters:
+        weights, influences, meshPath = readWeights(skinCluster)
+        maxWeights=weights.max(axis=0) if len(weights) else np.zeros(len(influences))
+        unused=[influence for influence, maxWeight in zip(influences, maxWeights) if maxWeight<=threshold]
+
+        boundJnts=set(influences)
+        missing=[]
+        for hierarchy in hierarchies:
+            if boundJnts.isdisjoint(hierarchy):
+                continue
+            missing.extend(jnt for jnt in hierarchy if jnt not in boundJnts and jnt not in missing)
+        analysis[skinCluster]={'mesh':meshPath.partialPathName(), 'unused':unused, 'missing':missing,
+                               'maxWeights':dict(zip(influences, maxWeights.tolist()))}
+    return analysis
+
+def fixInfluences(analysis:dict, addMissing:bool=True, pruneUnused:bool=False) -> dict:
+    '''
+    Applies an influence analysis in a single undoable operation:
+    missing joints are added with zero weight and unused influences are removed, one edit per skinCluster.
+    Returns {skinCluster: {'added', 'removed'}}.
+    '''
+    changes={}
+    cmds.undoInfo(openChunk=True, chunkName='skinWeights: fixInfluences')
+    try:
+        for skinCluster, result in analysis.items():
+            added=result.get('missing', []) if addMissing else []
+            removed=result.get('unused', []) if pruneUnused else []
+            if added:
+                cmds.skinCluster(skinCluster, edit=True, addInfluence=added, weight=0.0, lockWeights=False)
+            if removed:
+                cmds.skinCluster(skinCluster, edit=True, removeInfluence=removed)
+            changes[skinCluster]={'added':added, 'removed':removed}
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return changes
+
+def exportWeights(skinCluster:str, filePath:str, threshold:float=EXPORT_THRESHOLD) -> str:
+    '''
+    Writes the skinCluster weights as a compressed sparse .npz file: (vertex, influence, weight) triplets,
+    influence names, the mesh topology hash & world space vertex positions used to remap on import.
+    Returns the written file path.
+    '''
+    weights, influences, meshPath = readWeights(skinCluster)
+    vertexIDs, influenceIDs = np.nonzero(weights > threshold)
+    filePath=filePath if filePath.endswith('.npz') else f'{filePath}.npz'
+    np.savez_compressed(filePath,
+                        vertexIDs=vertexIDs.astype(np.int32),
+                        influenceIDs=influenceIDs.astype(np.int32),
+                        values=weights[vertexIDs, influenceIDs].astype(np.float32),
+                        influences=np.array(influences),
+                        points=mu.getMeshPoints(meshPath).astype(np.float32),
+                        topologyHash=np.array(mu.getTopologyHash(meshPath)))
+    return filePath
+
+def importWeights(skinCluster:str, filePath:str, vertexMapping:str='auto',
+                  normalize:bool=True, chunkSize:int=20000) -> dict:
+    '''
+    Applies a weight file written by exportWeights to the skinCluster.
+    Influences are remapped by joint name, missing joints existing in the scene are added as influences.
+    Vertices are remapped by index when the topology matches ('auto') or by nearest world position.
+    Weights are written with MFnSkinCluster.setWeights in vertex chunks, the added influences & every chunk
+    are a single undo step. Returns {'vertexMapping', 'added', 'missing'}.
+    '''
+    if vertexMapping not in VERTEX_MAPPINGS:
+        raise ValueError(f'{vertexMapping} is not an available vertex mapping, use: {list(VERTEX_MAPPINGS)}')
+    with np.load(filePath) as weightData:
+        storedData={key:weightData[key] for key in weightData.files}
+
+    skinFn=getSkinFn(skinCluster)
+    meshPath=om.MDagPath.getAPathTo(skinFn.getOutputGeometry()[0])
+    vertexCount=om.MFnMesh(meshPath).numVertices
+    if vertexMapping=='auto':
+        sameTopology=str(storedData['topologyHash'])==mu.getTopologyHash(meshPath)
+        vertexMapping='index' if sameTopology else 'nearest'
+    if vertexMapping=='index' and vertexCount!=len(storedData['points']):
+        cmds.warning(f'{skinCluster} vertex count differs from {filePath}, using nearest vertex mapping.')
+        vertexMapping='nearest'
+
+    cmds.undoInfo(openChunk=True, chunkName='skinWeights: importWeights')
+    try:
+        added, missing = _applyWeights(skinFn, meshPath, vertexCount, storedData, vertexMapping, normalize, chunkSize)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return {'vertexMapping':vertexMapping, 'added':added, 'missing':missing}
+
+def _applyWeights(skinFn:oma.MFnSkinCluster, meshPath:om.MDagPath, vertexCount:int, storedData:dict,
+                  vertexMapping:str, normalize:bool, chunkSize:int) -> tuple:
+    ''' Private function, remaps & writes the stored weights, returns the (added, missing) influence names. '''
+    skinCluster=skinFn.name()
+    # remap influences by joint name, path changes from a rebuilt hierarchy are ignored
+    storedNames=[str(influence).split('|')[-1] for influence in storedData['influences']]
+    influenceNames=[influencePath.partialPathName().split('|')[-1] for influencePath in skinFn.influenceObjects()]
+    added=[name for name in dict.fromkeys(storedNames) if name not in influenceNames and len(cmds.ls(name, type='joint'))==1]
+    if added:
+        cmds.skinCluster(skinCluster, edit=True, addInfluence=added, weight=0.0, lockWeights=False)
+        influenceNames=[influencePath.partialPathName().split('|')[-1] for influencePath in skinFn.influenceObjects()]
+    missing=[name for name in dict.fromkeys(storedNames) if name not in influenceNames]
+    if missing:
+        cmds.warning(f'{len(missing)} stored influences are missing from the scene, their weights are dropped: {missing}')
+    columnMap=np.array([influenceNames.index(name) if name in influenceNames else -1 for name in storedNames], dtype=np.int64)
+
+    # sparse rows grouped by stored vertex so every target vertex gathers its source row
+    vertexIDs, influenceIDs, values = storedData['vertexIDs'], storedData['influenceIDs'], storedData['values']
+    rowOrder=np.argsort(vertexIDs, kind='stable')
+    columns, values = columnMap[influenceIDs[rowOrder]], values[rowOrder].astype(np.float64)
+    rowCounts=np.bincount(vertexIDs, minlength=len(storedData['points']))
+    rowStarts=np.cumsum(rowCounts) - rowCounts
+
+    if vertexMapping=='index':
+        sourceRows=np.arange(vertexCount)
+    else:
+        sourceRows=spatialIndex.nearestPoints(storedData['points'], mu.getMeshPoints(meshPath))[0]
+
+    usedColumns=np.unique(columns[columns >= 0])
+    columnPositions=np.full(len(influenceNames), -1, dtype=np.int64)
+    columnPositions[usedColumns]=np.arange(len(usedColumns))
+    influenceIndices=om.MIntArray(usedColumns.tolist())
+    changes=[]
+    try:
+        for start in range(0, vertexCount, chunkSize):
+            targets=np.arange(start, min(start+chunkSize, vertexCount))
+            counts=rowCounts[sourceRows[targets]]
+            pairTargets=np.repeat(targets - start, counts)
+            pairOffsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pairEntries=np.repeat(rowStarts[sourceRows[targets]], counts) + pairOffsets
+            kept=columns[pairEntries] >= 0
+            chunkWeights=np.zeros((len(targets), len(usedColumns)))
+            chunkWeights[pairTargets[kept], columnPositions[columns[pairEntries[kept]]]]=values[pairEntries[kept]]
+            if normalize:
+                # dropped influences leave rows under one, spread the remainder over the kept weights
+                rowSums=chunkWeights.sum(axis=1, keepdims=True)
+                chunkWeights=np.divide(chunkWeights, rowSums, out=chunkWeights, where=rowSums > 0)
+
+            componentFn=om.MFnSingleIndexedComponent()
+            components=componentFn.create(om.MFn.kMeshVertComponent)
+            componentFn.addElements(targets.tolist())
+            change=weightChange(skinFn, meshPath, components, influenceIndices,
+                                om.MDoubleArray(chunkWeights.ravel().tolist()), normalize)
+            change.doIt()
+            changes.append(change)
+    finally:
+        # applied chunks are recorded even when a later one fails, so undo restores them
+        undoModifiers.recordModifiers(changes)
+    return added, missing
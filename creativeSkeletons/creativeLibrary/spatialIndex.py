@@ -0,0 +1,355 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import meshUtils as mu
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+
+# mesh name: {'tree', 'topologyHash', 'pointHash', 'dirty', 'callbackID'}
+_MESH_INDEX_CACHE={}
+# root joint name: {'tree', 'names', 'pointHash'}
+_SKELETON_INDEX_CACHE={}
+# remove the snap callbacks of a previous module load before replacing their registry
+for _entry in globals().get('_SNAP_CALLBACKS', {}).values():
+    om.MMessage.removeCallbacks(_entry.get('callbackIDs', []))
+# snapped object name: {'targets', 'radius', 'callbackIDs'}
+_SNAP_CALLBACKS={}
+_SNAP_GUARD=set() # objects currently being moved by a snap, avoids re-entering their callback
+
+class pointKDTree():
+    ''' KD-tree over points stored as flat NumPy arrays, leaves are queried as vectorized buckets. '''
+    def __init__(self, points:np.ndarray, leafSize:int=32):
+        ''' Builds the tree by splitting points at the median of the widest axis. '''
+        self.points=np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        order=np.arange(len(self.points))
+        nodeMin, nodeMax, nodeLeft, nodeRight, nodeStart, nodeCount = [], [], [], [], [], []
+        stack=[(0, len(order), -1, False)]
+        while stack:
+            start, end, parentID, isRight = stack.pop()
+            nodeID=len(nodeMin)
+            if parentID>=0:
+                (nodeRight if isRight else nodeLeft)[parentID]=nodeID
+
+            nodePoints=self.points[order[start:end]]
+            nodeMin.append(nodePoints.min(axis=0) if end>start else np.zeros(3))
+            nodeMax.append(nodePoints.max(axis=0) if end>start else np.zeros(3))
+            nodeLeft.append(-1)
+            nodeRight.append(-1)
+            nodeStart.append(start)
+            nodeCount.append(end-start)
+            if end-start <= leafSize:
+                continue
+
+            axis=np.argmax(nodeMax[nodeID] - nodeMin[nodeID])
+            mid=(end-start)//2
+            order[start:end]=order[start:end][np.argpartition(nodePoints[:, axis], mid)]
+            stack.append((start+mid, end, nodeID, True))
+            stack.append((start, start+mid, nodeID, False))
+
+        self.order=order
+        self.nodeMin, self.nodeMax = np.array(nodeMin), np.array(nodeMax)
+        self.nodeLeft, self.nodeRight = np.array(nodeLeft), np.array(nodeRight)
+        self.nodeStart, self.nodeCount = np.array(nodeStart), np.array(nodeCount)
+
+    def _boxDistances(self, nodeIDs:np.ndarray, point:np.ndarray) -> np.ndarray:
+        ''' Private method, returns the distance from the point to each node bounding box. '''
+        offsets=np.maximum(np.maximum(self.nodeMin[nodeIDs] - point, point - self.nodeMax[nodeIDs]), 0.0)
+        return np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+
+    def _nodePoints(self, nodeID:int) -> np.ndarray:
+        ''' Private method, returns the point indices stored in the node. '''
+        start=self.nodeStart[nodeID]
+        return self.order[start:start+self.nodeCount[nodeID]]
+
+    def nearest(self, point:np.ndarray, k:int=1, radius:float=np.inf) -> tuple:
+        '''
+        Returns the k nearest point indices & distances within the radius, sorted by distance.
+        Nodes are traversed closest child first from a stack, any node further than the current k-th distance is pruned.
+        '''
+        point=np.asarray(point, dtype=np.float64).reshape(3)
+        candidates, distances = np.empty(0, dtype=np.int64), np.empty(0)
+        if not len(self.points) or k < 1:
+            return candidates, distances
+
+        bound=radius
+        stack=[(self._boxDistances([0], point)[0], 0)]
+        while stack:
+            boxDistance, nodeID = stack.pop()
+            # the bound may have shrunk since the node was pushed
+            if boxDistance > bound:
+                continue
+            if self.nodeLeft[nodeID] < 0:
+                leafPoints=self._nodePoints(nodeID)
+                leafDistances=np.linalg.norm(self.points[leafPoints] - point, axis=1)
+                inBound=leafDistances <= bound
+                candidates=np.concatenate((candidates, leafPoints[inBound]))
+                distances=np.concatenate((distances, leafDistances[inBound]))
+                if len(distances) > k:
+                    closest=np.argpartition(distances, k-1)[:k]
+                    candidates, distances = candidates[closest], distances[closest]
+                if len(distances)==k:
+                    bound=min(radius, distances.max())
+                continue
+
+            children=np.array([self.nodeLeft[nodeID], self.nodeRight[nodeID]])
+            childDistances=self._boxDistances(children, point)
+            # the further child is pushed first so the closer one is visited first
+            for childIndex in np.argsort(childDistances)[::-1]:
+                if childDistances[childIndex] <= bound:
+                    stack.append((childDistances[childIndex], children[childIndex]))
+
+        sortOrder=np.argsort(distances)
+        return candidates[sortOrder], distances[sortOrder]
+
+    def withinRadius(self, point:np.ndarray, radius:float) -> tuple:
+        ''' Returns every point index & distance within the radius, sorted by distance, nodes outside it are pruned. '''
+        point=np.asarray(point, dtype=np.float64).reshape(3)
+        leafPoints=[np.empty(0, dtype=np.int64)]
+        stack=[0] if len(self.points) else []
+        while stack:
+            nodeID=stack.pop()
+            if self.nodeLeft[nodeID] < 0:
+                leafPoints.append(self._nodePoints(nodeID))
+                continue
+            children=np.array([self.nodeLeft[nodeID], self.nodeRight[nodeID]])
+            stack.extend(children[self._boxDistances(children, point) <= radius])
+
+        candidates=np.concatenate(leafPoints)
+        distances=np.linalg.norm(self.points[candidates] - point, axis=1)
+        inRadius=distances <= radius
+        sortOrder=np.argsort(distances[inRadius])
+        return candidates[inRadius][sortOrder], distances[inRadius][sortOrder]
+
+# neighbour cell offsets of a uniform grid cell, itself included
+GRID_OFFSETS=np.array([[x, y, z] for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)], dtype=np.int64)
+
+def nearestPoints(points:np.ndarray, queries:np.ndarray, chunkSize:int=20000) -> tuple:
+    '''
+    Returns the nearest point index & distance of every query point, vectorized over all queries.
+    Points are bucketed in a uniform grid sized to their spacing and each query checks its 27 neighbour cells,
+    only queries with no point closer than a cell size fall back to a KD-tree query.
+    '''
+    points=np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    queries=np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+    nearest=np.full(len(queries), -1, dtype=np.int64)
+    distances=np.full(len(queries), np.inf)
+    if not len(points) or not len(queries):
+        return nearest, distances
+
+    minCorner=points.min(axis=0)
+    extent=points.max(axis=0) - minCorner
+    # mesh points spread over a surface, their spacing follows the inverse square root of the count
+    cellSize=max(np.linalg.norm(extent) / np.sqrt(len(points)), 1e-9)
+    dims=np.floor(extent / cellSize).astype(np.int64) + 1
+    strides=np.array([dims[1]*dims[2], dims[2], 1], dtype=np.int64)
+    cellIDs=np.floor((points - minCorner) / cellSize).astype(np.int64) @ strides
+    sortOrder=np.argsort(cellIDs)
+    sortedIDs=cellIDs[sortOrder]
+
+    queryCells=np.floor((queries - minCorner) / cellSize).astype(np.int64)
+    # queries are processed in cell order so the sorted cell lookups stay cache friendly
+    queryOrder=np.argsort(queryCells @ strides)
+    for start in range(0, len(queries), chunkSize):
+        chunkIDs=queryOrder[start:start+chunkSize]
+        chunk, chunkCells = queries[chunkIDs], queryCells[chunkIDs]
+        chunkNearest=np.full(len(chunkIDs), -1, dtype=np.int64)
+        chunkDistances=np.full(len(chunkIDs), np.inf)
+        for offset in GRID_OFFSETS:
+            cells=chunkCells + offset
+            inside=np.flatnonzero(np.all((cells >= 0) & (cells < dims), axis=1))
+            offsetIDs=cells[inside] @ strides
+            starts=np.searchsorted(sortedIDs, offsetIDs, side='left')
+            counts=np.searchsorted(sortedIDs, offsetIDs, side='right') - starts
+            if not counts.sum():
+                continue
+            pairQueries=np.repeat(inside, counts)
+            pairOffsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pairPoints=sortOrder[np.repeat(starts, counts) + pairOffsets]
+            pairDistances=np.linalg.norm(points[pairPoints] - chunk[pairQueries], axis=1)
+
+            # closest candidate of each query in this cell offset
+            order=np.lexsort((pairDistances, pairQueries))
+            queryIDs, firstIDs = np.unique(pairQueries[order], return_index=True)
+            closest=order[firstIDs]
+            closer=pairDistances[closest] < chunkDistances[queryIDs]
+            chunkNearest[queryIDs[closer]]=pairPoints[closest[closer]]
+            chunkDistances[queryIDs[closer]]=pairDistances[closest[closer]]
+        nearest[chunkIDs], distances[chunkIDs] = chunkNearest, chunkDistances
+
+    # a match further than a cell size may miss a closer point outside the neighbour cells
+    unresolved=np.flatnonzero(distances > cellSize)
+    if len(unresolved):
+        tree=pointKDTree(points)
+        for queryID in unresolved:
+            pointIDs, pointDistances = tree.nearest(queries[queryID])
+            nearest[queryID], distances[queryID] = pointIDs[0], pointDistances[0]
+    return nearest, distances
+
+# cache related functions
+def _markDirty(node, clientData):
+    ''' Private node dirty callback, flags the cached tree to be validated on the next query. '''
+    entry=_MESH_INDEX_CACHE.get(clientData)
+    if entry:
+        entry['dirty']=True
+
+def getMeshIndex(meshName:str) -> pointKDTree:
+    '''
+    Returns the cached object space vertex tree of the mesh, built lazily once per topology & point hash.
+    A node dirty callback flags the cache so unchanged meshes skip the hash validation.
+    '''
+    entry=_MESH_INDEX_CACHE.get(meshName)
+    if entry and not entry['dirty']:
+        return entry['tree']
+
+    meshPath=md.getDagPath(meshName)
+    meshPath.extendToShape()
+    points=mu.getMeshPoints(meshPath, space=om.MSpace.kObject)
+    topologyHash, pointHash = mu.getTopologyHash(meshPath), mu.getPointHash(points)
+
+    if entry and entry['topologyHash']==topologyHash and entry['pointHash']==pointHash:
+        entry['dirty']=False
+        return entry['tree']
+
+    tree=pointKDTree(points)
+    if entry:
+        callbackID=entry['callbackID']
+    else:
+        callbackID=om.MNodeMessage.addNodeDirtyCallback(meshPath.node(), _markDirty, meshName)
+    _MESH_INDEX_CACHE[meshName]={'tree':tree, 'topologyHash':topologyHash, 'pointHash':pointHash,
+                                 'dirty':False, 'callbackID':callbackID}
+    return tree
+
+def getSkeletonIndex(rootJnt:str) -> tuple:
+    '''
+    Returns the cached world space tree of every joint under the root alongside the joint names.
+    Joint positions are read with a single traversal and hashed, the tree is only rebuilt when they change.
+    '''
+    names, positions = [], []
+    dagIt=om.MItDag()
+    dagIt.reset(md.getDagPath(rootJnt), om.MItDag.kDepthFirst, om.MFn.kJoint)
+    while not dagIt.isDone():
+        dagPath=dagIt.getPath()
+        names.append(dagPath.partialPathName())
+        positions.append(list(dagPath.inclusiveMatrix())[12:15])
+        dagIt.next()
+
+    positions=np.array(positions, dtype=np.float64).reshape(-1, 3)
+    pointHash=mu.getPointHash(positions)
+    entry=_SKELETON_INDEX_CACHE.get(rootJnt)
+    if not entry or entry['pointHash']!=pointHash or entry['names']!=names:
+        entry={'tree':pointKDTree(positions, leafSize=8), 'names':names, 'pointHash':pointHash}
+        _SKELETON_INDEX_CACHE[rootJnt]=entry
+    return entry['tree'], entry['names']
+
+def clearIndexCache():
+    ''' Removes every cached tree alongside its dirty callback. '''
+    for entry in _MESH_INDEX_CACHE.values():
+        try:
+            om.MMessage.removeCallback(entry['callbackID'])
+        except RuntimeError:
+            pass # node has already been deleted
+    _MESH_INDEX_CACHE.clear()
+    _SKELETON_INDEX_CACHE.clear()
+
+# query related functions
+def nearestVertices(meshName:str, position:list, k:int=1, radius:float=np.inf) -> tuple:
+    '''
+    Returns the k nearest vertices of the mesh to the world position as (vertIndices, worldPositions, distances).
+    The query runs in object space so moving the mesh transform never invalidates the cached tree.
+    '''
+    meshPath=md.getDagPath(meshName)
+    worldMatrix=np.array(list(meshPath.inclusiveMatrix())).reshape(4, 4)
+    localPosition=(np.append(np.asarray(position, dtype=np.float64), 1.0) @ np.linalg.inv(worldMatrix))[:3]
+    tree=getMeshIndex(meshName)
+    vertIndices=tree.nearest(localPosition, k=k)[0]
+
+    # distances are measured in world space so the radius ignores the mesh transform scale
+    worldPositions=(np.c_[tree.points[vertIndices], np.ones(len(vertIndices))] @ worldMatrix)[:, :3]
+    distances=np.linalg.norm(worldPositions - position, axis=1)
+    inRadius=distances <= radius
+    return vertIndices[inRadius], worldPositions[inRadius], distances[inRadius]
+
+def nearestJoints(rootJnt:str, position:list, k:int=1, radius:float=np.inf) -> tuple:
+    ''' Returns the k nearest joints under the root to the world position as (jointNames, worldPositions, distances). '''
+    tree, names = getSkeletonIndex(rootJnt)
+    jntIndices, distances = tree.nearest(position, k=k, radius=radius)
+    return [names[i] for i in jntIndices], tree.points[jntIndices], distances
+
+def nearestTarget(position:list, targets:list, radius:float=np.inf) -> tuple:
+    '''
+    Returns the closest vertex or joint position among the targets (meshes or root joints) as (target, position).
+    Returns (None, None) when nothing lies within the radius.
+    '''
+    closest, closestPosition, closestDistance = None, None, radius
+    for target in targets:
+        if cmds.nodeType(target)=='joint':
+            names, positions, distances = nearestJoints(target, position, radius=closestDistance)
+        else:
+            names, positions, distances = nearestVertices(target, position, radius=closestDistance)
+        if len(names) and distances[0] <= closestDistance:
+            closest, closestPosition, closestDistance = target, positions[0], distances[0]
+    return closest, closestPosition
+
+def snapToNearest(objName:str, targets:list, radius:float=np.inf) -> str|None:
+    ''' Moves the object onto the closest vertex or joint among the targets, returns the snapped target. '''
+    position=cmds.xform(objName, query=True, worldSpace=True, translation=True)
+    target, snapPosition = nearestTarget(position, targets, radius=radius)
+    if target:
+        cmds.xform(objName, worldSpace=True, translation=list(snapPosition))
+    return target
+
+# drag snapping related functions
+def _snapCallback(msg, plug, otherPlug, clientData):
+    ''' Private attribute changed callback, snaps the moved object while it is dragged. '''
+    if not msg & om.MNodeMessage.kAttributeSet or clientData in _SNAP_GUARD:
+        return
+    if plug.partialName(useLongNames=True) not in ('translate', 'translateX', 'translateY', 'translateZ'):
+        return
+    entry=_SNAP_CALLBACKS.get(clientData)
+    if not entry:
+        return
+
+    objPath=md.getDagPath(clientData)
+    transformFn=om.MFnTransform(objPath)
+    position=list(transformFn.translation(om.MSpace.kWorld))
+    target, snapPosition = nearestTarget(position, entry['targets'], radius=entry['radius'])
+    if target:
+        # set through the API so the snap doesn't flood the undo queue during the drag
+        _SNAP_GUARD.add(clientData)
+        try:
+            transformFn.setTranslation(om.MVector(*snapPosition), om.MSpace.kWorld)
+        finally:
+            _SNAP_GUARD.discard(clientData)
+
+def _snapObjectRemoved(node, clientData):
+    ''' Private node pre removal callback, drops the drag snapping of a deleted object. '''
+    disableDragSnap(clientData)
+
+def enableDragSnap(objName:str, targets:list, radius:float=1.0):
+    '''
+    Snaps the object to the nearest vertex or joint of the targets within the radius whenever it is moved.
+    Target trees are built up front so the first drag doesn't pay for the build, the callbacks are removed with the object.
+    '''
+    disableDragSnap(objName)
+    for target in targets:
+        if cmds.nodeType(target)=='joint':
+            getSkeletonIndex(target)
+        else:
+            getMeshIndex(target)
+    objObj=md.getMObject(objName)
+    callbackIDs=[om.MNodeMessage.addAttributeChangedCallback(objObj, _snapCallback, objName),
+                 om.MNodeMessage.addNodePreRemovalCallback(objObj, _snapObjectRemoved, objName)]
+    _SNAP_CALLBACKS[objName]={'targets':list(targets), 'radius':radius, 'callbackIDs':callbackIDs}
+
+def disableDragSnap(objName:str):
+    ''' Removes the drag snapping callbacks of the object. '''
+    entry=_SNAP_CALLBACKS.pop(objName, None)
+    if entry:
+        try:
+            om.MMessage.removeCallbacks(entry['callbackIDs'])
+        except RuntimeError:
+            pass # node has already been deleted
+
+def clearDragSnaps():
+    ''' Removes every drag snapping callback. '''
+    for objName in list(_SNAP_CALLBACKS):
+        disableDragSnap(objName)
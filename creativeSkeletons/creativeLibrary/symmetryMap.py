@@ -0,0 +1,257 @@
+from ..creativeLibrary import creativeModules as md
+from ..creativeLibrary import meshUtils as mu
+from ..creativeLibrary import meshBVH as bvh
+from ..creativeLibrary import mirrorEngine
+from ..creativeLibrary import rigMath
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
+import numpy as np
+
+# (topology hash, mirror axis): partner vertex array
+_SYMMETRY_CACHE={}
+# every offset between a spatial hash cell and its 26 neighbors
+CELL_OFFSETS=np.array([[x,y,z] for x in (-1,0,1) for y in (-1,0,1) for z in (-1,0,1)])
+
+# pure symmetry functions
+def _cellKeys(cells:np.ndarray) -> np.ndarray:
+    ''' Private function, packs (N,3) integer cell coordinates into a single int64 key per cell. '''
+    cells=cells + (1 << 20) # keeps every coordinate positive inside its 21 bits
+    return (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+
+def matchMirroredPoints(points:np.ndarray, mirrorAxis:str='YZ', tolerance:float=1e-3) -> np.ndarray:
+    '''
+    Returns the mirrored partner index of every point, -1 where no point lies within the tolerance.
+    Points are bucketed in a spatial hash (sorted cell keys), each reflected point only checks its 27 cells.
+    '''
+    points=np.asarray(points, dtype=np.float64)
+    reflected=points.copy()
+    reflected[:, rigMath.MIRROR_AXES[mirrorAxis]]*=-1
+
+    cellSize=max(tolerance, 1e-12)
+    keys=_cellKeys(np.floor(points / cellSize).astype(np.int64))
+    sortOrder=np.argsort(keys)
+    sortedKeys=keys[sortOrder]
+    queryCells=np.floor(reflected / cellSize).astype(np.int64)
+
+    partners=np.full(len(points), -1, dtype=np.int64)
+    bestDistances=np.full(len(points), np.inf)
+    for offset in CELL_OFFSETS:
+        offsetKeys=_cellKeys(queryCells + offset)
+        starts=np.searchsorted(sortedKeys, offsetKeys, side='left')
+        counts=np.searchsorted(sortedKeys, offsetKeys, side='right') - starts
+        pairQueries=np.repeat(np.arange(len(points)), counts)
+        pairOffsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pairPoints=sortOrder[np.repeat(starts, counts) + pairOffsets]
+
+        distances=np.linalg.norm(points[pairPoints] - reflected[pairQueries], axis=1)
+        # closest candidate of each query in this cell offset, the first pair of each query once sorted by distance
+        order=np.lexsort((distances, pairQueries))
+        queryIDs, firstIDs = np.unique(pairQueries[order], return_index=True)
+        closest=order[firstIDs]
+        better=distances[closest] < bestDistances[queryIDs]
+        partners[queryIDs[better]]=pairPoints[closest[better]]
+        bestDistances[queryIDs[better]]=distances[closest[better]]
+
+    partners[bestDistances > tolerance]=-1
+    return partners
+
+def edgesFromPolygons(polyCounts:np.ndarray, polyVerts:np.ndarray) -> np.ndarray:
+    '''
+    Returns the unique (E,2) vertex pairs of the polygon edges.
+    Triangulation diagonals are left out since they are rarely symmetric on quad meshes.
+    '''
+    polyCounts, polyVerts = np.asarray(polyCounts, dtype=np.int64), np.asarray(polyVerts, dtype=np.int64)
+    polyStarts=np.repeat(np.cumsum(polyCounts) - polyCounts, polyCounts)
+    # each face vertex connects to the next one, the last wraps back to the polygon's first vertex
+    nextIDs=np.arange(len(polyVerts)) + 1
+    nextIDs=np.where(nextIDs == polyStarts + np.repeat(polyCounts, polyCounts), polyStarts, nextIDs)
+    edges=np.stack([polyVerts, polyVerts[nextIDs]], axis=1)
+    return np.unique(np.sort(edges, axis=1), axis=0)
+
+def topologyFallback(partners:np.ndarray, edges:np.ndarray, points:np.ndarray,
+                     mirrorAxis:str='YZ', maxIterations:int=1000) -> np.ndarray:
+    '''
+    Matches the remaining unmatched vertices by walking the topology from the matched ones.
+    Each unmatched vertex votes for the unmatched neighbors of its neighbors' partners, the most voted
+    candidate (closest reflected position on ties) becomes its partner. Repeats until nothing changes.
+    '''
+    partners=np.array(partners, dtype=np.int64)
+    reflected=np.asarray(points, dtype=np.float64).copy()
+    reflected[:, rigMath.MIRROR_AXES[mirrorAxis]]*=-1
+
+    # compressed sparse adjacency
+    directed=np.concatenate([edges, edges[:, ::-1]])
+    directed=directed[np.argsort(directed[:, 0], kind='stable')]
+    adjacencyStart=np.searchsorted(directed[:, 0], np.arange(len(partners) + 1))
+    adjacency=directed[:, 1]
+
+    for i in range(maxIterations):
+        # (unmatched vertex, partner of a matched neighbor)
+        sources, neighbors = directed[:, 0], directed[:, 1]
+        valid=(partners[sources] < 0) & (partners[neighbors] >= 0)
+        sources, anchors = sources[valid], partners[neighbors[valid]]
+        if not len(sources):
+            break
+
+        # expand each anchor into its own neighbors, only unmatched vertices can become partners
+        counts=adjacencyStart[anchors+1] - adjacencyStart[anchors]
+        offsets=np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        voters=np.repeat(sources, counts)
+        candidates=adjacency[np.repeat(adjacencyStart[anchors], counts) + offsets]
+        valid=partners[candidates] < 0
+        voters, candidates = voters[valid], candidates[valid]
+        if not len(voters):
+            break
+
+        pairs, votes = np.unique(np.stack([voters, candidates], axis=1), axis=0, return_counts=True)
+        distances=np.linalg.norm(reflected[pairs[:, 0]] - np.asarray(points)[pairs[:, 1]], axis=1)
+        # best pairs first (most votes then closest), each vertex can only be assigned once
+        ranked=np.lexsort((distances, -votes, pairs[:, 0]))
+        pairs, votes = pairs[ranked], votes[ranked]
+        # a voter whose best candidate ties on votes with another is ambiguous, it waits for more matched
+        # neighbors unless no unambiguous pair remains
+        firstPair=np.r_[True, pairs[1:, 0] != pairs[:-1, 0]]
+        secondVotes=np.where(~firstPair, votes, 0)
+        runnerUp=np.zeros(len(partners), dtype=np.int64)
+        np.maximum.at(runnerUp, pairs[:, 0], secondVotes)
+        bestPairs, bestVotes = pairs[firstPair], votes[firstPair]
+        certain=bestVotes > runnerUp[bestPairs[:, 0]]
+        if certain.any():
+            bestPairs, bestVotes = bestPairs[certain], bestVotes[certain]
+        pairs=bestPairs[np.argsort(-bestVotes, kind='stable')]
+        assigned=0
+        for voter, candidate in pairs:
+            if partners[voter] >= 0 or partners[candidate] >= 0:
+                continue
+            partners[voter], partners[candidate] = candidate, voter
+            assigned+=1
+        if not assigned:
+            break
+    return partners
+
+def buildSymmetryMap(points:np.ndarray, edges:np.ndarray, mirrorAxis:str='YZ',
+                     tolerance:float=1e-3) -> np.ndarray:
+    ''' Returns the partner index of every vertex, spatially matched first then completed through the topology. '''
+    partners=matchMirroredPoints(points, mirrorAxis=mirrorAxis, tolerance=tolerance)
+    if (partners < 0).any():
+        partners=topologyFallback(partners, edges, points, mirrorAxis=mirrorAxis)
+    return partners
+
+# maya related functions
+def getSymmetryMap(meshName:str, mirrorAxis:str='YZ', tolerance:float=1e-3) -> np.ndarray:
+    '''
+    Returns the cached partner array of the mesh vertices, built once per topology hash & mirror axis.
+    The map is built from object space points so the mesh can be posed asymmetrically afterwards.
+    '''
+    meshPath=md.getDagPath(meshName)
+    meshPath.extendToShape()
+    cacheKey=(mu.getTopologyHash(meshPath), mirrorAxis)
+    if cacheKey not in _SYMMETRY_CACHE:
+        points=mu.getMeshPoints(meshPath, space=om.MSpace.kObject)
+        polyCounts, polyVerts = om.MFnMesh(meshPath).getVertices()
+        _SYMMETRY_CACHE[cacheKey]=buildSymmetryMap(points, edgesFromPolygons(polyCounts, polyVerts),
+                                                   mirrorAxis=mirrorAxis, tolerance=tolerance)
+    return _SYMMETRY_CACHE[cacheKey]
+
+def clearSymmetryCache():
+    ''' Removes every cached symmetry map. '''
+    _SYMMETRY_CACHE.clear()
+
+def mirrorVertexIndices(meshName:str, vertIndices:list, mirrorAxis:str='YZ') -> np.ndarray:
+    ''' Returns the mirrored vertex indices, vertices without a partner are dropped. '''
+    partners=getSymmetryMap(meshName, mirrorAxis=mirrorAxis)[np.asarray(vertIndices, dtype=np.int64)]
+    return np.unique(partners[partners >= 0])
+
+def mirrorVertexSets(meshName:str, setNames:list|None=None, mirrorAxis:str='YZ',
+                     searchReplace:list|tuple=('left', 'right'), directory:str|None=None) -> list:
+    ''' Stores the mirrored copy of the stored vertex sets (or the provided set names), returns the new set names. '''
+    vertexSets=md.loadVertexSets(meshName, directory=directory)
+    nameMap=mirrorEngine.compileNameMap(searchReplace)
+    mirroredNames=[]
+    for setName in setNames or list(vertexSets):
+        if setName not in vertexSets:
+            continue
+        mirroredIndices=mirrorVertexIndices(meshName, vertexSets[setName]['indices'], mirrorAxis=mirrorAxis)
+        if not len(mirroredIndices):
+            cmds.warning(f'{setName} has no mirrored vertices on {meshName}, skipped.')
+            continue
+        vertexSets[nameMap(setName)]={'indices':mirroredIndices.tolist(), 'mode':vertexSets[setName]['mode']}
+        mirroredNames.append(nameMap(setName))
+    if mirroredNames:
+        meshPath=md.getDagPath(meshName)
+        meshPath.extendToShape()
+        md.saveData(directory or md.getVertexSetsFolder(), mu.getTopologyHash(meshPath), vertexSets)
+    return mirroredNames
+
+def mirrorLocators(locNames:list|None=None, meshName:str|None=None, mirrorAxis:str='YZ',
+                   searchReplace:list|tuple=('left', 'right')) -> list:
+    '''
+    Mirrors the locators (or selected locators) in a single batch, no joints are required.
+    Locators with a vertex set stored on the mesh are placed from the mirrored vertex set so they stay
+    on the symmetric components even when the mesh is posed asymmetrically; others are reflected in world space.
+    Returns the created locator transform names.
+    '''
+    locNames=locNames or cmds.ls(selection=True, type='transform')
+    locNames=[locName for locName in locNames
+              if any(cmds.nodeType(shape) in md.LOCATOR_TYPES for shape in cmds.listRelatives(locName, shapes=True) or [])]
+    if not locNames:
+        cmds.warning('No locators provided to mirror.')
+        return []
+
+    nameMap=mirrorEngine.compileNameMap(searchReplace)
+    vertexSets=md.loadVertexSets(meshName) if meshName else {}
+    mirroredSets=[locName for locName in locNames if locName in vertexSets]
+    if mirroredSets:
+        mirrorVertexSets(meshName, mirroredSets, mirrorAxis=mirrorAxis, searchReplace=searchReplace)
+        meshPath=md.getDagPath(meshName)
+        meshPath.extendToShape()
+        points=mu.getMeshPoints(meshPath)
+
+    positions, locScales = [], []
+    for locName in locNames:
+        indices=[]
+        if locName in vertexSets:
+            indices=mirrorVertexIndices(meshName, vertexSets[locName]['indices'], mirrorAxis=mirrorAxis)
+        if len(indices):
+            mode=vertexSets[locName]['mode']
+            if mode=='volume':
+                positions.append(bvh.volumeCenter(meshPath.fullPathName(), indices))
+            else:
+                positions.append(mu.componentCenter(points[indices], mode=mode))
+        else:
+            if locName in vertexSets:
+                cmds.warning(f'{locName} has no mirrored vertices on {meshName}, reflected in world space instead.')
+            position=cmds.xform(locName, query=True, worldSpace=True, translation=True)
+            positions.append((np.append(position, 1.0) @ rigMath.reflectionMatrix(mirrorAxis))[:3])
+        locShape=cmds.listRelatives(locName, shapes=True)[0]
+        locScales.append(cmds.getAttr(f'{locShape}.localScaleX'))
+    return md.createLocators([nameMap(locName) for locName in locNames], locScales, positions=positions)
+
+def mirrorClusters(clusterNames:list, meshName:str, mirrorAxis:str='YZ',
+                   searchReplace:list|tuple=('left', 'right')) -> list:
+    ''' Creates a cluster on the mirrored vertices of each provided cluster, returns the new cluster handles. '''
+    nameMap=mirrorEngine.compileNameMap(searchReplace)
+    meshPath=md.getDagPath(meshName)
+    meshPath.extendToShape()
+    mirroredHandles=[]
+    for clusterName in clusterNames:
+        clusterFn=oma.MFnGeometryFilter(md.getMObject(clusterName))
+        try:
+            component=clusterFn.getComponentAtIndex(clusterFn.indexForOutputShape(meshPath.node()))
+        except RuntimeError:
+            cmds.warning(f'{clusterName} does not deform {meshName}, skipped.')
+            continue
+        if component.isNull():
+            memberIndices=range(om.MFnMesh(meshPath).numVertices) # whole mesh membership
+        else:
+            memberIndices=om.MFnSingleIndexedComponent(component).getElements()
+        if not memberIndices:
+            continue
+        mirroredIndices=mirrorVertexIndices(meshName, memberIndices, mirrorAxis=mirrorAxis)
+        if not len(mirroredIndices):
+            cmds.warning(f'{clusterName} has no mirrored vertices on {meshName}, skipped.')
+            continue
+        components=[f'{meshPath.fullPathName()}.vtx[{i}]' for i in mirroredIndices]
+        mirroredHandles.append(cmds.cluster(components, name=nameMap(clusterName))[1])
+    return mirroredHandles
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from creativeSkeletons.creativeLibrary import rigMath
+
+# rigMath is pure NumPy, these tests run with pytest outside of maya
+
+def _wrapAngles(angles:np.ndarray) -> np.ndarray:
+    ''' Wraps degrees into the (-180, 180] range. '''
+    return 180.0 - np.mod(180.0 - angles, 360.0)
+
+def _randomAngles(count:int, rotateOrder:str, seed:int=0) -> np.ndarray:
+    ''' Random euler angles away from gimbal lock, the middle rotated axis stays within +/-80 degrees. '''
+    angles=np.random.default_rng(seed).uniform(-170.0, 170.0, size=(count, 3))
+    angles[:, 'xyz'.index(rotateOrder[1])]*=80.0 / 170.0
+    return angles
+
+# pole vectors
+def test_poleVectorPositions_bentLimb():
+    poles=rigMath.poleVectorPositions([0, 0, 0], [5, 0, -2], [10, 0, 0], distance=10)
+    np.testing.assert_allclose(poles, [[5, 0, -12]])
+
+def test_poleVectorPositions_vectorizedLimbs():
+    starts=np.array([[0, 0, 0], [0, 10, 0]])
+    mids=np.array([[5, 0, -2], [0, 5, 3]])
+    ends=np.array([[10, 0, 0], [0, 0, 0]])
+    poles=rigMath.poleVectorPositions(starts, mids, ends, distance=4)
+    np.testing.assert_allclose(poles, [[5, 0, -6], [0, 5, 7]])
+
+def test_poleVectorPositions_straightLimbUsesFallback():
+    poles=rigMath.poleVectorPositions([0, 0, 0], [5, 0, 0], [10, 0, 0], distance=10, fallbackVector=(0, 1, 1))
+    # the fallback is made perpendicular to the limb & normalized
+    np.testing.assert_allclose(poles, [[5, 10 / np.sqrt(2), 10 / np.sqrt(2)]])
+
+def test_poleVectorPositions_straightLimbAlongFallback():
+    poles=rigMath.poleVectorPositions([0, 0, 0], [0, 0, 5], [0, 0, 10], distance=10, fallbackVector=(0, 0, 1))
+    # the fallback runs along the limb, the least aligned world axis is used instead
+    np.testing.assert_allclose(poles, [[10, 0, 5]])
+
+def test_poleVectorPositions_zeroLengthLimb():
+    poles=rigMath.poleVectorPositions([[1, 2, 3], [1, 2, 3]], [[1, 2, 3], [1, 5, 3]], [[1, 2, 3], [1, 2, 3]], distance=10)
+    assert np.isfinite(poles).all()
+    np.testing.assert_allclose(poles, [[1, 2, 13], [1, 15, 3]])
+
+# curve fitting
+def _curvePoints(result:dict, params:np.ndarray) -> np.ndarray:
+    ''' Evaluates the fitted curve, maya knot vectors drop the first & last knot of the full clamped vector. '''
+    knots=np.concatenate([result['knots'][:1], result['knots'], result['knots'][-1:]])
+    return rigMath.bsplineBasis(params, knots, result['degree']) @ result['cvs']
+
+@pytest.mark.parametrize('tolerance', [0.5, 0.05, 0.005])
+def test_fitCurve_withinTolerance(tolerance):
+    samples=np.linspace(0.0, 2.0 * np.pi, 60)
+    points=np.stack([samples * 3.0, np.sin(samples) * 4.0, np.cos(samples * 0.5)], axis=1)
+    result=rigMath.fitCurve(points, tolerance=tolerance)
+
+    cvCount, degree = len(result['cvs']), result['degree']
+    assert degree==3
+    assert len(result['knots'])==cvCount + degree - 1
+    assert result['error'] <= tolerance
+    np.testing.assert_allclose(result['cvs'][[0, -1]], points[[0, -1]])
+    # the reported error is measured at the chord length parameters of the points
+    distances=np.linalg.norm(_curvePoints(result, rigMath.chordLengthParameters(points)) - points, axis=1)
+    assert distances.max() <= tolerance + 1e-9
+
+def test_fitCurve_tighterToleranceNeedsMoreCVs():
+    samples=np.linspace(0.0, 2.0 * np.pi, 60)
+    points=np.stack([samples, np.sin(samples), np.zeros_like(samples)], axis=1)
+    loose=rigMath.fitCurve(points, tolerance=0.1)
+    tight=rigMath.fitCurve(points, tolerance=0.001)
+    assert len(loose['cvs']) < len(tight['cvs']) <= len(points)
+
+def test_fitCurve_lowersDegreeForFewPoints():
+    result=rigMath.fitCurve([[0, 0, 0], [10, 0, 0]], tolerance=0.01)
+    assert result['degree']==1
+    np.testing.assert_allclose(result['cvs'], [[0, 0, 0], [10, 0, 0]])
+    np.testing.assert_allclose(result['knots'], [0, 1])
+
+def test_fitCurve_requiresTwoPoints():
+    with pytest.raises(ValueError):
+        rigMath.fitCurve([[0, 0, 0]])
+
+# euler angles
+@pytest.mark.parametrize('rotateOrder', rigMath.ROTATE_ORDERS)
+def test_euler_roundTrip(rotateOrder):
+    angles=_randomAngles(200, rotateOrder)
+    rotations=rigMath.matricesFromEuler(angles, rotateOrder)
+    np.testing.assert_allclose(rigMath.eulerFromMatrices(rotations, rotateOrder), angles, atol=1e-9)
+
+@pytest.mark.parametrize('rotateOrder', rigMath.ROTATE_ORDERS)
+def test_euler_roundTripGimbalLock(rotateOrder):
+    angles=_randomAngles(20, rotateOrder, seed=1)
+    angles[:, 'xyz'.index(rotateOrder[1])]=90.0
+    rotations=rigMath.matricesFromEuler(angles, rotateOrder)
+    resolved=rigMath.eulerFromMatrices(rotations, rotateOrder)
+    # the locked rotation is still reproduced, with the last rotated axis angle resolved to zero
+    np.testing.assert_allclose(rigMath.matricesFromEuler(resolved, rotateOrder), rotations, atol=1e-9)
+    np.testing.assert_allclose(resolved[:, 'xyz'.index(rotateOrder[2])], 0.0, atol=1e-9)
+
+@pytest.mark.parametrize('rotateOrder', rigMath.ROTATE_ORDERS)
+def test_eulerFromMatrices_ignoresScaleAndTranslation(rotateOrder):
+    angles=_randomAngles(10, rotateOrder, seed=2)
+    matrices=np.tile(np.identity(4), (len(angles), 1, 1))
+    matrices[:, :3, :3]=rigMath.matricesFromEuler(angles, rotateOrder) * np.array([2.0, 0.5, 3.0])[:, None]
+    matrices[:, 3, :3]=[4.0, 5.0, 6.0]
+    np.testing.assert_allclose(rigMath.eulerFromMatrices(matrices, rotateOrder), angles, atol=1e-9)
+
+def test_matricesFromEuler_rowVectorConvention():
+    # maya row vectors: rotating 90 degrees around x turns the y axis into the z axis
+    rotation=rigMath.matricesFromEuler([90, 0, 0])[0]
+    np.testing.assert_allclose(rotation[1], [0, 0, 1], atol=1e-12)
+    # xyz applies x first, the x rotation is the left most matrix
+    combined=rigMath.matricesFromEuler([30, 40, 50], 'xyz')[0]
+    single=[rigMath.matricesFromEuler(np.identity(3)[axisID] * angle)[0] for axisID, angle in enumerate((30, 40, 50))]
+    np.testing.assert_allclose(combined, single[0] @ single[1] @ single[2], atol=1e-12)
+
+def test_euler_invalidRotateOrder():
+    with pytest.raises(ValueError):
+        rigMath.matricesFromEuler([0, 0, 0], 'xxy')
+    with pytest.raises(ValueError):
+        rigMath.eulerFromMatrices(np.identity(3)[None], 'abc')
+
+@pytest.mark.parametrize('rotateOrder', rigMath.ROTATE_ORDERS)
+def test_filterEulerAngles_removesFlips(rotateOrder):
+    frames=np.linspace(0.0, 1.0, 50)[:, None]
+    smooth=np.array([10.0, 20.0, -30.0]) + frames * np.array([500.0, 60.0, -400.0])
+    # every other frame swaps to the equivalent (a+180, 180-b, c+180) solution, every frame gets wrapped
+    flipSigns=np.ones(3)
+    flipSigns['xyz'.index(rotateOrder[1])]=-1.0
+    flipped=smooth.copy()
+    flipped[1::2]=smooth[1::2] * flipSigns + 180.0
+    flipped=_wrapAngles(flipped)
+
+    filtered=rigMath.filterEulerAngles(flipped, rotateOrder)
+    np.testing.assert_allclose(filtered, smooth, atol=1e-9)
+    # the filtered angles still describe the same rotations
+    np.testing.assert_allclose(rigMath.matricesFromEuler(filtered, rotateOrder),
+                               rigMath.matricesFromEuler(flipped, rotateOrder), atol=1e-9)
+
+def test_filterEulerAngles_keepsInputUntouched():
+    angles=np.array([[170.0, 0.0, 0.0], [-170.0, 0.0, 0.0]])
+    filtered=rigMath.filterEulerAngles(angles)
+    np.testing.assert_allclose(filtered, [[170, 0, 0], [190, 0, 0]])
+    np.testing.assert_allclose(angles, [[170, 0, 0], [-170, 0, 0]])
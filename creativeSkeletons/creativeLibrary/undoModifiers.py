@@ -0,0 +1,26 @@
+import maya.cmds as cmds
+
+COMMAND_NAME='creativeModifier' # undoable command registered by the creativeSkeletons.py plugin
+_PENDING_MODIFIERS=[] # executed modifiers waiting to be picked up by the next command call
+
+def recordModifiers(modifiers:list):
+    '''
+    Records already executed MDGModifier, MDagModifier & MAnimCurveChange objects (or any object with doIt & undoIt
+    methods) as a single entry of maya's undo queue.
+    The plugin command keeps them alive and undoes them in reverse order, redo executes them again.
+    Without the plugin loaded the changes stay applied but cannot be undone.
+    '''
+    modifiers=[modifier for modifier in modifiers if modifier is not None]
+    if not modifiers or not hasattr(cmds, COMMAND_NAME):
+        return
+    _PENDING_MODIFIERS[:]=modifiers
+    try:
+        getattr(cmds, COMMAND_NAME)()
+    finally:
+        _PENDING_MODIFIERS.clear()
+
+def takeModifiers() -> list:
+    ''' Returns & clears the modifiers waiting to be recorded, called by the plugin command. '''
+    modifiers=list(_PENDING_MODIFIERS)
+    _PENDING_MODIFIERS.clear()
+    return modifiers
@@ -1,3 +1,5 @@
+from creativeSkeletons.creativeLibrary import limbRegistry
+from creativeSkeletons.creativeLibrary import autoMatch
 import maya.cmds as mc
 
 WINDOW_ID="creativeMatch01"
@@ -5,11 +7,8 @@ WINDOW_ID="creativeMatch01"
 class creativeMatch():
     def __init__(self):
         
-        self.fk_controls={"arm":["_shoulder_fk_ctrl", "_elbow_fk_ctrl", "_wrist_fk_ctrl"],
-                          "leg":["_hip_fk_ctrl", "_knee_fk_ctrl", "_ankle_fk_ctrl", "_ball_fk_ctrl"]}
-        
-        self.ik_controls={"arm":["_elbow_ik_ctrl", "_wrist_ik_ctrl"],
-                          "leg":["_knee_ik_ctrl", "_foot_ik_ctrl"]}
+        # limbs are described in the shared limb registry, resolved once per character namespace
+        self.registry=limbRegistry.getLimbRegistry()
 
         self.fk_ctrl=None
         self.ik_ctrl=None
@@ -22,10 +21,27 @@ class creativeMatch():
         self.mainLayout=mc.formLayout(self.mainWindow)
         leftFKArmButton=mc.button(label="Match FK Left Arm", command=self.fk_match)
         rightFKArmButton=mc.button(label="Match FK Right Arm", command=lambda args:self.fk_match(side='right'))
+        allFKButton=mc.button(label="Match All FK", command=lambda args:self.match_all(direction='ikToFk'))
+        allIKButton=mc.button(label="Match All IK", command=lambda args:self.match_all(direction='fkToIk'))
+        self.bakeCheck=mc.checkBox(label="Bake Playback Range", value=False)
+        self.autoCheck=mc.checkBox(label="Auto Match On Switch", value=autoMatch.getAutoMatcher().isEnabled(),
+                                   changeCommand=self.set_auto_match)
+        switchIKButton=mc.button(label="Switch To IK", command=lambda args:self.switch_limbs(ik=True))
+        switchFKButton=mc.button(label="Switch To FK", command=lambda args:self.switch_limbs(ik=False))
         
         mc.formLayout(self.mainLayout, edit=True, attachForm=[[leftFKArmButton, "top", 10], [leftFKArmButton, "left", 5],
-                                                              [rightFKArmButton, "top", 10], [rightFKArmButton, "left", 5]],
-                                                attachControl=[[rightFKArmButton, "left", 10, leftFKArmButton]])
+                                                              [rightFKArmButton, "top", 10], [rightFKArmButton, "left", 5],
+                                                              [allFKButton, "left", 5], [self.bakeCheck, "left", 5],
+                                                              [self.autoCheck, "left", 5], [switchIKButton, "left", 5]],
+                                                attachControl=[[rightFKArmButton, "left", 10, leftFKArmButton],
+                                                               [allFKButton, "top", 10, leftFKArmButton],
+                                                               [allIKButton, "top", 10, leftFKArmButton],
+                                                               [allIKButton, "left", 10, allFKButton],
+                                                               [self.bakeCheck, "top", 10, allFKButton],
+                                                               [self.autoCheck, "top", 5, self.bakeCheck],
+                                                               [switchIKButton, "top", 10, self.autoCheck],
+                                                               [switchFKButton, "top", 10, self.autoCheck],
+                                                               [switchFKButton, "left", 10, switchIKButton]])
         
         mc.showWindow()
         
@@ -41,14 +57,33 @@ class creativeMatch():
                 self.fk_match()
             if "ik" in ctrl[0]:
                 self.ik_ctrl=ctrl[0]
+
+    def get_frame_range(self):
+        ''' Returns the playback range when baking is enabled, None matches the current frame only. '''
+        if not mc.checkBox(self.bakeCheck, query=True, value=True):
+            return None
+        return (int(mc.playbackOptions(query=True, minTime=True)), int(mc.playbackOptions(query=True, maxTime=True)))
+
+    def get_namespace(self):
+        ''' Returns the namespace of the first selected node, the root namespace when nothing is selected. '''
+        selection=mc.ls(selection=True)
+        return selection[0].rpartition(':')[0] if selection else ''
     
     def fk_match(self, *args, limb:str="arm", side:str="left"):
+        ''' Matches the FK controls of the selected character limb to its IK chain. '''
+        self.registry.match('ikToFk', self.get_frame_range(), namespaces=[self.get_namespace()],
+                            limbNames=[limb], sides=[side])
+
+    def match_all(self, *args, direction:str='ikToFk'):
+        ''' Matches every limb of every character in the scene with a single batched call. '''
+        self.registry.match(direction, self.get_frame_range())
+
+    def switch_limbs(self, *args, ik:bool=True):
+        ''' Switches the limbs of the selected character & matches them in one undo step, without a visible jump. '''
+        autoMatch.switchLimbs(ik, namespaces=[self.get_namespace()])
 
-        controlsToMatch=[side+ctrl for ctrl in self.fk_controls.get(limb)]
-        for ctrl in controlsToMatch:
-            if mc.objExists(ctrl):
-                mc.setAttr(f"{side}_{limb}_settings_ctrl.IK", 1)
-                jnt_match=ctrl.replace("fk_ctrl", "jnt")
-                mc.matchTransform(ctrl, jnt_match)
-                mc.setAttr(f"{side}_{limb}_settings_ctrl.IK", 0)
-    
\ No newline at end of file
+    def set_auto_match(self, enabled, *args):
+        ''' Matches the limbs automatically whenever a settings control switches between IK & FK. '''
+        stats=autoMatch.setAutoMatch(enabled)
+        if enabled and not stats['switches']:
+            mc.warning("No registered limb switches were found in the scene.")
@@ -1,4 +1,9 @@
 from .creativeLibrary import creativeModules as md
+from .creativeLibrary import mirrorEngine
+from .creativeLibrary import spatialIndex
+from .creativeLibrary import symmetryMap
+from .creativeLibrary import locatorHistory
+from .creativeLibrary import rigMath
 from .wrapperQt import wrapperWidgets, wrapperLayouts
 from PySide6 import QtCore, QtGui, QtWidgets
 from shiboken6 import wrapInstance
@@ -11,6 +16,11 @@ import os
 # development only
 import importlib
 importlib.reload(md)
+importlib.reload(mirrorEngine)
+importlib.reload(spatialIndex)
+importlib.reload(symmetryMap)
+importlib.reload(locatorHistory)
+importlib.reload(rigMath)
 importlib.reload(wrapperWidgets)
 importlib.reload(wrapperLayouts)
 
@@ -18,6 +28,7 @@ WINDOW_ID='skeletonBuilderUIWindow'
 WINDOW_TITLE='creativeSkeletons v0.1'
 ORIGINAL_WIDTH=405
 ORIGINAL_HEIGHT=460
+PREVIEW_DEBOUNCE_MS=150 # joint preview waits for the fields to settle before redrawing
 
 @QtCore.Slot()
 def tester():
@@ -33,8 +44,10 @@ def show_skeletonBuilderUI_widget(dock:bool=False, workspaceName:str='CreativeSk
         if mc.workspaceControl(workspaceName, query=True, exists=True):
             mc.deleteUI(workspaceName)
 
+        # a docked widget is deleted with its control without a close event, snap callbacks are removed on close
         ctrl=mc.workspaceControl(workspaceName, label='Creative Skeletons',
-                                    dockToMainWindow=('right', 1), retain=False)
+                                    dockToMainWindow=('right', 1), retain=False,
+                                    closeCommand=spatialIndex.clearDragSnaps)
         
         qtCrtl=wrapInstance(int(omui.MQtUtil.findControl(ctrl)), QtWidgets.QWidget)
         layout=qtCrtl.layout()
@@ -97,7 +110,7 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.sortedLocIDs=['none', 'none']
         self.sortedJntIDs=[] # stores joint ID strings in order of creation
         self.locatorSets={}
-        self.locatorSetsCopy={} # copy needed for undo/redo operations; allows restoration of deleted locators
+        self.locHistory=locatorHistory.locatorHistory() # tool undo/redo stack, independent from maya's undo queue
         self.locStartName=''
         self.locEndName=''
         self.jntLayoutDisplayed=False
@@ -111,7 +124,15 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.wupFieldID=['wupFieldX', 'wupFieldY', 'wupFieldZ']
         self.aimWidgetID=['aimCheck', 'aimBtn']
 
+        # planned joint preview drawn by the start cLocator, no joint gets created until the chain is built
+        self.previewLocID=None
+        self.previewTimer=QtCore.QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.previewTimer.timeout.connect(self.update_joint_preview)
+
         self.build_main_layout()
+        self.connect_joint_preview()
         self._apply_style()
 
     def build_main_layout(self):
@@ -158,10 +179,25 @@ class skeletonBuilderUI(QtWidgets.QWidget):
                                                                  parentLayout=self.cardLayout, contentMargins=(30,3,30,3))
         self.locSizeField=self.widgets.create_numField('locSizeField', locatorVLayout, label='Locator Size Value:', type='float',
                                                     numVal=5, minVal=0.1, maxVal=100, align=QtCore.Qt.AlignHCenter)
+        # build locator placement menu, maps the displayed text to the meshUtils placement mode
+        self.locPlaceModes={'Vertex Centroid':'centroid', 'Bounding Box Center':'bbox', 'Volume Center':'volume'}
+        self.locPlaceMenu=QtWidgets.QComboBox()
+        self.locPlaceMenu.setObjectName('locPlaceMenu')
+        self.locPlaceMenu.addItems(list(self.locPlaceModes))
+        locatorVLayout.addWidget(self.locPlaceMenu)
+        self.locSnapCheck=self.widgets.create_checkbox('locSnapCheck', 'Snap Locators to Mesh while Dragging',
+                                                       locatorVLayout, align=QtCore.Qt.AlignHCenter)
+        batchDrawn=bool(mc.pluginInfo('creativeSkeletons.py', query=True, loaded=True) and mc.ls(type='cLocatorBatch'))
+        self.locBatchCheck=self.widgets.create_checkbox('locBatchCheck', 'Batch Draw Locators', locatorVLayout, value=batchDrawn,
+                                                        align=QtCore.Qt.AlignHCenter, clickedCmd=self.toggle_batch_locator_draw)
         self.singleLocField=self.widgets.create_textField('singleLocField', locatorVLayout, placeholderText='Single Locator Name',
                                                           margins=(5,5,5,0))
         self.singleLocBtn=self.widgets.create_button('singleLocBtn', 'Create Single Locator', locatorVLayout,
                                    clickedCmd=self.create_single_locator)
+        self.replayLocBtn=self.widgets.create_button('replayLocBtn', 'Replay Stored Locators', locatorVLayout,
+                                                     clickedCmd=self.replay_stored_locators)
+        self.mirrorLocBtn=self.widgets.create_button('mirrorLocBtn', 'Mirror Selected Locators', locatorVLayout,
+                                                     clickedCmd=self.mirror_selected_locators)
         
         # create grid layout for main fields & buttons
         midLayout=self.layouts.create_or_get_gridLayout('midLayout', parentWidget=self.cardFrame, parentLayout=self.cardLayout)
@@ -274,6 +310,9 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.redoArrow=self.widgets.create_arrowButton('redoArrow', arrowLayout, direction='right',
                                         iconSize=QtCore.QSize(8, 8), styleSheet=arrowStyleSheet,
                                         enabled=False, gridSet=(0,1))
+        # arrow buttons are connected once, the history stack decides which step to undo or redo
+        self.undoArrow.clicked.connect(self.undo_locator_step)
+        self.redoArrow.clicked.connect(self.redo_locator_step)
 
         self.resize_layout(layout='card')
 
@@ -630,6 +669,46 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.sortedLocIDs=['none', 'none']
         self.locatorSets.clear()
         self.sortedJntIDs.clear()
+        self.locHistory.clear()
+        self.clear_joint_preview()
+
+    def connect_joint_preview(self):
+        ''' Restarts the joint preview debounce every time a field affecting the planned joint chain changes. '''
+        self.jntCountField.valueChanged.connect(self.schedule_joint_preview)
+        self.jntSizeField.valueChanged.connect(self.schedule_joint_preview)
+        self.orientCheck.clicked.connect(self.schedule_joint_preview)
+        self.orientJntMenu.currentTextChanged.connect(self.schedule_joint_preview)
+        self.secOrientMenu.currentTextChanged.connect(self.schedule_joint_preview)
+
+    def schedule_joint_preview(self, *args):
+        ''' Redraws the joint preview once the fields stop changing for PREVIEW_DEBOUNCE_MS. '''
+        self.previewTimer.start()
+
+    def update_joint_preview(self):
+        ''' Computes the planned joint chain between the staged locators and sends it to the start locator draw. '''
+        if (not self.jntCountField.isEnabled() or 'none' in self.sortedLocIDs
+            or not all(mc.objExists(locator) for locator in self.sortedLocIDs)):
+            self.clear_joint_preview()
+            return
+        startLocPos=mc.xform(self.sortedLocIDs[0], query=True, ws=True, t=True)
+        endLocPos=mc.xform(self.sortedLocIDs[1], query=True, ws=True, t=True)
+        # match the orientation build_joint_chain uses when the orient checkbox is off
+        orientJoint, secAxis = 'xyz', 'yup'
+        if self.orientCheck.isChecked():
+            orientJoint, secAxis = self.orientJntMenu.currentText(), self.secOrientMenu.currentText()
+        matrices=rigMath.jointChainMatrices(startLocPos, endLocPos, jntNums=self.jntCountField.value(),
+                                            orientJoint=orientJoint, secAxisOrient=secAxis)
+        if self.previewLocID and self.previewLocID!=self.sortedLocIDs[0]:
+            md.clearJointPreview(self.previewLocID)
+        if md.setJointPreview(self.sortedLocIDs[0], matrices, jntsRad=self.jntSizeField.value()):
+            self.previewLocID=self.sortedLocIDs[0]
+
+    def clear_joint_preview(self):
+        ''' Stops any pending preview redraw and removes the drawn joint preview. '''
+        self.previewTimer.stop()
+        if self.previewLocID:
+            md.clearJointPreview(self.previewLocID)
+        self.previewLocID=None
 
     def locator_btn_clicked(self, sequenceID:str='start'):
         ''' Handles the create or store locator methods based on checkbox state. '''
@@ -652,56 +731,61 @@ class skeletonBuilderUI(QtWidgets.QWidget):
                 self.stage_build_locator(self.endLocBtn, self.endLocField, self.endLocCheck,
                                          sequenceID='end')
 
-    def arrow_btn_clicked(self, arrowID:str, 
-                          locBtn:QtWidgets.QPushButton,
-                          locField:QtWidgets.QLineEdit,
-                          locCheck:QtWidgets.QCheckBox,
-                          locObjID, deleteLoc:bool=False,
-                          text='Start'):
-        ''' 
-        Handles the undo and redo operations for locator creation and storage. 
-        Parameters are passed to re-enable/disable the locator layout accordingly.
-        Undo & Redo signals should be disconnected prior to connecting this method.
-        '''
+    def get_locator_layout(self, sequenceID:str='start') -> tuple:
+        ''' Returns the locator button, field, checkbox & display text of the provided sequence. '''
+        if sequenceID not in self.available_sequenceID:
+            raise ValueError(f'[{sequenceID}] is not an available sequence, use: [{self.available_sequenceID}]')
+        if sequenceID=='start':
+            return self.startLocBtn, self.startLocField, self.startLocCheck, 'Start'
+        return self.endLocBtn, self.endLocField, self.endLocCheck, 'End'
 
-        if arrowID=='undo':
-            if deleteLoc:
-                # store a copy of the current locator sets, remove the deleted locator from the copy
-                self.locatorSetsCopy=self.locatorSets.copy()
-                self.locatorSetsCopy.pop(locObjID)
+    def update_arrow_btns(self):
+        ''' Enables the undo & redo arrow buttons based on the locator history state. '''
+        self.undoArrow.setEnabled(self.locHistory.canUndo())
+        self.redoArrow.setEnabled(self.locHistory.canRedo())
 
-                mc.undo() # undoes the locator creation set by stage_build_locator method
-                self.enable_locBtn(locBtn, locField, locCheck, buttonText=f'Create {text} Locator',
-                                   clearField=False)
-            else:
-                # re-enable locator button, field & checkbox; no locator deletion
-                self.enable_locBtn(locBtn, locField, locCheck, buttonText=f'Store {text} Locator',
-                                   enableField=False, checkState=True)
-            self.redoArrow.setEnabled(True)
-            self.undoArrow.setDisabled(True)
-            # verify if joint chain layout is displayed to hide it again
-            if self.jntLayoutDisplayed:
-                self.show_or_hide_joint_count(hideLayout=True)
-                self.show_or_hide_fields() 
-                self.jntLayoutDisplayed=False
-
-        elif arrowID=='redo':
-            # get locator position data from original locator sets, place the set back into the copy
-            locObjPos=self.locatorSets.get(locObjID)
-            self.locatorSetsCopy[locObjID]=locObjPos
-
-            # redo the locator creation; if maya has reached the end of its redo stack simply skip to disable UI 
-            try:
-                mc.redo()
-            except(RuntimeError):
-                pass
-
-            # disable locator button, field & checkbox again
-            self.disable_locBtn(locBtn, locField, locCheck, locObjID)
-            self.undoArrow.setEnabled(True)
-            self.redoArrow.setDisabled(True)
-            # check if both locator buttons have been disabled to enable joint chain layout
-            self.check_locator_btns_disabled()
+    def undo_locator_step(self):
+        '''
+        Connected to undoArrow. Reverts the last staged locator step through the locator history,
+        created locators are deleted and the locator layout is re-enabled.
+        '''
+        step=self.locHistory.undo()
+        if not step:
+            return
+        locBtn, locField, locCheck, text = self.get_locator_layout(step['sequenceID'])
+        if step['created']:
+            self.enable_locBtn(locBtn, locField, locCheck, buttonText=f'Create {text} Locator',
+                               clearField=False)
+        else:
+            # re-enable locator button, field & checkbox; no locator deletion
+            self.enable_locBtn(locBtn, locField, locCheck, buttonText=f'Store {text} Locator',
+                               enableField=False, checkState=True)
+        self.sortedLocIDs[self.available_sequenceID.index(step['sequenceID'])]='none'
+        self.locatorSets.pop(step['name'], None)
+        self.clear_joint_preview()
+
+        # verify if joint chain layout is displayed to hide it again
+        if self.jntLayoutDisplayed:
+            self.show_or_hide_joint_count(hideLayout=True)
+            self.show_or_hide_fields()
+            self.jntLayoutDisplayed=False
+        self.update_arrow_btns()
+
+    def redo_locator_step(self):
+        '''
+        Connected to redoArrow. Re-applies the next undone locator step through the locator history,
+        created locators are rebuilt from their stored state and the locator layout is disabled again.
+        '''
+        step=self.locHistory.redo()
+        if not step:
+            return
+        locBtn, locField, locCheck, text = self.get_locator_layout(step['sequenceID'])
+        self.sortedLocIDs[self.available_sequenceID.index(step['sequenceID'])]=step['name']
+        self.locatorSets[step['name']]=step['components']
+        self.disable_locBtn(locBtn, locField, locCheck, step['name'])
+        self.update_arrow_btns()
+        # check if both locator buttons have been disabled to enable joint chain layout
+        self.check_locator_btns_disabled()
 
     def enable_locBtn(self, locBtn:QtWidgets.QPushButton, 
                       locField:QtWidgets.QLineEdit,
@@ -744,8 +828,14 @@ class skeletonBuilderUI(QtWidgets.QWidget):
                 self.aim_locators()
             self.show_or_hide_joint_count()
             self.show_or_hide_fields(hide=True)
+            self.schedule_joint_preview()
             self.findChild(QtWidgets.QFormLayout, 'locSizeFieldForm').setRowVisible(0, False)
+            self.locPlaceMenu.setVisible(False)
+            self.locSnapCheck.setVisible(False)
+            self.locBatchCheck.setVisible(False)
             self.singleLocBtn.setVisible(False)
+            self.replayLocBtn.setVisible(False)
+            self.mirrorLocBtn.setVisible(False)
             self.resize_layout(layout='card')
 
     def checkbox_loc_sequence(self, checked:bool, sequenceID:str='start'):
@@ -888,13 +978,26 @@ class skeletonBuilderUI(QtWidgets.QWidget):
     def create_place_locator(self, locName:str, 
                              prefix:str|None=None, suffix:str|None=None, 
                              locScale:float=5):
-        ''' Handles the createLocator & clusterLocParent module calls for either single or staged locator placement. '''
+        ''' Handles the createLocator & placeLocator module calls for either single or staged locator placement. '''
         locObjPos=mc.polyListComponentConversion(mc.ls(selection=True), toVertex=True)
         locObjID=md.createLocator(locName, prefix=prefix, suffix=suffix, locScale=locScale)
         if locObjPos:
-            md.clusterLocParent(locObjPos, locName, locObjID)
+            placeMode=self.locPlaceModes.get(self.locPlaceMenu.currentText())
+            md.placeLocator(locObjPos, locObjID, mode=placeMode)
+            # store the placement as a vertex set so it can be replayed on the same mesh topology
+            md.savePositions(locObjPos, locObjID, mode=placeMode)
+            if self.locSnapCheck.isChecked():
+                # snap range follows the locator display size
+                meshes=mc.ls(locObjPos, objectsOnly=True, type='mesh')
+                spatialIndex.enableDragSnap(locObjID, list(dict.fromkeys(meshes)), radius=locScale)
         return (locObjID, locObjPos)
 
+    def toggle_batch_locator_draw(self, checked:bool):
+        ''' Connected to locBatchCheck. Draws every cLocator from a single batched line list while checked. '''
+        batchShp=md.setLocatorBatchDraw(checked)
+        if checked and not batchShp:
+            self.locBatchCheck.setChecked(False)
+
     def create_single_locator(self):
         ''' Connected to singleLocBtn. Queries all the values to call create_place_locator. '''
         locName=self.singleLocField.text()
@@ -911,6 +1014,31 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.singleLocField.clear()
         print(f'{locObjID} created.')
 
+    def replay_stored_locators(self):
+        ''' Connected to replayLocBtn. Rebuilds every stored locator placement on the selected meshes. '''
+        meshes=mc.ls(selection=True, type='transform')
+        if not meshes:
+            mc.warning('Please select the mesh to replay the stored locators on.')
+            return
+        for mesh in meshes:
+            locObjIDs=md.replayVertexSets(mesh, locScale=self.locSizeField.value())
+            if locObjIDs:
+                print(f'{len(locObjIDs)} locators replayed on {mesh}.')
+
+    def mirror_selected_locators(self):
+        '''
+        Connected to mirrorLocBtn. Mirrors the selected locators with the symmetryMap module, no joints needed.
+        Uses the mirror axis & replacement names of the mirror layout; a selected mesh mirrors the stored vertex sets.
+        '''
+        selection=mc.ls(selection=True, type='transform')
+        meshes=[obj for obj in selection if mc.listRelatives(obj, shapes=True, type='mesh')]
+        locators=[obj for obj in selection if obj not in meshes]
+        mirroredLocs=symmetryMap.mirrorLocators(locators, meshName=meshes[0] if meshes else None,
+                                                mirrorAxis=self.mirrorAxisMenu.currentText(),
+                                                searchReplace=(self.searchField.text(), self.replaceField.text()))
+        if mirroredLocs:
+            print(f'{len(mirroredLocs)} locators mirrored.')
+
     def stage_build_locator(self, locBtn:QtWidgets.QPushButton, 
                          locField:QtWidgets.QLineEdit,
                          locCheck:QtWidgets.QCheckBox,
@@ -942,12 +1070,7 @@ class skeletonBuilderUI(QtWidgets.QWidget):
             locObjID, locObjPos = locObj[0], locObj[1] 
 
             # store locator ID based on the sequence provided 
-            if sequenceID=='start':
-                self.sortedLocIDs[0]=locObjID
-                textID='Start'
-            else:
-                self.sortedLocIDs[1]=locObjID
-                textID='End'
+            self.sortedLocIDs[self.available_sequenceID.index(sequenceID)]=locObjID
             # store locator ID and position data set for undo/redo operations
             self.locatorSets[locObjID]=locObjPos
             # set locator field text to show created locator ID
@@ -957,23 +1080,9 @@ class skeletonBuilderUI(QtWidgets.QWidget):
             # check if both locator buttons are disabled to enable joint chain layout
             self.check_locator_btns_disabled()
 
-            # undo and redo arrow button connections; avoids ghost stacking
-            self.undoArrow, self.redoArrow = self._reset_arrow_connections()
-            self.undoArrow.setEnabled(True)
-            self.redoArrow.setDisabled(True)
-
-            # connect arrow buttons to handle undo/redo operations
-            self.undoArrow.clicked.connect(lambda args:self.arrow_btn_clicked('undo',
-                                                                        locBtn,
-                                                                        locField,
-                                                                        locCheck,
-                                                                        locObjID, text=textID,
-                                                                        deleteLoc=True))
-            self.redoArrow.clicked.connect(lambda args:self.arrow_btn_clicked('redo',
-                                                                         locBtn,
-                                                                         locField,
-                                                                         locCheck,
-                                                                         locObjID, text=textID))
+            # record the created locator state for the tool undo/redo arrows
+            self.locHistory.record(sequenceID, locObjID, components=locObjPos, created=True)
+            self.update_arrow_btns()
 
         finally:
             # close undo chunk for maya stack
@@ -1008,12 +1117,7 @@ class skeletonBuilderUI(QtWidgets.QWidget):
             locObjID=locSelection[0]
 
         # store locator ID based on the sequence provided 
-        if sequenceID=='start':
-            self.sortedLocIDs[0]=locObjID
-            textID='Start'
-        else:
-            self.sortedLocIDs[1]=locObjID
-            textID='End'
+        self.sortedLocIDs[self.available_sequenceID.index(sequenceID)]=locObjID
         # stored locators don't require position data; position data is only needed for created locators
         self.locatorSets[locObjID]=None
         # set locator field text to show stored locator ID
@@ -1023,22 +1127,9 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         # check if both locator buttons are disabled to enable joint chain layout
         self.check_locator_btns_disabled()
 
-        # undo and redo arrow button connections; avoids ghost stacking
-        self.undoArrow, self.redoArrow = self._reset_arrow_connections()
-        self.undoArrow.setEnabled(True)
-        self.redoArrow.setDisabled(True)
-
-        # connect arrow buttons to handle undo/redo operations
-        self.undoArrow.clicked.connect(lambda args:self.arrow_btn_clicked('undo',
-                                                                    locBtn,
-                                                                    locField,
-                                                                    locCheck, 
-                                                                    locObjID, text=textID))
-        self.redoArrow.clicked.connect(lambda args:self.arrow_btn_clicked('redo',
-                                                                    locBtn,
-                                                                    locField,
-                                                                    locCheck,
-                                                                    locObjID, text=textID))
+        # record the stored locator for the tool undo/redo arrows
+        self.locHistory.record(sequenceID, locObjID, created=False)
+        self.update_arrow_btns()
         mc.select(clear=True)
 
     def aim_locators(self):
@@ -1117,16 +1208,16 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         mc.joint(jointSelection, edit=True, rotationOrder=rotOrder, children=True)
 
     def mirror_joints(self):
-        ''' Handles the mirrorJoints module to mirror selected joints based on user settings. '''
+        ''' Handles the mirrorEngine module to mirror selected joints based on user settings. '''
         mirrorAxisVal=self.mirrorAxisMenu.currentText()
         mirrorFuncVal=self.mirrorFuncMenu.currentText()
         searchFieldVal=self.searchField.text()
         replaceFieldVal=self.replaceField.text()
         includeLocators=self.transferCheck.isChecked()
 
-        mirroredJnts=md.mirrorJoints(mirrorAxis=mirrorAxisVal, mirrorFunc=mirrorFuncVal,
-                                     search=searchFieldVal, replace=replaceFieldVal, 
-                                     includeLocators=includeLocators)
+        mirroredJnts=mirrorEngine.mirrorJointHierarchy(mirrorAxis=mirrorAxisVal, mirrorFunc=mirrorFuncVal,
+                                                       searchReplace=(searchFieldVal, replaceFieldVal),
+                                                       includeLocators=includeLocators)
         if not mirroredJnts:
             mc.warning('No Joint selection made.')
             return
@@ -1182,6 +1273,8 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         else:
             parentJnt=None
 
+        # the built chain replaces the joint preview
+        self.clear_joint_preview()
         # query the world space position of both locators
         startLocPos=mc.xform(self.sortedLocIDs[0], query=True, ws=True, t=True)
         endLocPos=mc.xform(self.sortedLocIDs[1], query=True, ws=True, t=True)
@@ -1223,9 +1316,9 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.show_or_hide_joint_count(hideLayout=True, hideButton=True)
         self.show_or_hide_commitLayout()
         
-        # disconnect restart undo/redo commands to avoid ghost stacking
-        self.undoArrow = self._reset_arrow_connections()[0]
-        self.undoArrow.setDisabled(True)
+        # locator steps can't be undone once the joint chain depends on them
+        self.locHistory.clear()
+        self.update_arrow_btns()
 
     def delete_jnt_constraints(self):
         for joint in self.sortedJntIDs:
@@ -1308,7 +1401,12 @@ class skeletonBuilderUI(QtWidgets.QWidget):
         self.jntBuilderBtn.setDisabled(True)
         self.show_or_hide_fields()
         self.findChild(QtWidgets.QFormLayout, 'locSizeFieldForm').setRowVisible(0, True)
+        self.locPlaceMenu.setVisible(True)
+        self.locSnapCheck.setVisible(True)
+        self.locBatchCheck.setVisible(True)
         self.singleLocBtn.setVisible(True)
+        self.replayLocBtn.setVisible(True)
+        self.mirrorLocBtn.setVisible(True)
 
     def show_dialog_window(self):
         ''' 
@@ -1346,6 +1444,11 @@ class skeletonBuilderUI(QtWidgets.QWidget):
 
         dialogWindow.show()
 
+    def closeEvent(self, event):
+        ''' Removes the drag snapping callbacks of the placed locators when the window closes. '''
+        spatialIndex.clearDragSnaps()
+        super(skeletonBuilderUI, self).closeEvent(event)
+
     def close_dialog_window(self):
         ''' Deletes any existing dialog window instances. '''
         dialogWindows=self.findChildren(QtWidgets.QDialog, 'dialogWindow')
@@ -1584,15 +1687,3 @@ class skeletonBuilderUI(QtWidgets.QWidget):
             border: 2px solid {accent};
         }}
         """)
-
-    def _reset_arrow_connections(self):
-        ''' Private method to disconnect undo/redo arrow button signals for repeated use. '''
-
-        for arrowBtn in (self.undoArrow, self.redoArrow):
-            try:
-                arrowBtn.clicked.disconnect()
-            except (RuntimeError, TypeError):
-                pass # nothing has been connected
-
-        return self.undoArrow, self.redoArrow
-    